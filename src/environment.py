@@ -1,6 +1,15 @@
 """Project Global Constants."""
+import os
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).parent.parent
 QUERY_PATH = PROJECT_ROOT / Path("src/sql")
 LOG_CONFIG_FILE = PROJECT_ROOT / Path("logging.conf")
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """Boolean environment variable `name` ("1", "true" or "yes" enable it)"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes")
@@ -0,0 +1,56 @@
+"""
+Conversion of query results into Arrow backed DataFrames.
+Strings (hex addresses, hashes and text encoded wei amounts) are stored in contiguous
+Arrow buffers instead of one Python object per value, and low cardinality columns
+(e.g. solvers and tokens) are dictionary encoded.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+import pandas as pd
+import pyarrow as pa
+from pandas import DataFrame, Series
+
+# Columns with few distinct values (relative to the number of rows)
+DICTIONARY_COLUMNS = frozenset(
+    {
+        "solver",
+        "quote_solver",
+        "protocol_fee_token",
+        "partner_fee_recipient",
+        "protocol_fee_kind",
+        "token_address",
+        "source",
+    }
+)
+
+
+def _arrow_column(column: Series, dictionary: bool) -> Series:
+    if isinstance(column.dtype, pd.ArrowDtype):
+        return column
+    array = pa.array(column, from_pandas=True)
+    if dictionary and pa.types.is_string(array.type):
+        array = array.dictionary_encode()
+    return Series(
+        pd.arrays.ArrowExtensionArray(array), index=column.index, name=column.name
+    )
+
+
+def to_arrow_dtypes(
+    frame: DataFrame, dictionary_columns: Iterable[str] = DICTIONARY_COLUMNS
+) -> DataFrame:
+    """
+    Returns `frame` with all columns Arrow backed.
+    Missing values (None/NaN/NA) become Arrow nulls.
+    Wei amounts are kept as (Arrow) strings:
+    uint256 values do not fit into decimal128 nor decimal256.
+    """
+    dictionary = set(dictionary_columns)
+    return DataFrame(
+        {
+            name: _arrow_column(column, name in dictionary)
+            for name, column in frame.items()
+        },
+        index=frame.index,
+    )
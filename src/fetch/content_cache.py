@@ -0,0 +1,150 @@
+"""
+Persistent cache of resolved app data content (on the volume).
+Content of an app hash never changes once resolved, so cached content is never refreshed:
+it is only evicted (least recently used first) to keep the cache within its size limit.
+"""
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from src.fetch.sqlite_store import SQLiteStore
+from src.logger import set_log
+from src.models.app_data_content import FoundContent
+
+log = set_log(__name__)
+
+# Default size limit (bytes of serialized content)
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+# SQLite limits the number of bound parameters per statement
+LOOKUP_BATCH_SIZE = 500
+
+
+@dataclass
+class CacheStats:
+    """Number of cache lookups which were (not) found and of evicted entries"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups found in the cache (0 without lookups)"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ContentCache(SQLiteStore):
+    """
+    SQLite backed map of app hash to resolved content (and first seen block)
+    of at most (approximately) `max_bytes` bytes of content.
+
+    Usage:
+        with ContentCache(path) as cache:
+            found = cache.get_many(app_hashes)
+            cache.put_many(resolved)
+    """
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS app_data (
+            app_hash TEXT PRIMARY KEY,
+            first_seen_block INTEGER NOT NULL,
+            content TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            last_used REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS app_data_last_used ON app_data (last_used)",
+    )
+
+    def __init__(self, path: Path, max_bytes: int = CACHE_MAX_BYTES):
+        super().__init__(path)
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        (count,) = self._db.execute("SELECT count(*) FROM app_data").fetchone()
+        return int(count)
+
+    @property
+    def size(self) -> int:
+        """Total size (bytes) of cached content"""
+        (size,) = self._db.execute(
+            "SELECT coalesce(sum(size), 0) FROM app_data"
+        ).fetchone()
+        return int(size)
+
+    def get_many(self, app_hashes: Iterable[str]) -> dict[str, FoundContent]:
+        """Cached content of those of `app_hashes` which are in the cache"""
+        app_hashes = list(app_hashes)
+        found: dict[str, FoundContent] = {}
+        for start in range(0, len(app_hashes), LOOKUP_BATCH_SIZE):
+            batch = app_hashes[start : start + LOOKUP_BATCH_SIZE]
+            rows = self._db.execute(
+                "SELECT app_hash, first_seen_block, content FROM app_data "
+                f"WHERE app_hash IN ({', '.join('?' * len(batch))})",
+                batch,
+            )
+            for app_hash, first_seen_block, content in rows:
+                found[app_hash] = FoundContent(
+                    app_hash, first_seen_block, json.loads(content)
+                )
+        if found:
+            with self._db:
+                self._db.executemany(
+                    "UPDATE app_data SET last_used = ? WHERE app_hash = ?",
+                    [(time.time(), app_hash) for app_hash in found],
+                )
+        self.stats.hits += len(found)
+        self.stats.misses += len(app_hashes) - len(found)
+        return found
+
+    def put_many(self, contents: Iterable[FoundContent]) -> None:
+        """Adds resolved `contents`, then evicts entries beyond the size limit"""
+        now = time.time()
+        rows = []
+        for found in contents:
+            content = json.dumps(found.content)
+            rows.append(
+                (found.app_hash, found.first_seen_block, content, len(content), now)
+            )
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO app_data VALUES (?, ?, ?, ?, ?)", rows
+            )
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes least recently used entries until the cache fits its size limit"""
+        excess = self.size - self.max_bytes
+        if excess <= 0:
+            return
+        evicted: list[str] = []
+        rows = self._db.execute(
+            "SELECT app_hash, size FROM app_data ORDER BY last_used, app_hash"
+        )
+        for app_hash, size in rows:
+            if excess <= 0:
+                break
+            evicted.append(app_hash)
+            excess -= size
+        with self._db:
+            self._db.executemany(
+                "DELETE FROM app_data WHERE app_hash = ?",
+                [(app_hash,) for app_hash in evicted],
+            )
+        self.stats.evictions += len(evicted)
+        log.debug(f"evicted {len(evicted)} entries from {self.path}")
+
+    def report(self) -> None:
+        """Logs cache usage"""
+        log.info(
+            f"content cache: {self.stats.hits} hits, {self.stats.misses} misses "
+            f"(hit rate {self.stats.hit_rate:.1%}), {self.stats.evictions} evictions, "
+            f"{len(self)} entries ({self.size} bytes)"
+        )
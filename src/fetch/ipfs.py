@@ -2,7 +2,11 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, Optional
+import statistics
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional, TypeVar
 
 import json
 import aiohttp
@@ -10,6 +14,7 @@ import requests
 from aiohttp import ClientSession
 from multiformats_cid.cid import from_bytes
 
+from src.fetch.content_cache import ContentCache
 from src.logger import set_log
 from src.models.app_data_content import FoundContent, NotFoundContent
 
@@ -19,6 +24,118 @@ OLD_PREFIX = bytearray([1, 112, 18, 32])
 # https://github.com/cowprotocol/services/blob/2db800aa38824e32fb542c9e2387d77ca6349676/crates/app-data-hash/src/lib.rs#L41-L44
 NEW_PREFIX = bytearray([1, 0x55, 0x1B, 32])
 
+# App data endpoints of the cow protocol backend (prod and staging)
+BACKEND_URLS = (
+    "https://api.cow.fi/mainnet/api/v1/app_data/",
+    "https://barn.api.cow.fi/mainnet/api/v1/app_data/",
+)
+# Timeout (seconds) of a single backend lookup
+BACKEND_TIMEOUT = 1.0
+# Idle backend connections are kept open (for reuse) this many seconds
+BACKEND_KEEPALIVE = 30.0
+
+# Number of app hashes resolved concurrently by `Cid.fetch_many`
+FETCH_CONCURRENCY = 32
+# A lookup in the next (lower priority) source starts after this many seconds
+# without content from the previous ones (0 races all sources, None looks them up in turn)
+HEDGE_DELAY = 0.5
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+T = TypeVar("T")
+Lookup = Callable[[], Awaitable[FoundContent | NotFoundContent]]
+
+
+@dataclass
+class LatencyStats:
+    """
+    Latencies of (completed) content lookups, per source (backend, IPFS),
+    along with the number of hashes whose content was taken from each source.
+    """
+
+    samples: defaultdict[str, list[float]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    wins: Counter[str] = field(default_factory=Counter)
+
+    async def timed(self, source: str, lookup: Awaitable[T]) -> T:
+        """Awaits `lookup`, recording its latency for `source` (unless it is cancelled)"""
+        start = time.perf_counter()
+        result = await lookup
+        self.samples[source].append(time.perf_counter() - start)
+        return result
+
+    def histogram(self, source: str) -> dict[str, int]:
+        """Number of lookups of `source` per latency bucket"""
+        counts = {f"<={bound}s": 0 for bound in LATENCY_BUCKETS}
+        counts[f">{LATENCY_BUCKETS[-1]}s"] = 0
+        for latency in self.samples[source]:
+            bucket = next(
+                (f"<={bound}s" for bound in LATENCY_BUCKETS if latency <= bound),
+                f">{LATENCY_BUCKETS[-1]}s",
+            )
+            counts[bucket] += 1
+        return counts
+
+    def report(self) -> None:
+        """Logs the latency distribution of each source"""
+        for source, latencies in sorted(self.samples.items()):
+            log.info(
+                f"{source} lookups: {len(latencies)}, "
+                f"median {statistics.median(latencies):.3f}s, "
+                f"max {max(latencies):.3f}s, histogram {self.histogram(source)}"
+            )
+        if self.wins:
+            log.info(f"content found per source: {dict(self.wins)}")
+
+
+async def resolve_hedged(
+    lookups: list[tuple[str, Lookup]],
+    hedge_delay: Optional[float],
+    stats: LatencyStats,
+) -> FoundContent | NotFoundContent:
+    """
+    Looks up content in `lookups` (source and lookup, by priority), starting the lookup
+    in the next source once the previous ones failed or after `hedge_delay` seconds.
+    Returns the first content found (the highest priority one if several finish at once),
+    cancelling the remaining lookups. Without any content, the last source's result is
+    returned.
+    """
+    priority = {source: index for index, (source, _) in enumerate(lookups)}
+    running: dict[asyncio.Task[FoundContent | NotFoundContent], str] = {}
+    failed: dict[str, FoundContent | NotFoundContent] = {}
+
+    def start_next() -> None:
+        source, lookup = lookups[len(running) + len(failed)]
+        running[asyncio.create_task(stats.timed(source, lookup()))] = source
+
+    start_next()
+    try:
+        while running:
+            pending_sources = len(running) + len(failed) < len(lookups)
+            done, _ = await asyncio.wait(
+                running,
+                timeout=hedge_delay if pending_sources else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            finished = sorted(
+                ((running.pop(task), task.result()) for task in done),
+                key=lambda outcome: priority[outcome[0]],
+            )
+            for source, result in finished:
+                if isinstance(result, FoundContent):
+                    stats.wins[source] += 1
+                    return result
+                failed[source] = result
+            # Either the hedge delay passed or lookups failed: try the next source.
+            if pending_sources:
+                start_next()
+    finally:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+    return failed[lookups[-1][0]]
+
 
 class Cid:
     """Holds logic for constructing and converting various representations of a Delegation ID"""
@@ -40,9 +157,8 @@ class Cid:
     ) -> FoundContent | NotFoundContent:
         """Fetches the given app data hash from the cow protocol backend (prod and staging)"""
 
-        envs = ["api", "barn.api"]
-        for env in envs:
-            url = f"https://{env}.cow.fi/mainnet/api/v1/app_data/{hex_str}"
+        for backend_url in BACKEND_URLS:
+            url = f"{backend_url}{hex_str}"
             response = cls.fetch_from_backend_inner(
                 url, hex_str, first_seen_block, attempts
             )
@@ -56,19 +172,94 @@ class Cid:
         cls, url: str, hex_str: str, first_seen_block: int, attempts: int
     ) -> Optional[FoundContent]:
         """Fetches the given app data hash from the specified backend url"""
-        response = requests.get(url, timeout=1)
+        response = requests.get(url, timeout=BACKEND_TIMEOUT)
         if response.status_code != 200:
             return None
+        return cls._found_in_backend(
+            response.json()["fullAppData"], hex_str, first_seen_block, attempts
+        )
 
+    @staticmethod
+    def _found_in_backend(
+        app_data_string: str, hex_str: str, first_seen_block: int, attempts: int
+    ) -> FoundContent:
         if attempts:
             log.debug(f"Found previously missing content hash {hex_str} in the backend")
         else:
             log.debug(
                 f"Found content for {hex_str} in the backend ({attempts + 1} trys)"
             )
-        app_data_string = response.json()["fullAppData"]
         return FoundContent(hex_str, first_seen_block, json.loads(app_data_string))
 
+    @staticmethod
+    def backend_session(
+        timeout: float = BACKEND_TIMEOUT, connections: int = FETCH_CONCURRENCY
+    ) -> ClientSession:
+        """
+        Pooled session for backend lookups: connections are kept alive between lookups
+        and each lookup is limited to `timeout` seconds.
+        """
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=connections, keepalive_timeout=BACKEND_KEEPALIVE
+            ),
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        )
+
+    @classmethod
+    async def fetch_from_backend_async(
+        cls,
+        hex_str: str,
+        first_seen_block: int,
+        attempts: int,
+        session: ClientSession,
+    ) -> FoundContent | NotFoundContent:
+        """
+        Fetches the given app data hash from the cow protocol backend,
+        querying prod and staging concurrently. The first backend to return content wins.
+        """
+        lookups = [
+            asyncio.create_task(
+                cls.fetch_from_backend_url(
+                    session, f"{url}{hex_str}", hex_str, first_seen_block, attempts
+                )
+            )
+            for url in BACKEND_URLS
+        ]
+        try:
+            for lookup in asyncio.as_completed(lookups):
+                found = await lookup
+                if found is not None:
+                    return found
+        finally:
+            for pending in lookups:
+                pending.cancel()
+            # Lets the losing lookups finish cancelling (and release their connections).
+            await asyncio.gather(*lookups, return_exceptions=True)
+        return NotFoundContent(hex_str, first_seen_block, attempts + 1)
+
+    @classmethod
+    async def fetch_from_backend_url(
+        cls,
+        session: ClientSession,
+        url: str,
+        hex_str: str,
+        first_seen_block: int,
+        attempts: int,
+    ) -> Optional[FoundContent]:
+        """Fetches the given app data hash from the specified backend url (asynchronously)"""
+        try:
+            async with session.get(url) as response:
+                if response.status != 200:
+                    return None
+                app_data = await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            log.debug(f"backend lookup {url} failed: {err!r}")
+            return None
+        return cls._found_in_backend(
+            app_data["fullAppData"], hex_str, first_seen_block, attempts
+        )
+
     @property
     def hex(self) -> str:
         """Returns hex representation"""
@@ -110,46 +301,113 @@ class Cid:
         return None
 
     @classmethod
-    async def fetch_many(  # pylint: disable=too-many-locals
-        cls, missing_rows: list[dict[str, str]], access_token: str, max_retries: int = 3
+    async def fetch_many(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+        cls,
+        missing_rows: list[dict[str, str]],
+        access_token: str,
+        max_retries: int = 3,
+        concurrency: int = FETCH_CONCURRENCY,
+        stats: Optional[LatencyStats] = None,
+        backend_timeout: float = BACKEND_TIMEOUT,
+        cache: Optional[ContentCache] = None,
+        hedge_delay: Optional[float] = HEDGE_DELAY,
     ) -> tuple[list[FoundContent], list[NotFoundContent]]:
-        """Async AppData Fetching"""
-        found, not_found = [], []
+        """
+        Async AppData Fetching: resolves up to `concurrency` app hashes at once.
+        Lookup latencies are recorded in (and reported from) `stats`.
+        With a `cache`, cached content is returned without any lookup
+        and newly resolved content is added to it.
+        Sources are looked up in order of priority, each starting at the latest
+        `hedge_delay` seconds after the previous one (see `resolve_hedged`).
+        """
+        cached: dict[str, FoundContent] = {}
+        if cache is not None:
+            cached = cache.get_many(row["app_hash"] for row in missing_rows)
+        latencies = stats if stats is not None else LatencyStats()
+        semaphore = asyncio.Semaphore(concurrency)
         async with aiohttp.ClientSession(
             headers={"x-pinata-gateway-token": access_token}
-        ) as session:
-            while missing_rows:
-                row = missing_rows.pop()
-                app_hash = row["app_hash"]
-
-                previous_attempts = int(row.get("attempts", 0))
-                cid = cls(app_hash)
-
-                first_seen_block = int(row["first_seen_block"])
-                # try fetching any format from backend (prod and staging)
-                result = cls.fetch_from_backend(
-                    app_hash, first_seen_block, previous_attempts
-                )
+        ) as session, cls.backend_session(
+            backend_timeout, connections=concurrency
+        ) as backend_session:
 
-                if isinstance(result, NotFoundContent):
-                    # try fetching new format from IPFS
-                    result = await cid.fetch_content(
-                        max_retries, previous_attempts, session, first_seen_block
+            async def resolve(row: dict[str, str]) -> FoundContent | NotFoundContent:
+                if row["app_hash"] in cached:
+                    # Only the content is cached, the row is the source of its block.
+                    return FoundContent(
+                        row["app_hash"],
+                        int(row["first_seen_block"]),
+                        cached[row["app_hash"]].content,
                     )
-
-                if isinstance(result, NotFoundContent):
-                    # try fetching the old format from IPFS
-                    result = await cls.old_schema(app_hash).fetch_content(
-                        max_retries, previous_attempts, session, first_seen_block
+                async with semaphore:
+                    return await cls._resolve(
+                        row,
+                        max_retries,
+                        (session, backend_session),
+                        latencies,
+                        hedge_delay,
                     )
 
-                if isinstance(result, FoundContent):
-                    found.append(result)
-                else:
-                    assert isinstance(result, NotFoundContent)
-                    not_found.append(result)
+            results = await asyncio.gather(*(resolve(row) for row in missing_rows))
 
-            return found, not_found
+        latencies.report()
+        if cache is not None:
+            cache.put_many(
+                result
+                for result in results
+                if isinstance(result, FoundContent) and result.app_hash not in cached
+            )
+            cache.report()
+        found = [result for result in results if isinstance(result, FoundContent)]
+        not_found = [
+            result for result in results if isinstance(result, NotFoundContent)
+        ]
+        return found, not_found
+
+    @classmethod
+    async def _resolve(
+        cls,
+        row: dict[str, str],
+        max_retries: int,
+        sessions: tuple[ClientSession, ClientSession],
+        stats: LatencyStats,
+        hedge_delay: Optional[float],
+    ) -> FoundContent | NotFoundContent:
+        """
+        Looks up the content of a single app hash in the backend and then IPFS
+        (`sessions`: IPFS and backend session), hedged by `hedge_delay`.
+        """
+        session, backend_session = sessions
+        app_hash = row["app_hash"]
+        previous_attempts = int(row.get("attempts", 0))
+        first_seen_block = int(row["first_seen_block"])
+        return await resolve_hedged(
+            [
+                # any format from backend (prod and staging)
+                (
+                    "backend",
+                    lambda: cls.fetch_from_backend_async(
+                        app_hash, first_seen_block, previous_attempts, backend_session
+                    ),
+                ),
+                # new format from IPFS
+                (
+                    "ipfs",
+                    lambda: cls(app_hash).fetch_content(
+                        max_retries, previous_attempts, session, first_seen_block
+                    ),
+                ),
+                # old format from IPFS
+                (
+                    "ipfs_old_schema",
+                    lambda: cls.old_schema(app_hash).fetch_content(
+                        max_retries, previous_attempts, session, first_seen_block
+                    ),
+                ),
+            ],
+            hedge_delay,
+            stats,
+        )
 
     async def fetch_content(
         self,
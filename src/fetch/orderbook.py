@@ -2,23 +2,48 @@
 from __future__ import annotations
 
 import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
 from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Callable, Generator, Iterator, Optional, Union
 
 import pandas as pd
 from dotenv import load_dotenv
 from pandas import DataFrame
 from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql.elements import TextClause
 
+from src.fetch.arrow_dtypes import to_arrow_dtypes
+from src.environment import env_flag
+from src.fetch.pg_copy import read_sql_copy
 from src.logger import set_log
 from src.models.block_range import BlockRange
-from src.utils import open_query
+from src.orderbook_queries import ORDERBOOK_QUERIES
 
 log = set_log(__name__)
 
 MAX_PROCESSING_DELAY = 10
+# lower and upper ETH cap for batch reward payments (in WEI)
+EPSILON_LOWER = 10000000000000000
+EPSILON_UPPER = 12000000000000000
+# Chunks of barn results buffered while prod results are streamed
+STREAM_PREFETCH_CHUNKS = 2
+# Number of app hashes bound per APP_HASHES_FOR query
+APP_HASHES_BATCH_SIZE = 10_000
+
+ORDER_REWARDS_DATA_TYPES = {"block_number": "int64", "amount": "float64"}
+BATCH_REWARDS_DATA_TYPES = {
+    # According to this: https://stackoverflow.com/a/11548224
+    # capitalized int64 means `Optional<Integer>` and it appears to work.
+    "block_number": "Int64",
+    "block_deadline": "int64",
+}
 
 
 class OrderbookEnv(Enum):
@@ -34,6 +59,111 @@ class OrderbookEnv(Enum):
         return str(self.value)
 
 
+class ExtractionBackend(Enum):
+    """
+    How query results are transferred from the database:
+    PANDAS - through the driver's cursor (`pd.read_sql_query`)
+    COPY - as CSV export through `COPY (...) TO STDOUT`
+    """
+
+    PANDAS = "pandas"
+    COPY = "copy"
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+
+@dataclass(frozen=True)
+class EngineConfig:
+    """
+    Connection pool settings shared by all orderbook database engines.
+    Values are read from the environment (see `.env.sample`) unless given explicitly.
+    """
+
+    pool_size: int = 5
+    max_overflow: int = 5
+    pool_pre_ping: bool = True
+    # Seconds after which pooled connections are replaced (-1 disables recycling)
+    pool_recycle: int = 1800
+    # Server side statement timeout in milliseconds (None means no timeout)
+    statement_timeout: Optional[int] = None
+
+    @classmethod
+    def new_from_environment(cls) -> EngineConfig:
+        """Constructs an EngineConfig from environment variables"""
+        load_dotenv()
+        statement_timeout = os.environ.get("DB_STATEMENT_TIMEOUT")
+        return cls(
+            pool_size=int(os.environ.get("DB_POOL_SIZE", cls.pool_size)),
+            max_overflow=int(os.environ.get("DB_MAX_OVERFLOW", cls.max_overflow)),
+            pool_pre_ping=env_flag("DB_POOL_PRE_PING", default=True),
+            pool_recycle=int(os.environ.get("DB_POOL_RECYCLE", cls.pool_recycle)),
+            statement_timeout=int(statement_timeout) if statement_timeout else None,
+        )
+
+
+class EngineRegistry:
+    """
+    Process wide registry of pooled SQLAlchemy engines, one per orderbook environment.
+    Engines (and thus their connection pools) are created on first use and reused
+    by every subsequent query against the same database.
+    """
+
+    def __init__(self, config: Optional[EngineConfig] = None) -> None:
+        self._config = config
+        self._engines: dict[OrderbookEnv, Engine] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def config(self) -> EngineConfig:
+        """Pool configuration (loaded from environment on first access)"""
+        if self._config is None:
+            self._config = EngineConfig.new_from_environment()
+        return self._config
+
+    def configure(self, config: EngineConfig) -> None:
+        """Replaces the pool configuration, disposing of all existing engines"""
+        self.dispose()
+        with self._lock:
+            self._config = config
+
+    def get(self, db_env: OrderbookEnv) -> Engine:
+        """Returns the pooled engine for `db_env`, creating it if necessary"""
+        with self._lock:
+            engine = self._engines.get(db_env)
+            if engine is None:
+                engine = self._create_engine(db_env, self.config)
+                self._engines[db_env] = engine
+            return engine
+
+    def dispose(self) -> None:
+        """Closes all pooled connections and forgets the engines"""
+        with self._lock:
+            for engine in self._engines.values():
+                engine.dispose()
+            self._engines.clear()
+
+    @staticmethod
+    def _create_engine(db_env: OrderbookEnv, config: EngineConfig) -> Engine:
+        load_dotenv()
+        db_url = os.environ[f"{db_env}_DB_URL"]
+        connect_args = {}
+        if config.statement_timeout is not None:
+            connect_args["options"] = f"-c statement_timeout={config.statement_timeout}"
+        log.debug(f"creating connection pool for {db_env} database")
+        return create_engine(
+            f"postgresql+psycopg2://{db_url}",
+            pool_size=config.pool_size,
+            max_overflow=config.max_overflow,
+            pool_pre_ping=config.pool_pre_ping,
+            pool_recycle=config.pool_recycle,
+            connect_args=connect_args,
+        )
+
+
+ENGINES = EngineRegistry()
+
+
 @dataclass
 class OrderbookFetcher:
     """
@@ -43,28 +173,89 @@ class OrderbookFetcher:
 
     @staticmethod
     def _pg_engine(db_env: OrderbookEnv) -> Engine:
-        """Returns a connection to postgres database"""
-        load_dotenv()
-        db_url = os.environ[f"{db_env}_DB_URL"]
-        db_string = f"postgresql+psycopg2://{db_url}"
-        return create_engine(db_string)
+        """Returns the pooled connection engine for postgres database `db_env`"""
+        return ENGINES.get(db_env)
 
     @classmethod
     def _read_query_for_env(
-        cls, query: str, env: OrderbookEnv, data_types: Optional[dict[str, str]] = None
+        cls,
+        query: TextClause,
+        env: OrderbookEnv,
+        data_types: Optional[dict[str, str]] = None,
+        on_connect: Optional[Callable[[Connection], None]] = None,
+        backend: ExtractionBackend = ExtractionBackend.PANDAS,
     ) -> DataFrame:
-        return pd.read_sql_query(query, con=cls._pg_engine(env), dtype=data_types)
+        """
+        Executes `query` against the database of `env`.
+        `on_connect` receives the connection before the query starts (e.g. for cancellation).
+        """
+        start = time.perf_counter()
+        with cls._pg_engine(env).connect() as connection:
+            if on_connect is not None:
+                on_connect(connection)
+            if backend == ExtractionBackend.COPY:
+                result = read_sql_copy(query, connection, data_types)
+            else:
+                result = pd.read_sql_query(query, con=connection, dtype=data_types)
+        log.info(
+            f"{env} query returned {len(result)} rows in {time.perf_counter() - start:.2f}s"
+        )
+        return result
+
+    @staticmethod
+    def _cancel_query(connection: Connection) -> None:
+        """Asks the server to abort whatever is currently running on `connection`"""
+        try:
+            connection.connection.dbapi_connection.cancel()
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            log.warning(f"failed to cancel running query: {err}")
 
     @classmethod
     def _query_both_dbs(
         cls,
-        query_prod: str,
-        query_barn: str,
+        query_prod: TextClause,
+        query_barn: TextClause,
         data_types: Optional[dict[str, str]] = None,
+        backend: ExtractionBackend = ExtractionBackend.PANDAS,
     ) -> tuple[DataFrame, DataFrame]:
-        barn = cls._read_query_for_env(query_barn, OrderbookEnv.BARN, data_types)
-        prod = cls._read_query_for_env(query_prod, OrderbookEnv.PROD, data_types)
-        return barn, prod
+        """
+        Runs the barn and prod queries concurrently.
+        If either query fails, the other one is cancelled and the error is raised.
+        """
+        connections: dict[OrderbookEnv, Connection] = {}
+
+        def register(env: OrderbookEnv) -> Callable[[Connection], None]:
+            return lambda connection: connections.__setitem__(env, connection)
+
+        queries = {OrderbookEnv.BARN: query_barn, OrderbookEnv.PROD: query_prod}
+        results: dict[OrderbookEnv, DataFrame] = {}
+        with ThreadPoolExecutor(
+            max_workers=len(queries), thread_name_prefix="orderbook"
+        ) as executor:
+            futures = {
+                executor.submit(
+                    cls._read_query_for_env,
+                    query,
+                    env,
+                    data_types,
+                    register(env),
+                    backend,
+                ): env
+                for env, query in queries.items()
+            }
+            try:
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+            except Exception as err:
+                log.error(
+                    f"{futures[future]} query failed, cancelling remaining: {err}"
+                )
+                for pending, env in futures.items():
+                    if not pending.cancel() and not pending.done():
+                        if env in connections:
+                            cls._cancel_query(connections[env])
+                raise
+        return results[OrderbookEnv.BARN], results[OrderbookEnv.PROD]
 
     @classmethod
     def get_latest_block(cls) -> int:
@@ -72,40 +263,60 @@ class OrderbookFetcher:
         Fetches the latest mutually synced block from orderbook databases (with REORG protection)
         """
         data_types = {"latest": "int64"}
-        query_barn_prod = open_query("orderbook/latest_block.sql")
+        query_barn_prod = ORDERBOOK_QUERIES["LATEST_BLOCK"].bind()
         barn, prod = cls._query_both_dbs(query_barn_prod, query_barn_prod, data_types)
         assert len(barn) == 1 == len(prod), "Expecting single record"
         return (
             max(int(barn["latest"][0]), int(prod["latest"][0])) - MAX_PROCESSING_DELAY
         )
 
-    @classmethod
-    def get_order_rewards(cls, block_range: BlockRange) -> DataFrame:
-        """
-        Fetches and validates Order Reward DataFrame as concatenation from Prod and Staging DB
-        """
-        cow_reward_query_prod = (
-            open_query("orderbook/prod_order_rewards.sql")
-            .replace("{{start_block}}", str(block_range.block_from))
-            .replace("{{end_block}}", str(block_range.block_to))
-        )
-        cow_reward_query_barn = (
-            open_query("orderbook/barn_order_rewards.sql")
-            .replace("{{start_block}}", str(block_range.block_from))
-            .replace("{{end_block}}", str(block_range.block_to))
+    @staticmethod
+    def _order_rewards_queries(
+        block_range: BlockRange,
+    ) -> tuple[TextClause, TextClause]:
+        """Returns the (prod, barn) order rewards queries for `block_range`"""
+        params = {
+            "start_block": block_range.block_from,
+            "end_block": block_range.block_to,
+        }
+        return (
+            ORDERBOOK_QUERIES["PROD_ORDER_REWARDS"].bind(**params),
+            ORDERBOOK_QUERIES["BARN_ORDER_REWARDS"].bind(**params),
         )
-        data_types = {"block_number": "int64", "amount": "float64"}
-        barn, prod = cls._query_both_dbs(
-            cow_reward_query_prod, cow_reward_query_barn, data_types
+
+    @staticmethod
+    def _batch_rewards_queries(
+        block_range: BlockRange,
+    ) -> tuple[TextClause, TextClause]:
+        """Returns the (prod, barn) batch rewards queries for `block_range`"""
+        params = {
+            "start_block": block_range.block_from,
+            "end_block": block_range.block_to,
+            "EPSILON_LOWER": EPSILON_LOWER,
+            "EPSILON_UPPER": EPSILON_UPPER,
+        }
+        return (
+            ORDERBOOK_QUERIES["PROD_BATCH_REWARDS"].bind(**params),
+            ORDERBOOK_QUERIES["BARN_BATCH_REWARDS"].bind(**params),
         )
 
-        # Warn if solver appear in both environments.
-        if not set(prod.solver).isdisjoint(set(barn.solver)):
+    @staticmethod
+    def _warn_solver_overlap(
+        prod_solvers: set[str], barn_solvers: set[str], block_range: BlockRange
+    ) -> None:
+        """Warn if solver appear in both environments."""
+        if not prod_solvers.isdisjoint(barn_solvers):
             log.warning(
                 f"solver overlap in {block_range}: solvers "
-                f"{set(prod.solver).intersection(set(barn.solver))} part of both prod and barn"
+                f"{prod_solvers.intersection(barn_solvers)} part of both prod and barn"
             )
 
+    @classmethod
+    def _combine_rewards(
+        cls, prod: DataFrame, barn: DataFrame, block_range: BlockRange
+    ) -> DataFrame:
+        cls._warn_solver_overlap(set(prod.solver), set(barn.solver), block_range)
+
         if not prod.empty and not barn.empty:
             return pd.concat([prod, barn])
         if not prod.empty:
@@ -115,72 +326,261 @@ class OrderbookFetcher:
         return pd.DataFrame()
 
     @classmethod
-    def get_batch_rewards(cls, block_range: BlockRange) -> DataFrame:
+    def _stream_query_for_env(
+        cls,
+        query: TextClause,
+        env: OrderbookEnv,
+        chunk_size: int,
+        data_types: Optional[dict[str, str]] = None,
+    ) -> Generator[DataFrame, None, None]:
         """
-        Fetches and validates Batch Rewards DataFrame as concatenation from Prod and Staging DB
+        Executes `query` against the database of `env` with a server side cursor,
+        yielding DataFrames of at most `chunk_size` rows.
+        """
+        start, num_rows = time.perf_counter(), 0
+        with cls._pg_engine(env).connect() as connection:
+            streaming = connection.execution_options(
+                stream_results=True, max_row_buffer=chunk_size
+            )
+            for chunk in pd.read_sql_query(
+                query, con=streaming, dtype=data_types, chunksize=chunk_size
+            ):
+                num_rows += len(chunk)
+                yield chunk
+        log.info(
+            f"{env} query streamed {num_rows} rows in {time.perf_counter() - start:.2f}s"
+        )
+
+    @classmethod
+    def _stream_both_dbs(
+        cls,
+        query_prod: TextClause,
+        query_barn: TextClause,
+        chunk_size: int,
+        data_types: Optional[dict[str, str]] = None,
+    ) -> Iterator[tuple[OrderbookEnv, DataFrame]]:
+        """
+        Streams prod and then barn results in chunks of at most `chunk_size` rows.
+        Both queries run concurrently: while prod chunks are consumed, barn chunks
+        are prefetched into a buffer of at most `STREAM_PREFETCH_CHUNKS` chunks.
+        If either query fails, the error is raised once its results are reached.
         """
-        cow_reward_query_prod = (
-            open_query("orderbook/prod_batch_rewards.sql")
-            .replace("{{start_block}}", str(block_range.block_from))
-            .replace("{{end_block}}", str(block_range.block_to))
-            .replace(
-                "{{EPSILON_LOWER}}", "10000000000000000"
-            )  # lower ETH cap for payment (in WEI)
-            .replace(
-                "{{EPSILON_UPPER}}", "12000000000000000"
-            )  # upper ETH cap for payment (in WEI)
-        )
-        cow_reward_query_barn = (
-            open_query("orderbook/barn_batch_rewards.sql")
-            .replace("{{start_block}}", str(block_range.block_from))
-            .replace("{{end_block}}", str(block_range.block_to))
-            .replace(
-                "{{EPSILON_LOWER}}", "10000000000000000"
-            )  # lower ETH cap for payment (in WEI)
-            .replace(
-                "{{EPSILON_UPPER}}", "12000000000000000"
-            )  # upper ETH cap for payment (in WEI)
-        )
-        data_types = {
-            # According to this: https://stackoverflow.com/a/11548224
-            # capitalized int64 means `Optional<Integer>` and it appears to work.
-            "block_number": "Int64",
-            "block_deadline": "int64",
+        stop = threading.Event()
+        buffers: dict[OrderbookEnv, queue.Queue[Union[DataFrame, Exception, None]]] = {
+            OrderbookEnv.PROD: queue.Queue(maxsize=STREAM_PREFETCH_CHUNKS),
+            OrderbookEnv.BARN: queue.Queue(maxsize=STREAM_PREFETCH_CHUNKS),
         }
+
+        def produce(env: OrderbookEnv, query: TextClause) -> None:
+            def put(item: Union[DataFrame, Exception, None]) -> bool:
+                # Gives up (returning False) once the consumer has stopped.
+                while not stop.is_set():
+                    try:
+                        buffers[env].put(item, timeout=0.1)
+                        return True
+                    except queue.Full:
+                        continue
+                return False
+
+            try:
+                with closing(
+                    cls._stream_query_for_env(query, env, chunk_size, data_types)
+                ) as chunks:
+                    for chunk in chunks:
+                        if not put(chunk):
+                            return
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                put(err)
+                return
+            put(None)
+
+        with ThreadPoolExecutor(
+            max_workers=len(buffers), thread_name_prefix="orderbook"
+        ) as executor:
+            executor.submit(produce, OrderbookEnv.PROD, query_prod)
+            executor.submit(produce, OrderbookEnv.BARN, query_barn)
+            try:
+                for env, buffer in buffers.items():
+                    while (item := buffer.get()) is not None:
+                        if isinstance(item, Exception):
+                            log.error(f"{env} query failed: {item}")
+                            raise item
+                        yield env, item
+            finally:
+                # Stops the producers (also when the consumer stops early).
+                stop.set()
+
+    @classmethod
+    def _stream_rewards(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        cls,
+        query_prod: TextClause,
+        query_barn: TextClause,
+        chunk_size: int,
+        data_types: dict[str, str],
+        block_range: BlockRange,
+        arrow: bool = False,
+    ) -> Iterator[DataFrame]:
+        """
+        Streams prod and then barn results in chunks of at most `chunk_size` rows
+        (both queries run concurrently, see `_stream_both_dbs`).
+        Only the solver sets are retained in memory (for the overlap warning).
+        """
+        solvers: dict[OrderbookEnv, set[str]] = {
+            OrderbookEnv.PROD: set(),
+            OrderbookEnv.BARN: set(),
+        }
+        for env, chunk in cls._stream_both_dbs(
+            query_prod, query_barn, chunk_size, data_types
+        ):
+            if chunk.empty:
+                continue
+            solvers[env].update(chunk.solver)
+            yield to_arrow_dtypes(chunk) if arrow else chunk
+        cls._warn_solver_overlap(
+            solvers[OrderbookEnv.PROD], solvers[OrderbookEnv.BARN], block_range
+        )
+
+    @classmethod
+    def get_order_rewards(
+        cls,
+        block_range: BlockRange,
+        backend: ExtractionBackend = ExtractionBackend.PANDAS,
+        arrow: bool = False,
+    ) -> DataFrame:
+        """
+        Fetches and validates Order Reward DataFrame as concatenation from Prod and Staging DB
+        With `arrow`, the DataFrame is returned with Arrow backed dtypes.
+        """
         barn, prod = cls._query_both_dbs(
-            cow_reward_query_prod, cow_reward_query_barn, data_types
+            *cls._order_rewards_queries(block_range),
+            ORDER_REWARDS_DATA_TYPES,
+            backend,
         )
+        rewards = cls._combine_rewards(prod, barn, block_range)
+        return to_arrow_dtypes(rewards) if arrow else rewards
 
-        # Warn if solver appear in both environments.
-        if not set(prod.solver).isdisjoint(set(barn.solver)):
-            log.warning(
-                f"solver overlap in {block_range}: solvers "
-                f"{set(prod.solver).intersection(set(barn.solver))} part of both prod and barn"
-            )
+    @classmethod
+    def stream_order_rewards(
+        cls, block_range: BlockRange, chunk_size: int, arrow: bool = False
+    ) -> Iterator[DataFrame]:
+        """
+        Streaming variant of `get_order_rewards`:
+        yields Order Reward DataFrames of at most `chunk_size` rows (Prod first, then Staging)
+        """
+        yield from cls._stream_rewards(
+            *cls._order_rewards_queries(block_range),
+            chunk_size,
+            ORDER_REWARDS_DATA_TYPES,
+            block_range,
+            arrow,
+        )
 
-        if not prod.empty and not barn.empty:
-            return pd.concat([prod, barn])
-        if not prod.empty:
-            return prod.copy()
-        if not barn.empty:
-            return barn.copy()
-        return pd.DataFrame()
+    @classmethod
+    def get_batch_rewards(
+        cls,
+        block_range: BlockRange,
+        backend: ExtractionBackend = ExtractionBackend.PANDAS,
+        arrow: bool = False,
+    ) -> DataFrame:
+        """
+        Fetches and validates Batch Rewards DataFrame as concatenation from Prod and Staging DB
+        With `arrow`, the DataFrame is returned with Arrow backed dtypes.
+        """
+        barn, prod = cls._query_both_dbs(
+            *cls._batch_rewards_queries(block_range),
+            BATCH_REWARDS_DATA_TYPES,
+            backend,
+        )
+        rewards = cls._combine_rewards(prod, barn, block_range)
+        return to_arrow_dtypes(rewards) if arrow else rewards
+
+    @classmethod
+    def stream_batch_rewards(
+        cls, block_range: BlockRange, chunk_size: int, arrow: bool = False
+    ) -> Iterator[DataFrame]:
+        """
+        Streaming variant of `get_batch_rewards`:
+        yields Batch Reward DataFrames of at most `chunk_size` rows (Prod first, then Staging)
+        """
+        yield from cls._stream_rewards(
+            *cls._batch_rewards_queries(block_range),
+            chunk_size,
+            BATCH_REWARDS_DATA_TYPES,
+            block_range,
+            arrow,
+        )
 
     @classmethod
     def get_app_hashes(cls) -> DataFrame:
         """
         Fetches all appData hashes and preimages from Prod and Staging DB
         """
-        app_data_query = open_query("app_hashes.sql")
+        app_data_query = ORDERBOOK_QUERIES["APP_HASHES"].bind()
         barn, prod = cls._query_both_dbs(app_data_query, app_data_query)
 
         # We are only interested in unique app data
         return pd.concat([prod, barn]).drop_duplicates().reset_index(drop=True)
 
     @classmethod
-    def get_price_feed(cls) -> DataFrame:
+    def get_new_app_hashes(cls, known_hashes: set[str]) -> DataFrame:
+        """
+        Fetches appData hashes and preimages from Prod and Staging DB,
+        restricted to hashes not contained in `known_hashes`.
+        Only the hashes are transferred for already known app data.
+        Preimages are fetched in batches of `APP_HASHES_BATCH_SIZE` hashes,
+        so that the bound array stays small even when (re)publishing everything.
+        """
+        keys_query = ORDERBOOK_QUERIES["APP_HASH_KEYS"].bind()
+        barn, prod = cls._query_both_dbs(keys_query, keys_query)
+        new_hashes: set[str] = (
+            set(prod.contract_app_data).union(barn.contract_app_data) - known_hashes
+        )
+        log.info(f"found {len(new_hashes)} new app hashes")
+        if not new_hashes:
+            return pd.DataFrame()
+
+        hashes = [bytes.fromhex(app_hash[2:]) for app_hash in sorted(new_hashes)]
+        frames: list[DataFrame] = []
+        for start in range(0, len(hashes), APP_HASHES_BATCH_SIZE):
+            app_data_query = ORDERBOOK_QUERIES["APP_HASHES_FOR"].bind(
+                hashes=hashes[start : start + APP_HASHES_BATCH_SIZE]
+            )
+            barn, prod = cls._query_both_dbs(app_data_query, app_data_query)
+            frames.extend([prod, barn])
+        return pd.concat(frames).drop_duplicates().reset_index(drop=True)
+
+    @classmethod
+    def get_missing_app_hashes(cls) -> DataFrame:
+        """
+        Fetches appData hashes of traded orders without preimage in Prod or Staging DB,
+        along with the first block (in either) they were traded in.
+        """
+        missing_query = ORDERBOOK_QUERIES["MISSING_APP_HASHES"].bind()
+        barn, prod = cls._query_both_dbs(
+            missing_query, missing_query, {"first_seen_block": "int64"}
+        )
+        missing = pd.concat([prod, barn])
+        return missing.groupby("app_hash", as_index=False).agg(
+            first_seen_block=("first_seen_block", "min")
+        )
+
+    @classmethod
+    def get_price_feed(
+        cls,
+        backend: ExtractionBackend = ExtractionBackend.PANDAS,
+        arrow: bool = False,
+        since: Optional[datetime] = None,
+    ) -> DataFrame:
         """
         Fetches prices from multiple price feeds from the analytics db
+        (only those at or after `since`, if given).
+        With `arrow`, the DataFrame is returned with Arrow backed dtypes.
         """
-        prices_query = open_query("prices.sql")
-        return cls._read_query_for_env(prices_query, OrderbookEnv.ANALYTICS)
+        if since is None:
+            prices_query = ORDERBOOK_QUERIES["PRICE_FEED"].bind()
+        else:
+            prices_query = ORDERBOOK_QUERIES["PRICE_FEED_SINCE"].bind(since=since)
+        prices = cls._read_query_for_env(
+            prices_query, OrderbookEnv.ANALYTICS, backend=backend
+        )
+        return to_arrow_dtypes(prices) if arrow else prices
@@ -0,0 +1,105 @@
+"""
+Postgres COPY based query extraction.
+Query results are exported server side as CSV and parsed column-wise by pandas,
+avoiding the construction of a Python object per value by the database driver.
+"""
+from __future__ import annotations
+
+import io
+from typing import Callable, Optional
+
+import pandas as pd
+from pandas import DataFrame, Series
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.elements import TextClause
+
+NULL_MARKER = r"\N"
+
+# Postgres type OIDs (see pg_type.dat) which are not returned as text.
+INTEGER_TYPES = {20, 21, 23}
+FLOAT_TYPES = {700, 701, 1700}
+BOOL_TYPES = {16}
+TIMESTAMP_TYPES = {1114}
+TIMESTAMPTZ_TYPES = {1184}
+
+
+def _to_text(column: Series) -> Series:
+    return column.astype(object).where(column.notna(), None)
+
+
+def _to_bool(column: Series) -> Series:
+    return column.map({"t": True, "f": False})
+
+
+def _to_datetime(column: Series) -> Series:
+    return pd.to_datetime(column)
+
+
+def _to_datetime_utc(column: Series) -> Series:
+    return pd.to_datetime(column, utc=True)
+
+
+def _converter(type_code: int) -> Callable[[Series], Series]:
+    """
+    Returns the conversion from CSV text matching the column types of `pd.read_sql_query`
+    (in particular, numeric values are coerced to float)
+    """
+    if type_code in INTEGER_TYPES or type_code in FLOAT_TYPES:
+        return pd.to_numeric
+    if type_code in BOOL_TYPES:
+        return _to_bool
+    if type_code in TIMESTAMP_TYPES:
+        return _to_datetime
+    if type_code in TIMESTAMPTZ_TYPES:
+        return _to_datetime_utc
+    return _to_text
+
+
+def compile_query(query: TextClause, connection: Connection) -> str:
+    """Renders `query` with its bound parameters inlined (COPY does not accept parameters)"""
+    compiled = str(
+        query.compile(
+            dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+        )
+    )
+    if connection.dialect.paramstyle in ("format", "pyformat"):
+        # Literal percent signs are escaped for the driver, which is bypassed by COPY.
+        compiled = compiled.replace("%%", "%")
+    return compiled.strip().rstrip(";")
+
+
+def read_sql_copy(
+    query: TextClause,
+    connection: Connection,
+    data_types: Optional[dict[str, str]] = None,
+) -> DataFrame:
+    """
+    Equivalent of `pd.read_sql_query(query, connection, dtype=data_types)`
+    using `COPY (query) TO STDOUT` for the data transfer.
+    """
+    sql = compile_query(query, connection)
+    dbapi_connection = connection.connection.dbapi_connection
+    assert dbapi_connection is not None, "connection is closed"
+    buffer = io.BytesIO()
+    with dbapi_connection.cursor() as cursor:
+        # Result column types (without fetching any rows)
+        cursor.execute(f"SELECT * FROM ({sql}) AS q LIMIT 0")
+        columns = [(column.name, column.type_code) for column in cursor.description]
+        cursor.copy_expert(
+            f"COPY ({sql}) TO STDOUT WITH (FORMAT csv, HEADER true, NULL '{NULL_MARKER}')",
+            buffer,
+        )
+    buffer.seek(0)
+    frame = pd.read_csv(
+        buffer,
+        dtype=str,
+        na_values=[NULL_MARKER],
+        keep_default_na=False,
+    )
+    frame = DataFrame(
+        {name: _converter(type_code)(frame[name]) for name, type_code in columns},
+        columns=[name for name, _ in columns],
+    )
+    if data_types:
+        frame = frame.astype(data_types)
+    return frame
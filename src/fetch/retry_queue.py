@@ -0,0 +1,197 @@
+"""
+Persistent retry schedule of app hashes whose content could not be found (on the volume).
+Each failed lookup round backs off the next one exponentially (by the number of rounds),
+and hashes first seen longer than the retry horizon ago are given up on.
+
+Usage:
+    with RetryQueue(path) as queue:
+        rows = queue.filter_due(missing_rows, current_block)
+        found, not_found = await Cid.fetch_many(rows, access_token)
+        queue.record(found, not_found)
+"""
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Iterable, Optional
+
+from dotenv import load_dotenv
+
+from src.fetch.sqlite_store import SQLiteStore
+from src.logger import set_log
+from src.models.app_data_content import FoundContent, NotFoundContent
+
+log = set_log(__name__)
+
+# Mainnet blocks per day (12 second block time)
+BLOCKS_PER_DAY = 7200
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Backoff between lookups of missing content and horizon after which it is given up"""
+
+    # Delay after the first failed attempt, doubled with every further attempt
+    base_delay: timedelta = timedelta(minutes=10)
+    max_delay: timedelta = timedelta(days=1)
+    # Hashes first seen more than this many blocks ago are no longer retried
+    horizon_blocks: int = 30 * BLOCKS_PER_DAY
+
+    @classmethod
+    def new_from_environment(cls) -> RetryPolicy:
+        """Constructs a RetryPolicy from environment variables (see `.env.sample`)"""
+        load_dotenv()
+        default = cls()
+        base_minutes = os.environ.get("APP_DATA_RETRY_BASE_MINUTES")
+        max_hours = os.environ.get("APP_DATA_RETRY_MAX_HOURS")
+        horizon_days = os.environ.get("APP_DATA_RETRY_HORIZON_DAYS")
+        return cls(
+            base_delay=timedelta(minutes=float(base_minutes))
+            if base_minutes
+            else default.base_delay,
+            max_delay=timedelta(hours=float(max_hours))
+            if max_hours
+            else default.max_delay,
+            horizon_blocks=int(float(horizon_days) * BLOCKS_PER_DAY)
+            if horizon_days
+            else default.horizon_blocks,
+        )
+
+    def delay(self, attempts: int) -> timedelta:
+        """Delay before the next lookup of content not found in `attempts` lookup rounds"""
+        if attempts <= 0:
+            return timedelta(0)
+        # Cap the exponent, the delay is capped anyway.
+        return min(self.base_delay * (1 << min(attempts - 1, 32)), self.max_delay)
+
+    def given_up(self, first_seen_block: int, current_block: int) -> bool:
+        """True if content first seen at `first_seen_block` is past the retry horizon"""
+        return current_block - first_seen_block > self.horizon_blocks
+
+
+class RetryQueue(SQLiteStore):
+    """
+    SQLite backed schedule of the next lookup of each missing app hash.
+    `attempts` of queued hashes count lookup rounds (calls of `record`), independent
+    of the number of requests made per round.
+    """
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS retries (
+            app_hash TEXT PRIMARY KEY,
+            first_seen_block INTEGER NOT NULL,
+            attempts INTEGER NOT NULL,
+            next_attempt REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS retries_next_attempt ON retries (next_attempt)",
+    )
+
+    def __init__(self, path: Path, policy: RetryPolicy = RetryPolicy()):
+        super().__init__(path)
+        self.policy = policy
+
+    def __len__(self) -> int:
+        (count,) = self._db.execute("SELECT count(*) FROM retries").fetchone()
+        return int(count)
+
+    def record(
+        self,
+        found: Iterable[FoundContent],
+        not_found: Iterable[NotFoundContent],
+        now: Optional[float] = None,
+    ) -> None:
+        """
+        Records the outcome of a lookup round: found hashes leave the queue,
+        the next lookup of those not found is scheduled by their number of rounds.
+        """
+        now = time.time() if now is None else now
+        not_found = list(not_found)
+        previous = self._attempts(missing.app_hash for missing in not_found)
+        with self._db:
+            self._db.executemany(
+                "DELETE FROM retries WHERE app_hash = ?",
+                [(content.app_hash,) for content in found],
+            )
+            rows = []
+            for missing in not_found:
+                attempts = previous.get(missing.app_hash, 0) + 1
+                next_attempt = now + self.policy.delay(attempts).total_seconds()
+                rows.append(
+                    (missing.app_hash, missing.first_seen_block, attempts, next_attempt)
+                )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO retries VALUES (?, ?, ?, ?)", rows
+            )
+
+    def _attempts(self, app_hashes: Iterable[str]) -> dict[str, int]:
+        """Lookup rounds of those of `app_hashes` which are queued"""
+        queued = dict(self._db.execute("SELECT app_hash, attempts FROM retries"))
+        return {
+            app_hash: int(queued[app_hash])
+            for app_hash in app_hashes
+            if app_hash in queued
+        }
+
+    def next_due(self, app_hash: str) -> Optional[float]:
+        """Time of the next lookup of `app_hash` (None if it is not queued)"""
+        row = self._db.execute(
+            "SELECT next_attempt FROM retries WHERE app_hash = ?", (app_hash,)
+        ).fetchone()
+        return None if row is None else float(row[0])
+
+    def due_now(
+        self, current_block: int, now: Optional[float] = None
+    ) -> list[NotFoundContent]:
+        """Queued hashes whose next lookup is due (and which are within the horizon)"""
+        now = time.time() if now is None else now
+        rows = self._db.execute(
+            "SELECT app_hash, first_seen_block, attempts FROM retries "
+            "WHERE next_attempt <= ? AND first_seen_block >= ? "
+            "ORDER BY next_attempt",
+            (now, current_block - self.policy.horizon_blocks),
+        )
+        return [NotFoundContent(*row) for row in rows]
+
+    def filter_due(
+        self,
+        missing_rows: list[dict[str, str]],
+        current_block: int,
+        now: Optional[float] = None,
+    ) -> list[dict[str, str]]:
+        """
+        Those of `missing_rows` (as passed to `Cid.fetch_many`) to look up now:
+        hashes not yet queued, and queued ones which are due (with their `attempts`
+        so far). Hashes past the horizon are dropped either way.
+        """
+        due = {
+            missing.app_hash: missing.attempts
+            for missing in self.due_now(current_block, now)
+        }
+        queued = {
+            app_hash for (app_hash,) in self._db.execute("SELECT app_hash FROM retries")
+        }
+        rows = [
+            {**row, "attempts": str(due[row["app_hash"]])}
+            if row["app_hash"] in due
+            else row
+            for row in missing_rows
+            if not self.policy.given_up(int(row["first_seen_block"]), current_block)
+            and (row["app_hash"] in due or row["app_hash"] not in queued)
+        ]
+        log.info(
+            f"{len(rows)} of {len(missing_rows)} missing app hashes due for lookup"
+        )
+        return rows
+
+    def given_up(self, current_block: int) -> int:
+        """Number of queued hashes past the retry horizon"""
+        (count,) = self._db.execute(
+            "SELECT count(*) FROM retries WHERE first_seen_block < ?",
+            (current_block - self.policy.horizon_blocks,),
+        ).fetchone()
+        return int(count)
@@ -0,0 +1,40 @@
+"""Base of the SQLite databases kept on the volume (app data content cache and retries)"""
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+from types import TracebackType
+from typing import Optional, Type, TypeVar
+
+Store = TypeVar("Store", bound="SQLiteStore")
+
+
+class SQLiteStore:
+    """SQLite database at `path`, created (along with its `SCHEMA`) if it does not exist"""
+
+    # Statements creating the tables (and indices) of the store
+    SCHEMA: tuple[str, ...] = ()
+
+    def __init__(self, path: Path):
+        self.path = path
+        os.makedirs(path.parent, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        with self._db:
+            for statement in self.SCHEMA:
+                self._db.execute(statement)
+
+    def close(self) -> None:
+        """Closes the database connection"""
+        self._db.close()
+
+    def __enter__(self: Store) -> Store:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
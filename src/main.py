@@ -3,7 +3,6 @@ import argparse
 import asyncio
 import os
 from dataclasses import dataclass
-from pathlib import Path
 
 from dotenv import load_dotenv
 from dune_client.client import DuneClient
@@ -59,42 +58,36 @@ def main() -> None:
     orderbook = OrderbookFetcher()
 
     if args.sync_table == SyncTable.APP_DATA:
-        table = os.environ["APP_DATA_TARGET_TABLE"]
-        assert table, "APP_DATA sync needs a APP_DATA_TARGET_TABLE env"
         asyncio.run(
             sync_app_data(
                 orderbook,
                 dune=dune,
-                config=AppDataSyncConfig(table),
+                config=AppDataSyncConfig.new_from_environment(),
                 dry_run=args.dry_run,
             )
         )
     elif args.sync_table == SyncTable.PRICE_FEED:
-        table = os.environ["PRICE_FEED_TARGET_TABLE"]
-        assert table, "PRICE FEED sync needs a PRICE_FEED_TARGET_TABLE env"
         asyncio.run(
             sync_price_feed(
                 orderbook,
                 dune=dune,
-                config=PriceFeedSyncConfig(table),
+                config=PriceFeedSyncConfig.new_from_environment(),
                 dry_run=args.dry_run,
             )
         )
     elif args.sync_table == SyncTable.ORDER_REWARDS:
         aws = AWSClient.new_from_environment()
-        volume_path = Path(os.environ["VOLUME_PATH"])
         sync_order_rewards(
             aws,
-            config=SyncConfig(volume_path),
+            config=SyncConfig.new_from_environment(),
             fetcher=orderbook,
             dry_run=args.dry_run,
         )
     elif args.sync_table == SyncTable.BATCH_REWARDS:
         aws = AWSClient.new_from_environment()
-        volume_path = Path(os.environ["VOLUME_PATH"])
         sync_batch_rewards(
             aws,
-            config=SyncConfig(volume_path),
+            config=SyncConfig.new_from_environment(),
             fetcher=orderbook,
             dry_run=args.dry_run,
         )
@@ -4,9 +4,14 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any
 
-import pandas
 from pandas import DataFrame
 
+from src.models.columns import (
+    column_integers,
+    column_optional_integers,
+    column_values,
+)
+
 
 @dataclass
 class BatchRewards:
@@ -16,26 +21,54 @@ class BatchRewards:
 
     @classmethod
     def from_pdf_to_dune_records(cls, rewards_df: DataFrame) -> list[dict[str, Any]]:
-        """Converts Pandas DataFrame into the expected stream type for Dune"""
+        """
+        Converts Pandas DataFrame into the expected stream type for Dune.
+        All type conversions are applied column-wise, only the records are assembled per row.
+        """
+        columns = zip(
+            column_optional_integers(rewards_df["block_number"]),
+            column_values(rewards_df["tx_hash"]),
+            column_values(rewards_df["solver"]),
+            column_integers(rewards_df["block_deadline"]),
+            # All the following values are in WEI.
+            column_integers(rewards_df["uncapped_payment_eth"]),
+            column_integers(rewards_df["capped_payment"]),
+            column_integers(rewards_df["execution_cost"]),
+            column_integers(rewards_df["surplus"]),
+            column_integers(rewards_df["protocol_fee"]),
+            column_integers(rewards_df["network_fee"]),
+            column_integers(rewards_df["winning_score"]),
+            column_integers(rewards_df["reference_score"]),
+        )
         return [
             {
-                "block_number": int(row["block_number"])
-                if not pandas.isna(row["block_number"])
-                else None,
-                "tx_hash": row["tx_hash"],
-                "solver": row["solver"],
-                "block_deadline": int(row["block_deadline"]),
+                "block_number": block_number,
+                "tx_hash": tx_hash,
+                "solver": solver,
+                "block_deadline": block_deadline,
                 "data": {
-                    # All the following values are in WEI.
-                    "uncapped_payment_eth": int(row["uncapped_payment_eth"]),
-                    "capped_payment": int(row["capped_payment"]),
-                    "execution_cost": int(row["execution_cost"]),
-                    "surplus": int(row["surplus"]),
-                    "protocol_fee": int(row["protocol_fee"]),
-                    "fee": int(row["network_fee"]),
-                    "winning_score": int(row["winning_score"]),
-                    "reference_score": int(row["reference_score"]),
+                    "uncapped_payment_eth": uncapped_payment_eth,
+                    "capped_payment": capped_payment,
+                    "execution_cost": execution_cost,
+                    "surplus": surplus,
+                    "protocol_fee": protocol_fee,
+                    "fee": network_fee,
+                    "winning_score": winning_score,
+                    "reference_score": reference_score,
                 },
             }
-            for row in rewards_df.to_dict(orient="records")
+            for (
+                block_number,
+                tx_hash,
+                solver,
+                block_deadline,
+                uncapped_payment_eth,
+                capped_payment,
+                execution_cost,
+                surplus,
+                protocol_fee,
+                network_fee,
+                winning_score,
+                reference_score,
+            ) in columns
         ]
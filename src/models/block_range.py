@@ -1,6 +1,8 @@
 """
 BlockRange Model is just a data class for left and right bounds
 """
+from __future__ import annotations
+
 from dataclasses import dataclass
 
 from dune_client.types import QueryParameter
@@ -23,6 +25,18 @@ class BlockRange:
     def __repr__(self) -> str:
         return str(self)
 
+    def split(self, window_size: int) -> list[BlockRange]:
+        """
+        Splits the range into consecutive windows of at most `window_size` blocks.
+        Windows share their bounds (i.e. the `block_to` of one is the `block_from` of the next),
+        matching the exclusive lower and inclusive upper bound of our queries.
+        """
+        assert window_size > 0, "window_size must be positive"
+        return [
+            BlockRange(start, min(start + window_size, self.block_to))
+            for start in range(self.block_from, self.block_to, window_size)
+        ]
+
     def as_query_params(self) -> list[QueryParameter]:
         """Returns self as Dune QueryParameters"""
         return [
@@ -0,0 +1,55 @@
+"""
+Column-wise conversions of query results into the Python values of Dune records.
+Each function returns the same values as applying the corresponding cast to every row of
+`DataFrame.to_dict(orient="records")`, without materializing a dict per row.
+"""
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import pandas as pd
+from pandas import Series
+
+
+def column_values(column: Series) -> list[Any]:
+    """Python values of `column` (as `DataFrame.to_dict` returns them: nulls are None)"""
+    if isinstance(column.dtype, pd.ArrowDtype):
+        return column.astype(object).where(column.notna(), None).tolist()
+    return column.tolist()
+
+
+def column_text(column: Series) -> list[str]:
+    """`str` of every value in `column`"""
+    return list(map(str, column_values(column)))
+
+
+def column_floats(column: Series) -> list[float]:
+    """`float` of every value in `column` (nulls are NaN)"""
+    return column.astype("float64").tolist()
+
+
+def column_integers(column: Series) -> list[int]:
+    """
+    `int` of every value in `column`, which may hold (text encoded) integers of any size,
+    e.g. numeric(78,0) wei amounts.
+    Integers are parsed in bulk when they all fit into int64, falling back to Python's
+    arbitrary precision `int` otherwise.
+    """
+    if pd.api.types.is_integer_dtype(column.dtype) and not column.hasnans:
+        return column.astype("int64").tolist()
+    values = column_values(column)
+    if column.dtype == object:
+        try:
+            return pd.Series(values, dtype=object).astype("int64").tolist()
+        except OverflowError:
+            pass
+    return list(map(int, values))
+
+
+def column_optional_integers(column: Series) -> list[Optional[int]]:
+    """As `column_integers`, but missing values (e.g. of nullable Int64 columns) become None"""
+    missing = column.isna()
+    if not missing.any():
+        return list(column_integers(column))
+    present = iter(column_integers(column[~missing]))
+    return [None if null else next(present) for null in missing.tolist()]
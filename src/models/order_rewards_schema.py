@@ -7,6 +7,8 @@ from typing import Any
 
 from pandas import DataFrame
 
+from src.models.columns import column_floats, column_text, column_values
+
 
 @dataclass
 class OrderRewards:
@@ -16,30 +18,68 @@ class OrderRewards:
 
     @classmethod
     def from_pdf_to_dune_records(cls, rewards_df: DataFrame) -> list[dict[str, Any]]:
-        """Converts Pandas DataFrame into the expected stream type for Dune"""
+        """
+        Converts Pandas DataFrame into the expected stream type for Dune.
+        All type conversions are applied column-wise, only the records are assembled per row.
+        """
+        columns = zip(
+            rewards_df["block_number"].astype("int64").tolist(),
+            column_values(rewards_df["order_uid"]),
+            column_values(rewards_df["tx_hash"]),
+            column_values(rewards_df["solver"]),
+            column_text(rewards_df["surplus_fee"]),
+            column_floats(rewards_df["amount"]),
+            column_values(rewards_df["quote_solver"]),
+            column_text(rewards_df["protocol_fee"]),
+            column_values(rewards_df["protocol_fee_token"]),
+            column_floats(rewards_df["protocol_fee_native_price"]),
+            column_text(rewards_df["quote_sell_amount"]),
+            column_text(rewards_df["quote_buy_amount"]),
+            column_floats(rewards_df["quote_gas_cost"]),
+            column_floats(rewards_df["quote_sell_token_price"]),
+            column_text(rewards_df["partner_fee"]),
+            column_values(rewards_df["partner_fee_recipient"]),
+            column_values(rewards_df["protocol_fee_kind"]),
+        )
         return [
             {
-                "block_number": int(row["block_number"]),
-                "order_uid": row["order_uid"],
-                "tx_hash": row["tx_hash"],
-                "solver": row["solver"],
+                "block_number": block_number,
+                "order_uid": order_uid,
+                "tx_hash": tx_hash,
+                "solver": solver,
                 "data": {
-                    "surplus_fee": str(row["surplus_fee"]),
-                    "amount": float(row["amount"]),
-                    "quote_solver": row["quote_solver"],
-                    "protocol_fee": str(row["protocol_fee"]),
-                    "protocol_fee_token": row["protocol_fee_token"],
-                    "protocol_fee_native_price": float(
-                        row["protocol_fee_native_price"]
-                    ),
-                    "quote_sell_amount": str(row["quote_sell_amount"]),
-                    "quote_buy_amount": str(row["quote_buy_amount"]),
-                    "quote_gas_cost": float(row["quote_gas_cost"]),
-                    "quote_sell_token_price": float(row["quote_sell_token_price"]),
-                    "partner_fee": str(row["partner_fee"]),
-                    "partner_fee_recipient": row["partner_fee_recipient"],
-                    "protocol_fee_kind": row["protocol_fee_kind"],
+                    "surplus_fee": surplus_fee,
+                    "amount": amount,
+                    "quote_solver": quote_solver,
+                    "protocol_fee": protocol_fee,
+                    "protocol_fee_token": protocol_fee_token,
+                    "protocol_fee_native_price": protocol_fee_native_price,
+                    "quote_sell_amount": quote_sell_amount,
+                    "quote_buy_amount": quote_buy_amount,
+                    "quote_gas_cost": quote_gas_cost,
+                    "quote_sell_token_price": quote_sell_token_price,
+                    "partner_fee": partner_fee,
+                    "partner_fee_recipient": partner_fee_recipient,
+                    "protocol_fee_kind": protocol_fee_kind,
                 },
             }
-            for row in rewards_df.to_dict(orient="records")
+            for (
+                block_number,
+                order_uid,
+                tx_hash,
+                solver,
+                surplus_fee,
+                amount,
+                quote_solver,
+                protocol_fee,
+                protocol_fee_token,
+                protocol_fee_native_price,
+                quote_sell_amount,
+                quote_buy_amount,
+                quote_gas_cost,
+                quote_sell_token_price,
+                partner_fee,
+                partner_fee_recipient,
+                protocol_fee_kind,
+            ) in columns
         ]
@@ -0,0 +1,115 @@
+"""
+Localized account of all Queries executed against the orderbook (and analytics) databases.
+Templates are read and validated once, at import, and values are passed as bound parameters.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+
+from src.utils import open_query
+
+# Templates use `{{name}}` placeholders (same as the dune queries)
+PLACEHOLDER = re.compile(r"{{(\w+)}}")
+
+
+@dataclass(frozen=True)
+class QueryTemplate:
+    """Parsed SQL template along with the set of parameters it requires."""
+
+    filename: str
+    sql: str
+    parameters: frozenset[str]
+    clause: TextClause = field(compare=False, repr=False)
+
+    @classmethod
+    def load(cls, filename: str, parameters: tuple[str, ...] = ()) -> QueryTemplate:
+        """
+        Reads `filename` (relative to QUERY_PATH), converting placeholders into bind parameters.
+        Raises ValueError if the placeholders in the file do not match `parameters`.
+        """
+        raw_sql = open_query(filename)
+        found = set(PLACEHOLDER.findall(raw_sql))
+        if found != set(parameters):
+            raise ValueError(
+                f"{filename} expects parameters {sorted(found)}, got {sorted(parameters)}"
+            )
+        sql = PLACEHOLDER.sub(r":\1", raw_sql)
+        return cls(
+            filename=filename,
+            sql=sql,
+            parameters=frozenset(parameters),
+            clause=text(sql),
+        )
+
+    def bind(self, **params: Any) -> TextClause:
+        """Returns executable statement with `params` bound"""
+        if set(params) != self.parameters:
+            raise ValueError(
+                f"{self.filename} expects parameters {sorted(self.parameters)}, "
+                f"got {sorted(params)}"
+            )
+        return self.clause.bindparams(**params)
+
+
+class QueryRegistry:
+    """
+    Named collection of query templates.
+    Files with identical content (e.g. prod and barn variants) share a single template.
+    """
+
+    def __init__(self) -> None:
+        self._templates: dict[str, QueryTemplate] = {}
+
+    def register(
+        self, name: str, filename: str, parameters: tuple[str, ...] = ()
+    ) -> QueryTemplate:
+        """Loads and registers template `filename` under `name`"""
+        template = QueryTemplate.load(filename, parameters)
+        for existing in self._templates.values():
+            if (
+                existing.sql == template.sql
+                and existing.parameters == template.parameters
+            ):
+                template = existing
+                break
+        self._templates[name] = template
+        return template
+
+    def __getitem__(self, name: str) -> QueryTemplate:
+        return self._templates[name]
+
+    def __len__(self) -> int:
+        return len({id(template) for template in self._templates.values()})
+
+
+BLOCK_RANGE_PARAMS = ("start_block", "end_block")
+
+ORDERBOOK_QUERIES = QueryRegistry()
+ORDERBOOK_QUERIES.register("LATEST_BLOCK", "orderbook/latest_block.sql")
+ORDERBOOK_QUERIES.register(
+    "PROD_ORDER_REWARDS", "orderbook/prod_order_rewards.sql", BLOCK_RANGE_PARAMS
+)
+ORDERBOOK_QUERIES.register(
+    "BARN_ORDER_REWARDS", "orderbook/barn_order_rewards.sql", BLOCK_RANGE_PARAMS
+)
+ORDERBOOK_QUERIES.register(
+    "PROD_BATCH_REWARDS",
+    "orderbook/prod_batch_rewards.sql",
+    BLOCK_RANGE_PARAMS + ("EPSILON_LOWER", "EPSILON_UPPER"),
+)
+ORDERBOOK_QUERIES.register(
+    "BARN_BATCH_REWARDS",
+    "orderbook/barn_batch_rewards.sql",
+    BLOCK_RANGE_PARAMS + ("EPSILON_LOWER", "EPSILON_UPPER"),
+)
+ORDERBOOK_QUERIES.register("APP_HASHES", "app_hashes.sql")
+ORDERBOOK_QUERIES.register("APP_HASH_KEYS", "app_hash_keys.sql")
+ORDERBOOK_QUERIES.register("APP_HASHES_FOR", "app_hashes_for.sql", ("hashes",))
+ORDERBOOK_QUERIES.register("MISSING_APP_HASHES", "missing_app_hashes.sql")
+ORDERBOOK_QUERIES.register("PRICE_FEED", "prices.sql")
+ORDERBOOK_QUERIES.register("PRICE_FEED_SINCE", "prices_since.sql", ("since",))
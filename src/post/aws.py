@@ -1,22 +1,56 @@
 """Aws S3 Bucket functionality (namely upload_file)"""
 from __future__ import annotations
 
+import io
 import os
+import queue
+import re
+import threading
 from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterable, Iterator, Optional
 
 import boto3
 from boto3.resources.base import ServiceResource
-from boto3.s3.transfer import S3Transfer
+from boto3.s3.transfer import S3Transfer, TransferConfig
 from botocore.client import BaseClient
+from botocore.exceptions import ClientError
 from dotenv import load_dotenv
 
 from src.logger import set_log
 from src.models.tables import SyncTable
+from src.post.compression import ContentEncoding
+from src.post.manifest import (
+    MANIFEST_PREFIX,
+    BucketManifest,
+    ManifestEntry,
+    manifest_key,
+)
 
 log = set_log(__name__)
 
+# Assumed role sessions are renewed this long before their credentials expire.
+CREDENTIAL_REFRESH_MARGIN = timedelta(minutes=5)
+# Maximum number of keys per DeleteObjects request (imposed by S3)
+DELETE_BATCH_SIZE = 1000
+# Number of DeleteObjects requests in flight at once
+DELETE_WORKERS = 4
+# Number of content chunks buffered between a streaming upload's writer and uploader
+STREAM_BUFFER_CHUNKS = 8
+# Block indexed file names: `cow_<block>.json` or, for content split into parts,
+# `cow_<block>_<part>.json` (either with the extension of their encoding, if compressed)
+BLOCK_FILE_NAME = re.compile(r"^cow_(\d+)(?:_(\d+))?\.json(?:\.gz|\.zst)?$")
+# Content split into parts is staged outside of the table directories
+# until all parts are uploaded (see AWSClient.promote_staged).
+STAGING_PREFIX = "_staging"
+
+
+def staging_key(object_key: str) -> str:
+    """Object key at which `object_key` is staged"""
+    return f"{STAGING_PREFIX}/{object_key}"
+
 
 @dataclass
 class BucketFileObject:
@@ -25,11 +59,15 @@ class BucketFileObject:
     Our files are structured as `table_name/cow_XXXXXXX.json`
     where XXXXXX is an increasing sequence of integers.
     More precisely, we use last_sync_block_number to indicate our last collection of records.
+    Content split into several files is structured as `table_name/cow_XXXXXXX_N.json`
+    where N is the part number.
+    Compressed files additionally carry the extension of their encoding (e.g. `.json.gz`).
     """
 
     path: str
     name: str
     block: Optional[int]
+    part: Optional[int] = None
 
     @classmethod
     def from_key(cls, object_key: str) -> BucketFileObject:
@@ -38,18 +76,21 @@ class BucketFileObject:
         more meaningful parts from which it can be reconstructed
         """
         path, name = object_key.split("/")
-
-        try:
-            block = int(name.strip("cow_").strip(".json"))
-        except ValueError:
-            # File structure does not satisfy block indexing!
-            block = None
+        match = BLOCK_FILE_NAME.match(name)
         return cls(
             path,
             name,  # Keep the full reference (for delete)
-            block,
+            int(match.group(1)) if match else None,
+            int(match.group(2)) if match and match.group(2) is not None else None,
         )
 
+    @staticmethod
+    def block_from_name(name: str) -> Optional[int]:
+        """Block number of file `name` (None if the name is not block indexed)"""
+        match = BLOCK_FILE_NAME.match(name)
+        # Otherwise, the file structure does not satisfy block indexing!
+        return int(match.group(1)) if match else None
+
     @property
     def object_key(self) -> str:
         """
@@ -59,6 +100,15 @@ class BucketFileObject:
         return "/".join([self.path, self.name])
 
 
+@dataclass(frozen=True)
+class DeleteError:
+    """Object which could not be deleted, along with the reason reported by S3"""
+
+    object_key: str
+    code: str
+    message: str
+
+
 @dataclass
 class BucketStructure:
     """Representation of the bucket directory structure"""
@@ -70,13 +120,19 @@ class BucketStructure:
         """
         Constructor from results of ServiceResource.Buckets
         """
+        return cls.from_keys(bucket_obj.key for bucket_obj in bucket_objects)
+
+    @classmethod
+    def from_keys(cls, object_keys: Iterable[str]) -> BucketStructure:
+        """Constructor from object keys"""
         # Initialize empty lists (incase the directories contain nothing)
         grouped_files: dict[str, list[BucketFileObject]] = defaultdict(
             list[BucketFileObject]
         )
-        for bucket_obj in bucket_objects:
-            object_key = bucket_obj.key
-            path, _ = object_key.split("/")
+        for object_key in object_keys:
+            path, _ = object_key.split("/", 1)
+            if path in (MANIFEST_PREFIX, STAGING_PREFIX):
+                continue
             grouped_files[path].append(BucketFileObject.from_key(object_key))
             if path not in SyncTable.supported_tables():
                 # Catches any unrecognized filepath.
@@ -95,6 +151,155 @@ class BucketStructure:
         return self.files.get(table_str, [])
 
 
+@dataclass(frozen=True)
+class AssumedRoleSession:
+    """S3 resource authenticated with temporary (assumed role) credentials"""
+
+    resource: ServiceResource
+    expiration: datetime
+
+    def expires_within(self, margin: timedelta) -> bool:
+        """True if the credentials expire within `margin` from now"""
+        return datetime.now(timezone.utc) >= self.expiration - margin
+
+
+class AssumedRoleCache:
+    """
+    Process wide cache of assumed role sessions (keyed by the roles assumed),
+    so that STS is only called again shortly before the credentials expire.
+    """
+
+    def __init__(self, refresh_margin: timedelta = CREDENTIAL_REFRESH_MARGIN):
+        self.refresh_margin = refresh_margin
+        self._sessions: dict[tuple[str, ...], AssumedRoleSession] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self, key: tuple[str, ...], assume_role: Callable[[], AssumedRoleSession]
+    ) -> ServiceResource:
+        """
+        Returns the cached resource for `key`,
+        calling `assume_role` if there is none or its credentials are about to expire.
+        """
+        # The lock is held while assuming the role, so concurrent callers share one refresh.
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None or session.expires_within(self.refresh_margin):
+                session = assume_role()
+                log.debug(f"assumed role session valid until {session.expiration}")
+                self._sessions[key] = session
+            return session.resource
+
+    def clear(self) -> None:
+        """Drops all cached sessions"""
+        with self._lock:
+            self._sessions.clear()
+
+
+ASSUMED_ROLES = AssumedRoleCache()
+
+
+class _ChunkStream(io.RawIOBase):
+    """
+    Readable stream of the chunks passed through a bounded queue by another thread.
+    A `None` chunk marks the end of the stream, an exception aborts it (raised to the reader).
+    """
+
+    def __init__(self, chunks: queue.Queue[bytes | BaseException | None]):
+        super().__init__()
+        self._chunks = chunks
+        self._current = memoryview(b"")
+        self._finished = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._current and not self._finished:
+            chunk = self._chunks.get()
+            if chunk is None:
+                self._finished = True
+            elif isinstance(chunk, BaseException):
+                raise chunk
+            else:
+                self._current = memoryview(chunk)
+        size = min(len(buffer), len(self._current))
+        buffer[:size] = self._current[:size]
+        self._current = self._current[size:]
+        return size
+
+
+class StreamingUpload:
+    """
+    Upload of content produced incrementally (see `AWSClient.upload_stream`).
+    Content passed to `write` is streamed into a (multipart) upload running in a
+    background thread: only a bounded number of chunks (and upload parts) are held in memory.
+    The upload only starts with the first chunk, so no object is created without content.
+    """
+
+    def __init__(
+        self,
+        upload: Callable[[io.BufferedReader], None],
+        buffer_chunks: int = STREAM_BUFFER_CHUNKS,
+    ):
+        self._upload = upload
+        self._chunks: queue.Queue[bytes | BaseException | None] = queue.Queue(
+            maxsize=buffer_chunks
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._future: Optional[Future[None]] = None
+
+    @property
+    def started(self) -> bool:
+        """True once any content was written"""
+        return self._future is not None
+
+    def _put(self, item: bytes | BaseException | None) -> None:
+        assert self._future is not None
+        while True:
+            try:
+                self._chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                if self._future.done():
+                    # The upload failed (and stopped consuming): raise its error.
+                    self._future.result()
+                    return
+
+    def write(self, content: bytes) -> None:
+        """Appends `content` to the uploaded object"""
+        if self._future is None:
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix="upload")
+            stream = io.BufferedReader(_ChunkStream(self._chunks))
+            self._future = self._executor.submit(self._upload, stream)
+        self._put(content)
+
+    def complete(self) -> None:
+        """Marks the end of the content and waits for the upload to complete"""
+        if self._future is None:
+            return
+        try:
+            self._put(None)
+            self._future.result()
+        finally:
+            self._shutdown()
+
+    def abort(self, error: BaseException) -> None:
+        """Aborts the upload (so that no incomplete object is created)"""
+        if self._future is None:
+            return
+        try:
+            if not self._future.done():
+                self._put(error)
+            self._future.exception()
+        finally:
+            self._shutdown()
+
+    def _shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+
 class AWSClient:
     """
     Class managing the roles required to do file operations on our S3 bucket
@@ -125,6 +330,16 @@ class AWSClient:
         return s3_resource.meta.client
 
     def _assume_role(self) -> ServiceResource:
+        """
+        Returns S3 resource authenticated with the external role,
+        shared by all clients (assuming the same roles) until shortly before it expires.
+        """
+        return ASSUMED_ROLES.get(
+            (self.internal_role, self.external_role, self.external_id),
+            self._new_assumed_role_session,
+        )
+
+    def _new_assumed_role_session(self) -> AssumedRoleSession:
         """
         Borrowed from AWS documentation
         https://docs.aws.amazon.com/IAM/latest/UserGuide/id_roles_use_switch-role-api.html
@@ -159,7 +374,16 @@ class AWSClient:
             aws_secret_access_key=credentials["SecretAccessKey"],
             aws_session_token=credentials["SessionToken"],
         )
-        return s3_resource
+        return AssumedRoleSession(s3_resource, credentials["Expiration"])
+
+    @staticmethod
+    def _upload_args(object_key: str) -> dict[str, str]:
+        """Upload arguments, declaring the encoding of compressed content"""
+        args = {"ACL": "bucket-owner-full-control"}
+        encoding = ContentEncoding.from_name(object_key)
+        if encoding is not None:
+            args["ContentEncoding"] = encoding.value
+        return args
 
     def upload_file(self, filename: str, object_key: str) -> bool:
         """Upload a file to an S3 bucket
@@ -174,11 +398,42 @@ class AWSClient:
             filename=filename,
             bucket=self.bucket,
             key=object_key,
-            extra_args={"ACL": "bucket-owner-full-control"},
+            extra_args=self._upload_args(object_key),
         )
         log.debug(f"uploaded {filename} to {self.bucket}")
         return True
 
+    def upload_stream(
+        self, object_key: str, transfer_config: Optional[TransferConfig] = None
+    ) -> StreamingUpload:
+        """Streaming upload to an S3 bucket
+
+        Content written to the returned upload is streamed into a multipart upload
+        of `object_key`, without staging it on disk. Usage:
+            upload = aws.upload_stream(object_key, transfer_config)
+            try:
+                upload.write(content)
+            except Exception as err:
+                upload.abort(err)
+                raise
+            upload.complete()
+        :param object_key: S3 object key.
+        :param transfer_config: Part size and concurrency of the multipart upload.
+        """
+        s3_client = self._get_s3_client(self._assume_role())
+
+        def upload(stream: io.BufferedReader) -> None:
+            s3_client.upload_fileobj(  # type: ignore
+                Fileobj=stream,
+                Bucket=self.bucket,
+                Key=object_key,
+                ExtraArgs=self._upload_args(object_key),
+                Config=transfer_config,
+            )
+            log.debug(f"uploaded stream to {object_key} in {self.bucket}")
+
+        return StreamingUpload(upload)
+
     def delete_file(self, object_key: str) -> bool:
         """Delete a file from an S3 bucket
 
@@ -212,58 +467,314 @@ class AWSClient:
         log.debug(f"downloaded {filename} from {self.bucket}")
         return True
 
-    def existing_files(self) -> BucketStructure:
+    def existing_files(
+        self, table: Optional[SyncTable | str] = None
+    ) -> BucketStructure:
         """
         Returns an object representing the bucket file
         structure with sync block metadata
+        (restricted to the directory of `table`, if given)
         """
+        if table is not None:
+            return BucketStructure.from_keys(self.list_keys(f"{table}/"))
         service_resource = self._assume_role()
         bucket = service_resource.Bucket(self.bucket)  # type: ignore
 
         bucket_objects = bucket.objects.all()
         return BucketStructure.from_bucket_collection(bucket_objects)
 
+    def list_objects(
+        self, prefix: str, start_after: Optional[str] = None
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Lazily lists (the metadata of) all objects starting with `prefix` (page by page),
+        only those whose keys sort after `start_after`, if given
+        """
+        s3_client = self._get_s3_client(self._assume_role())
+        paginator = s3_client.get_paginator("list_objects_v2")
+        args = {"StartAfter": start_after} if start_after else {}
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix, **args):
+            yield from page.get("Contents", [])
+
+    def list_keys(self, prefix: str) -> Iterator[str]:
+        """Lazily lists the keys of all objects starting with `prefix` (page by page)"""
+        for content in self.list_objects(prefix):
+            yield content["Key"]
+
+    def load_manifest(self, table: SyncTable | str) -> Optional[BucketManifest]:
+        """Reads the manifest of `table` from the bucket (None if there is none)"""
+        s3_client = self._get_s3_client(self._assume_role())
+        try:
+            response = s3_client.get_object(  # type: ignore
+                Bucket=self.bucket, Key=manifest_key(str(table))
+            )
+        except ClientError as err:
+            if err.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                return None
+            raise
+        return BucketManifest.from_json(response["Body"].read())
+
+    def save_manifest(self, manifest: BucketManifest) -> None:
+        """Writes `manifest` to the bucket (replacing any previous version)"""
+        s3_client = self._get_s3_client(self._assume_role())
+        s3_client.put_object(  # type: ignore
+            Bucket=self.bucket,
+            Key=manifest_key(manifest.table),
+            Body=manifest.to_json().encode("utf-8"),
+            ContentType="application/json",
+            ACL="bucket-owner-full-control",
+        )
+        log.debug(
+            f"saved manifest of {manifest.table}: {len(manifest.files)} files, "
+            f"{manifest.total_rows} records"
+        )
+
+    def _listed_entries(
+        self, table: str, start_after: Optional[str] = None
+    ) -> Iterator[ManifestEntry]:
+        """Manifest entries of the files listed in the directory of `table`"""
+        for content in self.list_objects(f"{table}/", start_after):
+            yield ManifestEntry(
+                object_key=content["Key"],
+                block_to=BucketFileObject.block_from_name(
+                    content["Key"].rsplit("/", 1)[-1]
+                ),
+                size=content["Size"],
+            )
+
+    def rebuild_manifest(self, table: SyncTable | str) -> BucketManifest:
+        """
+        Builds the manifest of `table` from a full listing of its directory.
+        Row counts and checksums of files are unknown to the listing.
+        """
+        table_str = str(table)
+        return BucketManifest.from_listing(table_str, self._listed_entries(table_str))
+
+    def catch_up_manifest(self, manifest: BucketManifest) -> None:
+        """
+        Adds files uploaded after `manifest` was last saved (e.g. because saving it failed)
+        to the manifest. Only keys sorting after the manifest's latest file are listed,
+        which covers the files of later syncs (unless their block numbers gained a digit).
+        """
+        last_block = manifest.last_block()
+        if last_block is None:
+            return
+        unrecorded = [
+            entry
+            for entry in self._listed_entries(
+                manifest.table, start_after=manifest.files[-1].object_key
+            )
+            if entry.block_to is not None and entry.block_to > last_block
+        ]
+        if not unrecorded:
+            return
+        log.warning(
+            f"manifest of {manifest.table} is missing {len(unrecorded)} files "
+            f"uploaded after block {last_block}, adding them"
+        )
+        for entry in BucketManifest.from_listing(
+            manifest.table, unrecorded, previous_block=last_block
+        ).files:
+            manifest.add(entry)
+        try:
+            self.save_manifest(manifest)
+        except ClientError as err:
+            log.warning(f"could not save manifest of {manifest.table}: {err}")
+
+    def record_uploads(
+        self, table: SyncTable | str, entries: list[ManifestEntry]
+    ) -> None:
+        """
+        Adds uploaded files `entries` to the manifest of `table`.
+        If the table has no manifest yet, it is built from a listing first.
+        """
+        manifest = self.load_manifest(table)
+        if manifest is None:
+            log.info(f"no manifest for {table}, building it from bucket listing")
+            manifest = self.rebuild_manifest(table)
+        for entry in entries:
+            manifest.add(entry)
+        self.save_manifest(manifest)
+
+    def _forget_files(self, table: SyncTable | str, object_keys: list[str]) -> None:
+        """Drops deleted `object_keys` from the manifest of `table` (if there is one)"""
+        manifest = self.load_manifest(table)
+        if manifest is None:
+            return
+        manifest.remove(object_keys)
+        if manifest.files:
+            self.save_manifest(manifest)
+        else:
+            s3_client = self._get_s3_client(self._assume_role())
+            s3_client.delete_object(  # type: ignore
+                Bucket=self.bucket, Key=manifest_key(str(table))
+            )
+
     def last_sync_block(self, table: SyncTable | str) -> int:
         """
         Based on the existing bucket files,
         the last sync block is uniquely determined from the file names.
+        It is read from the table's manifest, when there is one
+        (caught up with files uploaded after its last update, see `catch_up_manifest`).
+        Otherwise, only the directory of `table` is listed, keeping a running maximum.
         """
         table_str = str(table) if isinstance(table, SyncTable) else table
-        try:
-            table_files = self.existing_files().get(table_str)
-            return max(file_obj.block for file_obj in table_files if file_obj.block)
-        except ValueError as err:
-            # Raised when table_files = []
+        manifest = self.load_manifest(table_str)
+        if manifest is not None:
+            self.catch_up_manifest(manifest)
+        last_block = (
+            manifest.last_block() if manifest else self._listed_last_block(table_str)
+        )
+        if last_block is None:
             raise FileNotFoundError(
                 f"Could not determine last sync block for {table} files. No files."
-            ) from err
+            )
+        return last_block
+
+    def _listed_last_block(self, table: str) -> Optional[int]:
+        last_block: Optional[int] = None
+        for object_key in self.list_keys(f"{table}/"):
+            block = BucketFileObject.block_from_name(object_key.rsplit("/", 1)[-1])
+            if block and (last_block is None or block > last_block):
+                last_block = block
+        return last_block
+
+    def delete_files(
+        self, object_keys: list[str], dry_run: bool = False
+    ) -> list[DeleteError]:
+        """Deletes `object_keys` from the S3 bucket
+
+        Keys are deleted in batches (multi-object DeleteObjects requests),
+        several of which are in flight at once.
+        :param object_keys: S3 object keys to delete.
+        :param dry_run: only list the keys which would be deleted.
+        :return: keys which could not be deleted (empty if all were deleted)
+        """
+        if dry_run:
+            for object_key in object_keys:
+                log.info(f"DRY-RUN-ENABLED: would delete {object_key}")
+            return []
+        if not object_keys:
+            return []
+
+        s3_client = self._get_s3_client(self._assume_role())
 
-    def delete_all(self, table: SyncTable | str) -> None:
-        """Deletes all files within the supported tables directory"""
+        def delete_batch(batch: list[str]) -> list[DeleteError]:
+            try:
+                response = s3_client.delete_objects(  # type: ignore
+                    Bucket=self.bucket,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+                )
+            except ClientError as err:
+                error = err.response.get("Error", {})
+                return [
+                    DeleteError(key, error.get("Code", ""), error.get("Message", ""))
+                    for key in batch
+                ]
+            log.debug(f"deleted {len(batch)} files from {self.bucket}")
+            return [
+                DeleteError(
+                    error["Key"], error.get("Code", ""), error.get("Message", "")
+                )
+                for error in response.get("Errors", [])
+            ]
+
+        batches = [
+            object_keys[start : start + DELETE_BATCH_SIZE]
+            for start in range(0, len(object_keys), DELETE_BATCH_SIZE)
+        ]
+        with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as executor:
+            errors = [
+                error
+                for batch_errors in executor.map(delete_batch, batches)
+                for error in batch_errors
+            ]
+        for error in errors:
+            log.error(
+                f"Failed to delete {error.object_key}: {error.code} {error.message}"
+            )
+        log.info(
+            f"Deleted {len(object_keys) - len(errors)} of {len(object_keys)} files "
+            f"in {len(batches)} batches"
+        )
+        return errors
+
+    def promote_staged(self, moves: dict[str, str]) -> None:
+        """
+        Moves staged objects into place (`moves` maps staged keys to their object keys).
+        Raises (leaving the staged objects) if any of them could not be copied.
+        """
+        s3_client = self._get_s3_client(self._assume_role())
+        for staged_key, object_key in moves.items():
+            s3_client.copy(  # type: ignore
+                CopySource={"Bucket": self.bucket, "Key": staged_key},
+                Bucket=self.bucket,
+                Key=object_key,
+                ExtraArgs={
+                    **self._upload_args(object_key),
+                    "MetadataDirective": "REPLACE",
+                },
+            )
+            log.debug(f"moved {staged_key} to {object_key}")
+        self.delete_files(list(moves))
+
+    def delete_staged(self, table: SyncTable | str) -> list[DeleteError]:
+        """Deletes objects left in staging for `table` (e.g. by an interrupted upload)"""
+        return self.delete_files(list(self.list_keys(f"{STAGING_PREFIX}/{table}/")))
+
+    def _delete_table_files(
+        self, table: SyncTable | str, object_keys: list[str], dry_run: bool
+    ) -> list[DeleteError]:
+        """Deletes `object_keys` of `table`, keeping the table's manifest up to date"""
+        log.info(f"Found {len(object_keys)} files to be removed.")
+        errors = self.delete_files(object_keys, dry_run)
+        if not dry_run:
+            failed = {error.object_key for error in errors}
+            self._forget_files(table, [key for key in object_keys if key not in failed])
+        return errors
+
+    def delete_all(
+        self, table: SyncTable | str, dry_run: bool = False
+    ) -> list[DeleteError]:
+        """
+        Deletes all files within the supported tables directory.
+        Returns the files which could not be deleted.
+        """
         log.info(f"Emptying Bucket {table}")
         try:
-            table_files = self.existing_files().get(table)
-            log.info(f"Found {len(table_files)} files to be removed.")
-            for file_data in table_files:
-                log.info(f"Deleting file {file_data.object_key}")
-                self.delete_file(file_data.object_key)
+            table_files = self.existing_files(table).get(table)
+            return self._delete_table_files(
+                table, [file_data.object_key for file_data in table_files], dry_run
+            )
         except KeyError as err:
             raise ValueError(
                 f"Invalid table_name {table}, please chose from {SyncTable.supported_tables()}"
             ) from err
 
-    def delete_from(self, table: SyncTable | str, block_number: int) -> None:
-        """Deletes all files above and including `block_numer`"""
+    def delete_from(
+        self, table: SyncTable | str, block_number: int, dry_run: bool = False
+    ) -> list[DeleteError]:
+        """
+        Deletes all files above and including `block_numer`
+        (as recorded in the table's manifest, if there is one).
+        Returns the files which could not be deleted.
+        """
         log.info(f"Deleting all files in {table} from {block_number}")
+        manifest = self.load_manifest(table)
+        if manifest is not None:
+            return self._delete_table_files(
+                table,
+                [entry.object_key for entry in manifest.files_from(block_number)],
+                dry_run,
+            )
         try:
-            table_files = self.existing_files().get(table)
+            table_files = self.existing_files(table).get(table)
             filtered_files = [
                 fd for fd in table_files if fd.block is None or fd.block >= block_number
             ]
-            log.info(f"Found {len(filtered_files)} files to be removed.")
-            for file_data in filtered_files:
-                log.info(f"Deleting file {file_data.object_key}")
-                self.delete_file(file_data.object_key)
+            return self._delete_table_files(
+                table, [file_data.object_key for file_data in filtered_files], dry_run
+            )
         except KeyError as err:
             raise ValueError(
                 f"Invalid table_name {table}, please chose from {SyncTable.supported_tables()}"
@@ -0,0 +1,65 @@
+"""
+Optional compression of content files (on the volume and in the AWS bucket).
+Compressed files carry the extension of their encoding (e.g. `cow_123.json.gz`),
+from which the encoding is recognized again when they are read.
+zstd compression uses the `zstandard` package (a production requirement).
+"""
+from __future__ import annotations
+
+import gzip
+import shutil
+import zlib
+from enum import Enum
+from typing import Any, BinaryIO, Optional, Protocol
+
+import zstandard
+
+
+class Compressor(Protocol):
+    """Incremental compressor (as returned by `zlib.compressobj`)"""
+
+    def compress(self, data: bytes) -> bytes:
+        """Compresses `data`, returning any output available so far"""
+
+    def flush(self) -> bytes:
+        """Remaining output, ending the compressed stream"""
+
+
+class ContentEncoding(Enum):
+    """Compression of content files, value is the HTTP `Content-Encoding`"""
+
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+    @property
+    def extension(self) -> str:
+        """File name extension of content with this encoding"""
+        return {ContentEncoding.GZIP: ".gz", ContentEncoding.ZSTD: ".zst"}[self]
+
+    @classmethod
+    def from_name(cls, name: str) -> Optional[ContentEncoding]:
+        """Encoding of file (or object key) `name`, None if it is not compressed"""
+        for encoding in cls:
+            if name.endswith(encoding.extension):
+                return encoding
+        return None
+
+    def compressor(self) -> Compressor:
+        """New incremental compressor"""
+        if self == ContentEncoding.GZIP:
+            # wbits=31: gzip container (as written by the gzip module)
+            return zlib.compressobj(wbits=31)
+        compressor: Compressor = zstandard.ZstdCompressor().compressobj()
+        return compressor
+
+    def open_reader(self, file: BinaryIO) -> Any:
+        """Binary file object reading the decompressed content of `file`"""
+        if self == ContentEncoding.GZIP:
+            return gzip.GzipFile(fileobj=file, mode="rb")
+        return zstandard.ZstdDecompressor().stream_reader(file)
+
+    def decompress_file(self, source: str, destination: str) -> None:
+        """Writes the decompressed content of `source` to `destination`"""
+        with open(source, "rb") as compressed, open(destination, "wb") as output:
+            with self.open_reader(compressed) as reader:
+                shutil.copyfileobj(reader, output)
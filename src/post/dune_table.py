@@ -0,0 +1,60 @@
+"""Dune tables which incremental syncs append to"""
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass, field
+
+from dune_client.client import DuneClient
+from pandas import DataFrame
+
+from src.logger import set_log
+
+log = set_log(__name__)
+
+
+@dataclass
+class DuneTable:
+    """
+    Table `dune.<namespace>.<name>`, created with `schema` and appended to via the insert
+    endpoint. Tables uploaded with `upload_csv` are named `dataset_<name>` instead (and are
+    not the target of inserts), so incremental syncs only ever write through this class.
+    """
+
+    dune: DuneClient
+    namespace: str
+    name: str
+    # Column names and types, e.g. [{"name": "time", "type": "timestamp"}]
+    schema: list[dict[str, str]] = field(default_factory=list)
+    description: str = ""
+
+    @property
+    def full_name(self) -> str:
+        """Name of the table in Dune queries"""
+        return f"dune.{self.namespace}.{self.name}"
+
+    def replace(self, data: DataFrame) -> None:
+        """(Re-)creates the table with content `data`"""
+        try:
+            self.dune.delete_table(namespace=self.namespace, table_name=self.name)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            # Nothing to replace (yet)
+            log.info(f"could not delete {self.full_name}: {err}")
+        self.dune.create_table(
+            namespace=self.namespace,
+            table_name=self.name,
+            schema=self.schema,
+            description=self.description,
+            is_private=False,
+        )
+        self.insert(data)
+
+    def insert(self, data: DataFrame) -> None:
+        """Appends `data` (with the columns of the table's schema) to the table"""
+        if data.empty:
+            return
+        self.dune.insert_table(
+            namespace=self.namespace,
+            table_name=self.name,
+            data=io.BytesIO(data.to_csv(index=False).encode("utf-8")),
+            content_type="text/csv",
+        )
@@ -0,0 +1,111 @@
+"""
+Per table manifest of the files in the AWS bucket.
+The manifest is a single (small) object, `_manifest/<table>.json`, kept outside of the
+table directory so that it is not picked up as table content.
+It is updated after every upload, making sync metadata available without a full bucket listing.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Iterable, Optional
+
+MANIFEST_PREFIX = "_manifest"
+
+
+def manifest_key(table: str) -> str:
+    """Object key of the manifest of `table`"""
+    return f"{MANIFEST_PREFIX}/{table}.json"
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    """
+    A file in the bucket, along with the block range and number of records it contains.
+    Entries rebuilt from a bucket listing lack the fields which can only be known at upload.
+    """
+
+    object_key: str
+    block_to: Optional[int]
+    size: int
+    block_from: Optional[int] = None
+    rows: Optional[int] = None
+    sha256: Optional[str] = None
+
+
+@dataclass
+class BucketManifest:
+    """All files of `table` in the bucket, ordered by block"""
+
+    table: str
+    files: list[ManifestEntry] = field(default_factory=list)
+
+    @classmethod
+    def from_json(cls, content: str | bytes) -> BucketManifest:
+        """Parses manifest object content"""
+        manifest = json.loads(content)
+        return cls(
+            table=manifest["table"],
+            files=[ManifestEntry(**entry) for entry in manifest["files"]],
+        )
+
+    def to_json(self) -> str:
+        """Manifest object content"""
+        content: dict[str, Any] = {
+            "table": self.table,
+            "files": [asdict(entry) for entry in self.files],
+        }
+        return json.dumps(content, indent=1)
+
+    @classmethod
+    def from_listing(
+        cls,
+        table: str,
+        entries: Iterable[ManifestEntry],
+        previous_block: Optional[int] = None,
+    ) -> BucketManifest:
+        """
+        Manifest of the files listed in the bucket.
+        Each file's block range starts where the previous file's ends
+        (as consecutive syncs do), parts of the same content share their block range.
+        The first listed file starts at `previous_block`.
+        """
+        manifest = cls(table, [])
+        current_block: Optional[int] = previous_block
+        for entry in sorted(entries, key=lambda e: (e.block_to or 0, e.object_key)):
+            if entry.block_to is not None:
+                if entry.block_to != current_block:
+                    previous_block, current_block = current_block, entry.block_to
+                entry = replace(entry, block_from=previous_block)
+            manifest.files.append(entry)
+        return manifest
+
+    def add(self, entry: ManifestEntry) -> None:
+        """Adds (or replaces) the entry for `entry.object_key`"""
+        self.remove([entry.object_key])
+        self.files.append(entry)
+        self.files.sort(key=lambda e: (e.block_to or 0, e.object_key))
+
+    def remove(self, object_keys: Iterable[str]) -> None:
+        """Drops the entries of `object_keys`"""
+        removed = set(object_keys)
+        self.files = [entry for entry in self.files if entry.object_key not in removed]
+
+    def last_block(self) -> Optional[int]:
+        """Latest block synced to the bucket (None if there are no block indexed files)"""
+        return max(
+            (entry.block_to for entry in self.files if entry.block_to), default=None
+        )
+
+    def files_from(self, block_number: int) -> list[ManifestEntry]:
+        """Entries of files with blocks from `block_number` on (or without block index)"""
+        return [
+            entry
+            for entry in self.files
+            if entry.block_to is None or entry.block_to >= block_number
+        ]
+
+    @property
+    def total_rows(self) -> int:
+        """Number of records in the files whose row count is known"""
+        return sum(entry.rows or 0 for entry in self.files)
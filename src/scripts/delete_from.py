@@ -1,13 +1,38 @@
 """
-Script to empty AWS bucket.
-Used for re-deployments involving schema change.
+Script to delete the AWS bucket files of a table from a given block on.
+Used to re-sync a block range.
 """
 import argparse
+import os
+import sys
+from pathlib import Path
 
 from dotenv import load_dotenv
 
 from src.models.tables import SyncTable
 from src.post.aws import AWSClient
+from src.sync.common import rewind_local_sync_block
+from src.sync.config import SyncConfig
+
+
+def delete_from(
+    table: SyncTable,
+    aws: AWSClient,
+    config: SyncConfig,
+    from_block: int,
+    dry_run: bool = False,
+) -> bool:
+    """
+    Deletes the bucket files of `table` from `from_block` on
+    and rewinds the sync state on the mounted volume accordingly.
+    Returns False if any file could not be deleted (the sync state is kept in that case).
+    """
+    if aws.delete_from(table, from_block, dry_run=dry_run):
+        return False
+    if not dry_run:
+        rewind_local_sync_block(config, table, from_block)
+    return True
+
 
 if __name__ == "__main__":
     load_dotenv()
@@ -17,6 +42,11 @@ if __name__ == "__main__":
         type=int,
         required=True,
     )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only list the files which would be deleted",
+    )
     parser.add_argument(  # pylint: disable=duplicate-code
         "--sync-table",
         type=SyncTable,
@@ -24,5 +54,11 @@ if __name__ == "__main__":
         choices=list(SyncTable),
     )
     args, _ = parser.parse_known_args()
-    aws = AWSClient.new_from_environment()
-    aws.delete_from(args.sync_table, args.from_block)
+    if not delete_from(
+        table=args.sync_table,
+        aws=AWSClient.new_from_environment(),
+        config=SyncConfig(volume_path=Path(os.environ["VOLUME_PATH"])),
+        from_block=args.from_block,
+        dry_run=args.dry_run,
+    ):
+        sys.exit(1)
@@ -1,26 +1,39 @@
 """Downloads file from AWS to PWD"""
 import argparse
+import os
 
 from dotenv import load_dotenv
 
 from src.post.aws import AWSClient
+from src.post.compression import ContentEncoding
 
 
-def download_file(aws: AWSClient, object_key: str) -> None:
-    """Download file (`object_key`) from AWS"""
+def download_file(aws: AWSClient, object_key: str) -> str:
+    """
+    Download file (`object_key`) from AWS, returns the name of the downloaded file.
+    Compressed files are decompressed (dropping the extension of their encoding).
+    """
+    filename = object_key.split("/")[1]
     aws.download_file(
-        filename=object_key.split("/")[1],
+        filename=filename,
         object_key=object_key,
     )
+    encoding = ContentEncoding.from_name(filename)
+    if encoding is None:
+        return filename
+    decompressed = filename.removesuffix(encoding.extension)
+    encoding.decompress_file(filename, decompressed)
+    os.remove(filename)
+    return decompressed
 
 
 if __name__ == "__main__":
     load_dotenv()
     parser = argparse.ArgumentParser("Download File from Bucket")
     parser.add_argument(
-        "filename",
+        "object_key",
         type=str,
-        required=True,
+        help="Object key of the file, e.g. order_rewards/cow_123.json",
     )
     args, _ = parser.parse_known_args()
     download_file(aws=AWSClient.new_from_environment(), object_key=args.object_key)
@@ -4,6 +4,7 @@ Used for re-deployments involving schema change.
 """
 import os
 import shutil
+import sys
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -13,21 +14,30 @@ from src.models.tables import SyncTable
 from src.post.aws import AWSClient
 
 
-def empty_bucket(table: SyncTable, aws: AWSClient, volume_path: Path) -> None:
+def empty_bucket(
+    table: SyncTable, aws: AWSClient, volume_path: Path, dry_run: bool = False
+) -> bool:
     """
     Empties the bucket for `table`
-    and deletes backup from mounted volume
+    and deletes backup from mounted volume.
+    Returns False if any file could not be deleted (the backup is kept in that case).
     """
     # Drop Data from AWS bucket
-    aws.delete_all(table)
-    # drop backup data from volume path
-    shutil.rmtree(volume_path / str(table))
+    if aws.delete_all(table, dry_run=dry_run):
+        return False
+    if not dry_run:
+        # drop backup data from volume path
+        shutil.rmtree(volume_path / str(table))
+    return True
 
 
 if __name__ == "__main__":
     load_dotenv()
-    empty_bucket(
-        table=ScriptArgs().sync_table,
+    args = ScriptArgs()
+    if not empty_bucket(
+        table=args.sync_table,
         aws=AWSClient.new_from_environment(),
         volume_path=Path(os.environ["VOLUME_PATH"]),
-    )
+        dry_run=args.dry_run,
+    ):
+        sys.exit(1)
@@ -0,0 +1,38 @@
+"""
+Script to rebuild the manifest of a table from a full listing of the AWS bucket.
+Used when the manifest is missing or out of date
+(e.g. after files were added or removed by other means than the sync).
+"""
+from dotenv import load_dotenv
+
+from src.main import ScriptArgs
+from src.models.tables import SyncTable
+from src.post.aws import AWSClient
+from src.post.manifest import BucketManifest
+
+
+def repair_manifest(aws: AWSClient, table: SyncTable, dry_run: bool) -> None:
+    """
+    Replaces the manifest of `table` with one rebuilt from the bucket listing.
+    Row counts and checksums of files still listed are kept from the previous manifest.
+    """
+    rebuilt = aws.rebuild_manifest(table)
+    previous = aws.load_manifest(table) or BucketManifest(str(table))
+    known = {entry.object_key: entry for entry in previous.files}
+    for entry in rebuilt.files:
+        previous_entry = known.get(entry.object_key)
+        if previous_entry is not None and previous_entry.size == entry.size:
+            rebuilt.add(previous_entry)
+
+    print(
+        f"{table}: {len(previous.files)} files in manifest, {len(rebuilt.files)} in bucket, "
+        f"last block {rebuilt.last_block()}"
+    )
+    if not dry_run:
+        aws.save_manifest(rebuilt)
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    args = ScriptArgs()
+    repair_manifest(AWSClient.new_from_environment(), args.sync_table, args.dry_run)
@@ -0,0 +1,5 @@
+-- Selects all known appData hashes (without preimages) from the backend database
+
+SELECT 
+  concat('0x',encode(contract_app_data, 'hex')) contract_app_data
+FROM app_data
@@ -0,0 +1,7 @@
+-- Selects appData hashes and preimages (as string) for the given hashes from the backend database
+
+SELECT 
+  concat('0x',encode(contract_app_data, 'hex')) contract_app_data, 
+  encode(full_app_data, 'escape')
+FROM app_data
+WHERE contract_app_data = ANY({{hashes}})
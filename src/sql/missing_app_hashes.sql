@@ -0,0 +1,11 @@
+-- Selects appData hashes of traded orders without preimage in the backend database,
+-- along with the block in which they were first traded
+
+SELECT
+  concat('0x', encode(o.app_data, 'hex')) app_hash,
+  min(t.block_number) first_seen_block
+FROM trades t
+JOIN orders o ON t.order_uid = o.uid
+LEFT OUTER JOIN app_data ad ON o.app_data = ad.contract_app_data
+WHERE ad.contract_app_data IS NULL
+GROUP BY o.app_data
@@ -1,13 +1,60 @@
 """Main Entry point for app_hash sync"""
+import json
+import os
+from pathlib import Path
 
+import pandas as pd
 from dune_client.client import DuneClient
+from pandas import DataFrame
 
+from src.fetch.content_cache import ContentCache
+from src.fetch.ipfs import Cid
 from src.fetch.orderbook import OrderbookFetcher
+from src.fetch.retry_queue import RetryQueue
 from src.logger import set_log
-from src.sync.config import AppDataSyncConfig
+from src.models.app_data_content import FoundContent, NotFoundContent
+from src.models.tables import SyncTable
+from src.post.dune_table import DuneTable
+from src.sync.config import AppDataFetchConfig, AppDataSyncConfig
 
 log = set_log(__name__)
 
+# Columns of the app data query results (see src/sql/app_hashes.sql)
+APP_DATA_SCHEMA = [
+    {"name": "contract_app_data", "type": "varchar"},
+    {"name": "encode", "type": "varchar"},
+]
+
+
+def app_data_table(dune: DuneClient, config: AppDataSyncConfig) -> DuneTable:
+    """Target table of the incremental app data sync"""
+    return DuneTable(
+        dune, config.namespace, config.table, APP_DATA_SCHEMA, config.description
+    )
+
+
+class PublishedHashes:
+    """
+    Append only record (one hash per line) of the app hashes
+    which have already been published to the Dune table.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def load(self) -> set[str]:
+        """Returns all published hashes (empty if nothing has been recorded yet)"""
+        if not self.path.exists():
+            return set()
+        with open(self.path, "r", encoding="utf-8") as file:
+            return {line.strip() for line in file if line.strip()}
+
+    def add(self, hashes: list[str]) -> None:
+        """Records `hashes` as published"""
+        os.makedirs(self.path.parent, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.writelines(f"{app_hash}\n" for app_hash in hashes)
+
 
 async def sync_app_data(
     orderbook: OrderbookFetcher,
@@ -16,7 +63,12 @@ async def sync_app_data(
     dry_run: bool,
 ) -> None:
     """App Data Sync Logic"""
+    if config.incremental:
+        await sync_app_data_incremental(orderbook, dune, config, dry_run)
+        return
+
     hashes = orderbook.get_app_hashes()
+    hashes = await add_missing_app_data(orderbook, hashes, set(), config)
     if not dry_run:
         dune.upload_csv(
             data=hashes.to_csv(index=False),
@@ -25,3 +77,108 @@ async def sync_app_data(
             is_private=False,
         )
     log.info("app_data sync run completed successfully")
+
+
+async def sync_app_data_incremental(
+    orderbook: OrderbookFetcher,
+    dune: DuneClient,
+    config: AppDataSyncConfig,
+    dry_run: bool,
+) -> None:
+    """
+    Incremental App Data Sync Logic:
+    appends app data not yet published to the Dune table `dune.<namespace>.<table>`.
+    Without any published hashes on record, the whole table is (re-)created.
+    """
+    assert config.volume_path, "incremental app_data sync requires a volume path"
+    published = PublishedHashes(
+        config.volume_path / str(SyncTable.APP_DATA) / config.hashes_file
+    )
+    known_hashes = published.load()
+    table = app_data_table(dune, config)
+
+    if not known_hashes:
+        log.info(f"no published app hashes on record, replacing {table.full_name}")
+        hashes = orderbook.get_app_hashes()
+        hashes = await add_missing_app_data(orderbook, hashes, known_hashes, config)
+        if not dry_run:
+            table.replace(hashes)
+    else:
+        hashes = orderbook.get_new_app_hashes(known_hashes)
+        hashes = await add_missing_app_data(orderbook, hashes, known_hashes, config)
+        if hashes.empty:
+            log.info("No new app_data: no sync necessary")
+            return
+        log.info(f"appending {len(hashes)} new app_data records")
+        if not dry_run:
+            table.insert(hashes)
+
+    if not dry_run:
+        published.add(list(hashes.contract_app_data.unique()))
+    log.info("app_data sync run completed successfully")
+
+
+async def add_missing_app_data(
+    orderbook: OrderbookFetcher,
+    hashes: DataFrame,
+    known_hashes: set[str],
+    config: AppDataSyncConfig,
+) -> DataFrame:
+    """
+    Appends to `hashes` (app data query results) the resolved content of traded
+    app data without preimage in the backend databases, unless it is in `hashes`
+    or `known_hashes` already. Does nothing without `config.fetch`.
+    """
+    if config.fetch is None:
+        return hashes
+    missing = orderbook.get_missing_app_hashes()
+    if not hashes.empty:
+        known_hashes = known_hashes.union(hashes.contract_app_data)
+    missing = missing[~missing.app_hash.isin(known_hashes)]
+    if missing.empty:
+        return hashes
+    missing_rows = [
+        {"app_hash": app_hash, "first_seen_block": str(first_seen_block)}
+        for app_hash, first_seen_block in zip(
+            missing.app_hash, missing.first_seen_block
+        )
+    ]
+    found, _ = await resolve_app_data(
+        missing_rows, orderbook.get_latest_block(), config.fetch
+    )
+    log.info(f"resolved {len(found)} of {len(missing_rows)} missing app_data")
+    resolved = pd.DataFrame(
+        {
+            "contract_app_data": [content.app_hash for content in found],
+            "encode": [json.dumps(content.content) for content in found],
+        },
+        columns=["contract_app_data", "encode"],
+    )
+    return pd.concat([hashes, resolved], ignore_index=True)
+
+
+async def resolve_app_data(
+    missing_rows: list[dict[str, str]],
+    current_block: int,
+    config: AppDataFetchConfig,
+) -> tuple[list[FoundContent], list[NotFoundContent]]:
+    """
+    Resolves the content of those of `missing_rows` (app hashes and their first seen
+    block, as passed to `Cid.fetch_many`) whose lookup is due at `current_block`.
+    Content resolved before is served from the cache on the volume, newly resolved
+    content is added to it and the next lookup of content not found is rescheduled
+    (see `RetryQueue`).
+    """
+    directory = config.volume_path / str(SyncTable.APP_DATA)
+    with ContentCache(
+        directory / config.cache_file, config.cache_max_bytes
+    ) as cache, RetryQueue(directory / config.retry_file, config.retry_policy) as queue:
+        due_rows = queue.filter_due(missing_rows, current_block)
+        found, not_found = await Cid.fetch_many(
+            due_rows, config.access_token, cache=cache
+        )
+        queue.record(found, not_found)
+        log.info(
+            f"{queue.given_up(current_block)} missing app hashes past the retry horizon"
+        )
+        return found, not_found
@@ -1,20 +1,81 @@
 """Shared methods between both sync scripts."""
+from typing import Optional
+
+from dune_client.file.interface import FileIO
 
 from src.logger import set_log
 from src.models.tables import SyncTable
 from src.post.aws import AWSClient
+from src.sync.config import SyncConfig, SyncStatePolicy
 
 log = set_log(__name__)
 
 
-def last_sync_block(aws: AWSClient, table: SyncTable, genesis_block: int = 0) -> int:
-    """Attempts to get last sync block from AWS Bucket files, otherwise uses genesis"""
+def local_sync_block(config: SyncConfig, table: SyncTable) -> Optional[int]:
+    """Last sync block recorded in the sync file on the volume (None if there is none)"""
+    path = config.volume_path / str(table)
+    if not (path / config.sync_file).exists():
+        return None
     try:
-        block_from = aws.last_sync_block(table)
+        record = FileIO(path).load_singleton(config.sync_file, "csv")
+        return int(record[config.sync_column])
+    except (IndexError, KeyError, ValueError) as err:
+        log.warning(f"could not read sync file {path / config.sync_file}: {err!r}")
+        return None
+
+
+def rewind_local_sync_block(
+    config: SyncConfig, table: SyncTable, from_block: int
+) -> None:
+    """
+    Removes the sync file on the volume if it records a block at or after `from_block`
+    (i.e. after the bucket files from `from_block` were deleted),
+    so that the next sync resumes from the bucket instead of skipping the deleted range.
+    """
+    local_block = local_sync_block(config, table)
+    if local_block is not None and local_block >= from_block:
+        log.info(f"removing local sync block {local_block} of {table}")
+        (config.volume_path / str(table) / config.sync_file).unlink()
+
+
+def remote_sync_block(aws: AWSClient, table: SyncTable) -> Optional[int]:
+    """Last sync block determined from the AWS Bucket files (None if there are none)"""
+    try:
+        return aws.last_sync_block(table)
     except FileNotFoundError:
+        return None
+
+
+def last_sync_block(
+    aws: AWSClient,
+    table: SyncTable,
+    genesis_block: int = 0,
+    config: Optional[SyncConfig] = None,
+) -> int:
+    """
+    Attempts to get last sync block from AWS Bucket files, otherwise uses genesis.
+    With the local sync state policy (see `config`), the sync file on the volume is used
+    instead, only listing the bucket when there is no sync file (or for verification).
+    """
+    policy = config.sync_state_policy if config else SyncStatePolicy.REMOTE
+    local_block = local_sync_block(config, table) if config else None
+    if policy == SyncStatePolicy.LOCAL and local_block is not None:
+        log.info(f"last sync block {local_block} loaded from volume")
+        if not (config and config.verify_sync_state):
+            return local_block
+
+    remote_block = remote_sync_block(aws, table)
+    if None not in (local_block, remote_block) and local_block != remote_block:
         log.warning(
-            f"last sync could not be evaluated from AWS, using genesis block {genesis_block}"
+            f"last sync block on volume ({local_block}) and in AWS bucket ({remote_block}) "
+            f"disagree, using {policy.value} sync state"
         )
-        block_from = genesis_block
 
-    return block_from
+    if policy == SyncStatePolicy.LOCAL and local_block is not None:
+        return local_block
+    if remote_block is None:
+        log.warning(
+            f"last sync could not be evaluated from AWS, using genesis block {genesis_block}"
+        )
+        return genesis_block
+    return remote_block
@@ -1,12 +1,34 @@
 """Configuration details for sync jobs"""
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
+from datetime import timedelta
+from enum import Enum
 from pathlib import Path
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from src.environment import env_flag
+from src.fetch.content_cache import CACHE_MAX_BYTES
+from src.fetch.retry_queue import RetryPolicy
+from src.fetch.orderbook import ExtractionBackend
+from src.post.compression import ContentEncoding
+
+
+class SyncStatePolicy(Enum):
+    """
+    Source of truth for the last synced block:
+    the sync file on the persistent volume or the files in the AWS bucket.
+    """
+
+    LOCAL = "local"
+    REMOTE = "remote"
 
 
 @dataclass
-class SyncConfig:
+class SyncConfig:  # pylint: disable=too-many-instance-attributes
     """
     This data class contains all the credentials and volume paths
     required to sync with both a persistent volume and Dune's S3 Buckets.
@@ -16,6 +38,108 @@ class SyncConfig:
     # File System
     sync_file: str = "sync_block.csv"
     sync_column: str = "last_synced_block"
+    # Orderbook extraction: how (non-streamed) query results are transferred
+    extraction_backend: ExtractionBackend = ExtractionBackend.PANDAS
+    # Orderbook extraction: materialize results with Arrow backed dtypes
+    arrow_dtypes: bool = False
+    # Orderbook extraction: when set, results are streamed in chunks of this many rows
+    stream_chunk_size: Optional[int] = None
+    # Backfill: block ranges larger than this are synced in windows of this many blocks
+    backfill_window: Optional[int] = None
+    # Backfill: number of windows fetched in parallel
+    backfill_workers: int = 4
+    # Sync state: whether the volume's sync file or the bucket determines the last sync block
+    sync_state_policy: SyncStatePolicy = SyncStatePolicy.REMOTE
+    # Sync state: with the local policy, still compare against the bucket
+    verify_sync_state: bool = False
+    # Uploads: stream content straight into the bucket instead of uploading it from the volume
+    stream_uploads: bool = False
+    # Uploads: when streaming, still keep a copy of the content on the volume
+    stream_uploads_backup: bool = True
+    # Uploads: multipart upload part size (bytes) and number of parts uploaded concurrently
+    upload_part_size: int = 8 * 1024 * 1024
+    upload_concurrency: int = 4
+    # Uploads: attempts after a failed upload of a content file
+    upload_retries: int = 3
+    # Content files: split content into parts of at most this many records / bytes
+    max_file_rows: Optional[int] = None
+    max_file_bytes: Optional[int] = None
+    # Content files: compression of content files (on the volume and in the bucket)
+    content_encoding: Optional[ContentEncoding] = None
+
+    @classmethod
+    def new_from_environment(cls) -> SyncConfig:
+        """Constructs an instance of SyncConfig from environment variables"""
+        load_dotenv()
+        stream_chunk_size = os.environ.get("ORDERBOOK_STREAM_CHUNK_SIZE")
+        backfill_window = os.environ.get("BACKFILL_WINDOW_SIZE")
+        max_file_rows = os.environ.get("MAX_FILE_ROWS")
+        max_file_size = os.environ.get("MAX_FILE_SIZE_MB")
+        content_encoding = os.environ.get("CONTENT_ENCODING")
+        return cls(
+            volume_path=Path(os.environ["VOLUME_PATH"]),
+            extraction_backend=ExtractionBackend(
+                os.environ.get("ORDERBOOK_EXTRACTION_BACKEND", "pandas")
+            ),
+            arrow_dtypes=env_flag("ORDERBOOK_ARROW_DTYPES"),
+            stream_chunk_size=int(stream_chunk_size) if stream_chunk_size else None,
+            backfill_window=int(backfill_window) if backfill_window else None,
+            backfill_workers=int(
+                os.environ.get("BACKFILL_WORKERS", cls.backfill_workers)
+            ),
+            sync_state_policy=SyncStatePolicy(
+                os.environ.get("SYNC_STATE_POLICY", "remote")
+            ),
+            verify_sync_state=env_flag("SYNC_STATE_VERIFY"),
+            stream_uploads=env_flag("STREAM_UPLOADS"),
+            stream_uploads_backup=env_flag("STREAM_UPLOADS_BACKUP", default=True),
+            upload_part_size=int(
+                os.environ.get("UPLOAD_PART_SIZE_MB", cls.upload_part_size >> 20)
+            )
+            << 20,
+            upload_concurrency=int(
+                os.environ.get("UPLOAD_CONCURRENCY", cls.upload_concurrency)
+            ),
+            upload_retries=int(os.environ.get("UPLOAD_RETRIES", cls.upload_retries)),
+            max_file_rows=int(max_file_rows) if max_file_rows else None,
+            max_file_bytes=int(max_file_size) << 20 if max_file_size else None,
+            content_encoding=ContentEncoding(content_encoding)
+            if content_encoding
+            else None,
+        )
+
+
+@dataclass
+class AppDataFetchConfig:
+    """Configuration for resolving app data content (from the backend and IPFS)."""
+
+    volume_path: Path
+    # IPFS gateway access token
+    access_token: str
+    # Resolved content is cached in `cache_file` on the volume (at most `cache_max_bytes`)
+    cache_file: str = "content_cache.sqlite"
+    cache_max_bytes: int = CACHE_MAX_BYTES
+    # Lookups of content not found are rescheduled in `retry_file` on the volume
+    retry_file: str = "retries.sqlite"
+    retry_policy: RetryPolicy = RetryPolicy()
+
+    @classmethod
+    def new_from_environment(cls) -> AppDataFetchConfig:
+        """Constructs an instance of AppDataFetchConfig from environment variables"""
+        load_dotenv()
+        volume_path = os.environ.get("VOLUME_PATH")
+        access_token = os.environ.get("IPFS_ACCESS_KEY")
+        assert volume_path, "resolving app data needs a VOLUME_PATH env"
+        assert access_token, "resolving app data needs a IPFS_ACCESS_KEY env"
+        return cls(
+            volume_path=Path(volume_path),
+            access_token=access_token,
+            cache_max_bytes=int(
+                os.environ.get("APP_DATA_CACHE_MAX_MB", cls.cache_max_bytes >> 20)
+            )
+            << 20,
+            retry_policy=RetryPolicy.new_from_environment(),
+        )
 
 
 @dataclass
@@ -28,10 +152,41 @@ class AppDataSyncConfig:
     description: str = (
         "Table containing known CoW Protocol appData hashes and their pre-images"
     )
+    # Namespace of the table (required to append to it)
+    namespace: str = "cowprotocol"
+    # Incremental mode: only append hashes not published before.
+    # Published hashes are recorded in `hashes_file` on the volume.
+    incremental: bool = False
+    volume_path: Optional[Path] = None
+    hashes_file: str = "published_hashes.txt"
+    # When set, app data traded without preimage in the backend databases
+    # is resolved (from the backend APIs and IPFS) and published too.
+    fetch: Optional[AppDataFetchConfig] = None
+
+    @classmethod
+    def new_from_environment(cls) -> AppDataSyncConfig:
+        """Constructs an instance of AppDataSyncConfig from environment variables"""
+        load_dotenv()
+        table = os.environ["APP_DATA_TARGET_TABLE"]
+        assert table, "APP_DATA sync needs a APP_DATA_TARGET_TABLE env"
+        incremental = env_flag("APP_DATA_INCREMENTAL")
+        volume_path = os.environ.get("VOLUME_PATH")
+        # Published hashes are recorded on the volume, so it is required then.
+        assert (
+            volume_path or not incremental
+        ), "incremental APP_DATA sync needs a VOLUME_PATH env"
+        return cls(
+            table,
+            incremental=incremental,
+            volume_path=Path(volume_path) if incremental and volume_path else None,
+            fetch=AppDataFetchConfig.new_from_environment()
+            if env_flag("APP_DATA_RESOLVE_MISSING")
+            else None,
+        )
 
 
 @dataclass
-class PriceFeedSyncConfig:
+class PriceFeedSyncConfig:  # pylint: disable=too-many-instance-attributes
     """Configuration for price feed sync."""
 
     # The name of the table to upload to
@@ -40,3 +195,38 @@ class PriceFeedSyncConfig:
     description: str = (
         "Table containing prices and timestamps from multiple price feeds"
     )
+    # How query results are transferred from the analytics database
+    extraction_backend: ExtractionBackend = ExtractionBackend.PANDAS
+    # Namespace of the table (required to append to it)
+    namespace: str = "cowprotocol"
+    # Incremental mode: only append prices newer than the last synced time.
+    # The watermark is recorded in `state_file` on the volume.
+    incremental: bool = False
+    volume_path: Optional[Path] = None
+    state_file: str = "sync_state.json"
+    # Prices up to this long before the watermark are re-fetched (late arrivals)
+    rescan_window: timedelta = timedelta(0)
+
+    @classmethod
+    def new_from_environment(cls) -> PriceFeedSyncConfig:
+        """Constructs an instance of PriceFeedSyncConfig from environment variables"""
+        load_dotenv()
+        table = os.environ["PRICE_FEED_TARGET_TABLE"]
+        assert table, "PRICE FEED sync needs a PRICE_FEED_TARGET_TABLE env"
+        incremental = env_flag("PRICE_FEED_INCREMENTAL")
+        volume_path = os.environ.get("VOLUME_PATH")
+        # The watermark is recorded on the volume, so it is required then.
+        assert (
+            volume_path or not incremental
+        ), "incremental PRICE FEED sync needs a VOLUME_PATH env"
+        return cls(
+            table,
+            extraction_backend=ExtractionBackend(
+                os.environ.get("ORDERBOOK_EXTRACTION_BACKEND", "pandas")
+            ),
+            incremental=incremental,
+            volume_path=Path(volume_path) if incremental and volume_path else None,
+            rescan_window=timedelta(
+                minutes=float(os.environ.get("PRICE_FEED_RESCAN_MINUTES", 0))
+            ),
+        )
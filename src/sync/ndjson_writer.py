@@ -0,0 +1,273 @@
+"""
+Streaming NDJSON writer for content files.
+Records are serialized in bounded batches, so that neither the full list of records
+nor the full file content is held in memory at once.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from types import TracebackType
+from typing import Any, BinaryIO, Callable, Iterable, Optional, Protocol, Type
+
+from src.logger import set_log
+from src.post.compression import Compressor, ContentEncoding
+
+log = set_log(__name__)
+
+# Number of records serialized (and written) at once
+BATCH_SIZE = 10_000
+
+
+class ContentSink(Protocol):
+    """Destination of serialized content other than a file (e.g. a streaming upload)"""
+
+    def write(self, content: bytes) -> None:
+        """Appends `content`"""
+
+    def complete(self) -> None:
+        """Marks the end of the content"""
+
+    def abort(self, error: BaseException) -> None:
+        """Discards the content written so far"""
+
+
+class NDJSONWriter:  # pylint: disable=too-many-instance-attributes
+    """
+    Writes records to `path` as newline delimited JSON (identical to `FileIO.write_ndjson`).
+    Content is written to a temporary file which only replaces `path` once the writer
+    is closed without error: a failed write never leaves a partial file behind.
+    When no records were written, no file is created (as `FileIO.write_ndjson` skips empty data).
+
+    Serialized content is also passed to `sink` (e.g. a streaming upload), if given,
+    which is completed (or aborted) along with the file.
+    Without `path`, content is only passed to `sink`.
+    With `encoding`, content is compressed (in both the file and `sink`).
+
+    Usage:
+        with NDJSONWriter(path) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path],
+        batch_size: int = BATCH_SIZE,
+        sink: Optional[ContentSink] = None,
+        encoding: Optional[ContentEncoding] = None,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.sink = sink
+        self.record_count = 0
+        # Number of (possibly compressed) bytes written, along with their checksum
+        self.size = 0
+        # Number of bytes of serialized content (before compression)
+        self.content_size = 0
+        self._compressor: Optional[Compressor] = (
+            encoding.compressor() if encoding else None
+        )
+        self._digest = hashlib.sha256()
+        # Same output as the json module defaults used by `ndjson.writer`.
+        self._encoder = json.JSONEncoder(ensure_ascii=False)
+        self._file: Optional[BinaryIO] = None
+        if path is not None:
+            os.makedirs(path.parent, exist_ok=True)
+            # pylint: disable-next=consider-using-with
+            self._file = open(self.tmp_path, "wb")
+
+    @property
+    def tmp_path(self) -> Path:
+        """Temporary location of the file while it is written"""
+        assert self.path is not None, "writer has no file"
+        return self.path.with_name(f".{self.path.name}.tmp")
+
+    @property
+    def checksum(self) -> str:
+        """SHA-256 hex digest of the content written so far"""
+        return self._digest.hexdigest()
+
+    def encode(self, record: dict[str, Any]) -> str:
+        """Serialized `record` (without line delimiter)"""
+        return self._encoder.encode(record)
+
+    def write(self, records: Iterable[dict[str, Any]]) -> None:
+        """Serializes and writes `records`, `batch_size` at a time"""
+        encode = self._encoder.encode
+        batch: list[str] = []
+        for record in records:
+            batch.append(encode(record))
+            if len(batch) >= self.batch_size:
+                self.write_encoded(batch)
+                batch = []
+        if batch:
+            self.write_encoded(batch)
+
+    def write_encoded(self, lines: list[str]) -> None:
+        """Writes already serialized records `lines`"""
+        content = ("\n".join(lines) + "\n").encode("utf-8")
+        self.content_size += len(content)
+        self.record_count += len(lines)
+        if self._compressor is not None:
+            content = self._compressor.compress(content)
+        self._output(content)
+
+    def _output(self, content: bytes) -> None:
+        if not content:
+            return
+        if self._file is not None:
+            self._file.write(content)
+        if self.sink is not None:
+            self.sink.write(content)
+        self._digest.update(content)
+        self.size += len(content)
+
+    def close(self, commit: bool = True) -> None:
+        """
+        Closes the writer, moving the content into place if `commit` is set
+        (and any records were written), discarding it otherwise.
+        """
+        try:
+            if commit and self._compressor is not None:
+                self._output(self._compressor.flush())
+            if self.sink is not None:
+                if commit:
+                    self.sink.complete()
+                else:
+                    self.sink.abort(
+                        RuntimeError(f"discarded content {self.path or ''}")
+                    )
+        except BaseException:
+            commit = False
+            raise
+        finally:
+            self._close_file(commit)
+
+    def _close_file(self, commit: bool) -> None:
+        if self._file is None or self.path is None:
+            return
+        self._file.close()
+        if commit and self.record_count > 0:
+            os.replace(self.tmp_path, self.path)
+        else:
+            os.remove(self.tmp_path)
+
+    def discard(self) -> None:
+        """Removes the committed file (e.g. when other parts of the content failed)"""
+        if self.path is not None and self.record_count > 0 and self.path.exists():
+            os.remove(self.path)
+
+    def __enter__(self) -> NDJSONWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        if exc_type is not None:
+            log.warning(f"discarding incomplete content {self.path or ''}")
+        self.close(commit=exc_type is None)
+
+
+class NDJSONPartWriter:
+    """
+    Writes records to consecutive parts (each an `NDJSONWriter` obtained from `open_part`)
+    of at most `max_rows` records and (approximately) `max_bytes` bytes each.
+    Without limits, all records are written to a single part.
+    Parts are only opened once there are records for them.
+
+    When the writer is closed after an error, all parts (including completed ones)
+    are discarded.
+    """
+
+    def __init__(
+        self,
+        open_part: Callable[[int], NDJSONWriter],
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.open_part = open_part
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        # Completed parts
+        self.parts: list[NDJSONWriter] = []
+        self._current: Optional[NDJSONWriter] = None
+        # Serialized records not yet written to the current part, and their size.
+        self._pending: list[str] = []
+        self._pending_size = 0
+
+    @property
+    def record_count(self) -> int:
+        """Number of records written (to all parts)"""
+        current = self._current.record_count if self._current else 0
+        return sum(part.record_count for part in self.parts) + current
+
+    def _part_full(self, line: str) -> bool:
+        """True if `line` does not fit into the current part"""
+        if self._current is None:
+            return False
+        rows = self._current.record_count + len(self._pending)
+        if rows == 0:
+            return False
+        if self.max_rows and rows >= self.max_rows:
+            return True
+        # Sizes of pending records are counted in characters (equal to bytes for ASCII).
+        # Limits apply to the content before compression.
+        size = self._current.content_size + self._pending_size + len(line) + 1
+        return bool(self.max_bytes and size > self.max_bytes)
+
+    def write(self, records: Iterable[dict[str, Any]]) -> None:
+        """Serializes and writes `records`, starting new parts as needed"""
+        for record in records:
+            if self._current is None:
+                self._current = self.open_part(len(self.parts))
+            line = self._current.encode(record)
+            if self._part_full(line):
+                self._flush()
+                self._current.close()
+                self.parts.append(self._current)
+                self._current = self.open_part(len(self.parts))
+            self._pending.append(line)
+            self._pending_size += len(line) + 1
+            if len(self._pending) >= self._current.batch_size:
+                self._flush()
+        self._flush()
+
+    def _flush(self) -> None:
+        if self._pending and self._current is not None:
+            self._current.write_encoded(self._pending)
+        self._pending, self._pending_size = [], 0
+
+    def close(self, commit: bool = True) -> None:
+        """Completes the last part if `commit` is set, discards all parts otherwise"""
+        current, self._current = self._current, None
+        try:
+            if current is not None:
+                if commit:
+                    self._flush()
+                current.close(commit)
+                if commit:
+                    self.parts.append(current)
+        except BaseException:
+            commit = False
+            raise
+        finally:
+            if not commit:
+                for part in self.parts:
+                    part.discard()
+
+    def __enter__(self) -> NDJSONPartWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close(commit=exc_type is None)
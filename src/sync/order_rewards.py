@@ -1,5 +1,8 @@
 """Main Entry point for app_hash sync"""
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator
+
+from pandas import DataFrame
 
 from dune_client.file.interface import FileIO
 
@@ -12,6 +15,7 @@ from src.models.tables import SyncTable
 from src.post.aws import AWSClient
 from src.sync.common import last_sync_block
 from src.sync.config import SyncConfig
+from src.sync.ndjson_writer import BATCH_SIZE, NDJSONPartWriter, NDJSONWriter
 from src.sync.record_handler import RecordHandler
 from src.sync.upload_handler import UploadHandler
 
@@ -32,18 +36,34 @@ class OrderbookDataHandler(
         block_range: BlockRange,
         sync_table: SyncTable,
         config: SyncConfig,
-        data_list: list[dict[str, Any]],
+        data_chunks: Iterable[list[dict[str, Any]]],
     ):
         super().__init__(block_range, sync_table, config)
-        log.info(f"Handling {len(data_list)} new records")
         self.file_manager = file_manager
-        self.data_list = data_list
+        self.data_chunks = data_chunks
+        self.record_count = 0
 
     def num_records(self) -> int:
-        return len(self.data_list)
+        return self.record_count
 
     def write_found_content(self) -> None:
-        self.file_manager.write_ndjson(data=self.data_list, name=self.content_filename)
+        with self.content_writer(
+            lambda part: NDJSONWriter(
+                self.file_path / self.part_filename(part),
+                encoding=self.config.content_encoding,
+            )
+        ) as writer:
+            self.write_content(writer)
+        self.name_content_files(writer.parts)
+        self.content_parts = writer.parts
+
+    def write_content(self, writer: NDJSONPartWriter) -> None:
+        # Chunks are consumed (and serialized) one at a time,
+        # so only a single chunk is held in memory.
+        for data_list in self.data_chunks:
+            writer.write(data_list)
+        self.record_count = writer.record_count
+        log.info(f"Handled {self.record_count} new records")
 
     def write_sync_data(self) -> None:
         # Only write these if upload was successful.
@@ -53,6 +73,49 @@ class OrderbookDataHandler(
         )
 
 
+RecordFetcher = Callable[[BlockRange], Iterable[list[dict[str, Any]]]]
+
+
+def _record_fetcher(
+    fetch: Callable[..., DataFrame],
+    stream: Callable[..., Iterator[DataFrame]],
+    convert: Callable[[DataFrame], list[dict[str, Any]]],
+    config: SyncConfig,
+) -> RecordFetcher:
+    """
+    Returns a function fetching records for a block range either with a single query
+    or, when `config.stream_chunk_size` is set, as a lazy stream of bounded chunks.
+    Either way, records are converted (and thus written) a bounded chunk at a time.
+    """
+
+    def fetch_records(block_range: BlockRange) -> Iterable[list[dict[str, Any]]]:
+        if config.stream_chunk_size:
+            return (
+                convert(df)
+                for df in stream(
+                    block_range, config.stream_chunk_size, arrow=config.arrow_dtypes
+                )
+            )
+        return _convert_in_batches(
+            fetch(
+                block_range,
+                backend=config.extraction_backend,
+                arrow=config.arrow_dtypes,
+            ),
+            convert,
+        )
+
+    return fetch_records
+
+
+def _convert_in_batches(
+    frame: DataFrame, convert: Callable[[DataFrame], list[dict[str, Any]]]
+) -> Iterator[list[dict[str, Any]]]:
+    """Lazily converts `frame`, `BATCH_SIZE` rows at a time"""
+    for start in range(0, len(frame), BATCH_SIZE):
+        yield convert(frame.iloc[start : start + BATCH_SIZE])
+
+
 def sync_order_rewards(
     aws: AWSClient, fetcher: OrderbookFetcher, config: SyncConfig, dry_run: bool
 ) -> None:
@@ -63,6 +126,7 @@ def sync_order_rewards(
             aws,
             table=sync_table,
             genesis_block=15719994,  # First Recorded Order Reward block
+            config=config,
         ),
         block_to=fetcher.get_latest_block(),
     )
@@ -72,8 +136,11 @@ def sync_order_rewards(
         config,
         dry_run,
         sync_table=sync_table,
-        data_list=OrderRewards.from_pdf_to_dune_records(
-            fetcher.get_order_rewards(block_range)
+        fetch_records=_record_fetcher(
+            fetcher.get_order_rewards,
+            fetcher.stream_order_rewards,
+            OrderRewards.from_pdf_to_dune_records,
+            config,
         ),
     )
 
@@ -88,6 +155,7 @@ def sync_batch_rewards(
             aws,
             table=sync_table,
             genesis_block=16862919,  # First Recorded Batch Reward block
+            config=config,
         ),
         block_to=fetcher.get_latest_block(),
     )
@@ -97,8 +165,11 @@ def sync_batch_rewards(
         config,
         dry_run,
         sync_table,
-        data_list=BatchRewards.from_pdf_to_dune_records(
-            fetcher.get_batch_rewards(block_range)
+        fetch_records=_record_fetcher(
+            fetcher.get_batch_rewards,
+            fetcher.stream_batch_rewards,
+            BatchRewards.from_pdf_to_dune_records,
+            config,
         ),
     )
 
@@ -109,17 +180,68 @@ def sync_orderbook_data(  # pylint:disable=too-many-arguments,too-many-positiona
     config: SyncConfig,
     dry_run: bool,
     sync_table: SyncTable,
-    data_list: list[dict[str, Any]],
+    fetch_records: RecordFetcher,
 ) -> None:
     """Generic Orderbook Sync Logic"""
-    record_handler = OrderbookDataHandler(
-        file_manager=FileIO(config.volume_path / str(sync_table)),
-        block_range=block_range,
-        config=config,
-        data_list=data_list,
-        sync_table=sync_table,
-    )
-    UploadHandler(aws, record_handler, table=sync_table).write_and_upload_content(
-        dry_run
-    )
+    file_manager = FileIO(config.volume_path / str(sync_table))
+
+    def record_handler(window: BlockRange) -> OrderbookDataHandler:
+        return OrderbookDataHandler(
+            file_manager=file_manager,
+            block_range=window,
+            config=config,
+            data_chunks=fetch_records(window),
+            sync_table=sync_table,
+        )
+
+    window = config.backfill_window
+    if window and block_range.block_to - block_range.block_from > window:
+        backfill_orderbook_data(
+            aws,
+            windows=block_range.split(window),
+            dry_run=dry_run,
+            sync_table=sync_table,
+            workers=config.backfill_workers,
+            record_handler=record_handler,
+        )
+    else:
+        UploadHandler(
+            aws, record_handler(block_range), table=sync_table
+        ).write_and_upload_content(dry_run)
     log.info(f"{sync_table} sync run completed successfully")
+
+
+def backfill_orderbook_data(  # pylint:disable=too-many-arguments,too-many-positional-arguments
+    aws: AWSClient,
+    windows: list[BlockRange],
+    dry_run: bool,
+    sync_table: SyncTable,
+    workers: int,
+    record_handler: Callable[[BlockRange], RecordHandler],
+) -> None:
+    """
+    Syncs consecutive block `windows`, one bucket file per window.
+    Up to `workers` windows are fetched and written to the volume in parallel,
+    but uploads (and thus the recorded sync block) strictly follow window order:
+    a window is only uploaded once all windows before it are.
+    """
+    log.info(
+        f"backfilling {sync_table} from {windows[0].block_from} to {windows[-1].block_to} "
+        f"in {len(windows)} windows with {workers} workers"
+    )
+
+    def write_window(window: BlockRange) -> RecordHandler:
+        handler = record_handler(window)
+        handler.write_found_content()
+        return handler
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backfill")
+    try:
+        futures = [executor.submit(write_window, window) for window in windows]
+        for future in futures:
+            UploadHandler(aws, future.result(), table=sync_table).upload_content(
+                dry_run
+            )
+    finally:
+        # Windows not yet started are dropped if any earlier window failed.
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -1,13 +1,106 @@
 """Main Entry point for price feed sync"""
+from __future__ import annotations
 
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
 from dune_client.client import DuneClient
+from pandas import DataFrame, Series
 
 from src.fetch.orderbook import OrderbookFetcher
 from src.logger import set_log
+from src.models.tables import SyncTable
+from src.post.dune_table import DuneTable
 from src.sync.config import PriceFeedSyncConfig
 
 log = set_log(__name__)
 
+# Columns of the price feed query results (see src/sql/prices.sql)
+PRICE_FEED_SCHEMA = [
+    {"name": "token_address", "type": "varchar"},
+    {"name": "time", "type": "timestamp"},
+    {"name": "price", "type": "double"},
+    {"name": "decimals", "type": "integer"},
+    {"name": "source", "type": "varchar"},
+]
+
+
+def utc_datetime(value: str | datetime) -> datetime:
+    """Converts `value` (datetime, Timestamp or string) into a timezone aware (UTC) datetime"""
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize("UTC")
+    return timestamp.tz_convert("UTC").to_pydatetime()
+
+
+def price_keys(prices: DataFrame) -> Series:
+    """Unique identifier of each price record: token, time and source"""
+    return (
+        prices.token_address.astype(str)
+        + "|"
+        + pd.to_datetime(prices.time, utc=True).map(datetime.isoformat)
+        + "|"
+        + prices.source.astype(str)
+    )
+
+
+@dataclass
+class PriceFeedState:
+    """
+    Watermark of the price feed sync: the latest synced price time,
+    along with the keys of records synced within the rescan window before it
+    (and at the watermark itself), so that re-scanned records are not appended twice.
+    """
+
+    watermark: datetime
+    recent_keys: set[str] = field(default_factory=set)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional[PriceFeedState]:
+        """Loads state from `path`, returns None if there is none"""
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as file:
+            state = json.load(file)
+        return cls(
+            watermark=utc_datetime(state["watermark"]),
+            recent_keys=set(state["recent_keys"]),
+        )
+
+    def save(self, path: Path) -> None:
+        """Writes state to `path` (atomically replacing any previous state)"""
+        os.makedirs(path.parent, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "watermark": self.watermark.isoformat(),
+                    "recent_keys": sorted(self.recent_keys),
+                },
+                file,
+            )
+        os.replace(tmp_path, path)
+
+    def advance(self, prices: DataFrame, config: PriceFeedSyncConfig) -> PriceFeedState:
+        """Returns the state after syncing `prices`"""
+        if prices.empty:
+            return self
+        times = pd.to_datetime(prices.time, utc=True)
+        watermark = max(self.watermark, utc_datetime(times.max()))
+        horizon = watermark - config.rescan_window
+        recent = set(price_keys(prices[times >= horizon]))
+        recent.update(
+            key
+            for key in self.recent_keys
+            if datetime.fromisoformat(key.split("|")[1]) >= horizon
+        )
+        return PriceFeedState(watermark, recent)
+
 
 async def sync_price_feed(
     orderbook: OrderbookFetcher,
@@ -16,7 +109,11 @@ async def sync_price_feed(
     dry_run: bool,
 ) -> None:
     """Price Feed Sync Logic"""
-    prices = orderbook.get_price_feed()
+    if config.incremental:
+        sync_price_feed_incremental(orderbook, dune, config, dry_run)
+        return
+
+    prices = orderbook.get_price_feed(config.extraction_backend)
     if not dry_run:
         dune.upload_csv(
             data=prices.to_csv(index=False),
@@ -25,3 +122,92 @@ async def sync_price_feed(
             is_private=False,
         )
     log.info("price feed sync run completed successfully")
+
+
+def price_feed_table(dune: DuneClient, config: PriceFeedSyncConfig) -> DuneTable:
+    """Target table of the incremental price feed sync"""
+    return DuneTable(
+        dune, config.namespace, config.table, PRICE_FEED_SCHEMA, config.description
+    )
+
+
+def target_table_state(
+    table: DuneTable, config: PriceFeedSyncConfig
+) -> Optional[PriceFeedState]:
+    """
+    Sync state reconciled with the target table: its latest price time and the keys of
+    the records within the rescan window before it (None if it can not be determined).
+    """
+    try:
+        rows = table.dune.run_sql(
+            query_sql=f"SELECT max(time) AS latest FROM {table.full_name}",
+            name="Price feed watermark",
+        ).get_rows()
+        latest = rows[0]["latest"] if rows else None
+        if not latest:
+            return None
+        watermark = utc_datetime(latest)
+        recent = table.dune.run_sql(
+            query_sql=f"SELECT token_address, time, source FROM {table.full_name} "
+            f"WHERE time >= TIMESTAMP '{watermark - config.rescan_window:%Y-%m-%d %H:%M:%S.%f}'",
+            name="Price feed recent records",
+        ).get_rows()
+    except Exception as err:  # pylint: disable=broad-exception-caught
+        log.warning(f"could not determine watermark of {table.full_name}: {err}")
+        return None
+    recent_keys = set(price_keys(pd.DataFrame(recent))) if recent else set()
+    return PriceFeedState(watermark, recent_keys)
+
+
+def sync_price_feed_incremental(
+    orderbook: OrderbookFetcher,
+    dune: DuneClient,
+    config: PriceFeedSyncConfig,
+    dry_run: bool,
+) -> None:
+    """
+    Incremental Price Feed Sync Logic:
+    appends prices from the watermark (minus the rescan window) on, which have not been
+    synced yet, to the Dune table `dune.<namespace>.<table>`.
+    Without a local watermark, it is reconciled with the target table and, failing that,
+    the whole table is (re-)created.
+    """
+    assert config.volume_path, "incremental price feed sync requires a volume path"
+    state_path = config.volume_path / str(SyncTable.PRICE_FEED) / config.state_file
+    state = PriceFeedState.load(state_path)
+    table = price_feed_table(dune, config)
+    if state is None:
+        state = target_table_state(table, config)
+        if state is not None:
+            log.info(
+                f"reconciled price feed watermark {state.watermark} from {table.full_name}"
+            )
+
+    if state is None:
+        log.info(f"no price feed watermark on record, replacing {table.full_name}")
+        prices = orderbook.get_price_feed(config.extraction_backend)
+        if not dry_run:
+            table.replace(prices)
+        if prices.empty:
+            log.info("No prices: nothing to record")
+            return
+        state = PriceFeedState(utc_datetime(prices.time.min()))
+    else:
+        # Prices at the watermark itself are re-fetched too (late arrivals sharing
+        # its timestamp), records already synced are recognized by their keys.
+        prices = orderbook.get_price_feed(
+            config.extraction_backend, since=state.watermark - config.rescan_window
+        )
+        if not prices.empty:
+            # Drop re-scanned records which have already been synced.
+            prices = prices[~price_keys(prices).isin(state.recent_keys)]
+        if prices.empty:
+            log.info("No new prices: no sync necessary")
+            return
+        log.info(f"appending {len(prices)} new price records")
+        if not dry_run:
+            table.insert(prices)
+
+    if not dry_run:
+        state.advance(prices, config).save(state_path)
+    log.info("price feed sync run completed successfully")
@@ -3,11 +3,13 @@ Abstraction for New Content Handling
 provides a framework for writing new content to disk and posting to AWS
 """
 from abc import ABC, abstractmethod
+from typing import Callable
 
 from src.logger import set_log
 from src.models.block_range import BlockRange
 from src.models.tables import SyncTable
 from src.sync.config import SyncConfig
+from src.sync.ndjson_writer import NDJSONPartWriter, NDJSONWriter
 
 log = set_log(__name__)
 
@@ -30,7 +32,51 @@ class RecordHandler(ABC):  # pylint: disable=too-few-public-methods
 
         self.name = str(table)
         self.file_path = config.volume_path / self.name
-        self.content_filename = f"cow_{block_range.block_to}.json"
+        self.content_filename = f"cow_{block_range.block_to}.json{self.extension}"
+        # Files the content was written to (set once written)
+        self.content_parts: list[NDJSONWriter] = []
+
+    @property
+    def extension(self) -> str:
+        """Extension of the content encoding (empty for uncompressed content)"""
+        encoding = self.config.content_encoding
+        return encoding.extension if encoding else ""
+
+    @property
+    def split_content(self) -> bool:
+        """True if content is split into part files (see SyncConfig.max_file_rows/bytes)"""
+        return bool(self.config.max_file_rows or self.config.max_file_bytes)
+
+    def part_filename(self, part: int) -> str:
+        """Name of content file `part` (`content_filename` unless content is split)"""
+        if not self.split_content:
+            return self.content_filename
+        return f"cow_{self.block_range.block_to}_{part}.json{self.extension}"
+
+    def final_filenames(self, parts: int) -> list[str]:
+        """
+        Names of the content files once all `parts` are written:
+        content which was not split after all is named `content_filename`.
+        """
+        if parts == 1:
+            return [self.content_filename]
+        return [self.part_filename(part) for part in range(parts)]
+
+    def name_content_files(self, parts: list[NDJSONWriter]) -> None:
+        """Renames the (written) files of content `parts` to their `final_filenames`"""
+        for part, filename in zip(parts, self.final_filenames(len(parts))):
+            if part.path is not None and part.path.name != filename:
+                part.path = part.path.replace(part.path.with_name(filename))
+
+    def content_writer(
+        self, open_part: Callable[[int], NDJSONWriter]
+    ) -> NDJSONPartWriter:
+        """Writer splitting content into parts according to the configured limits"""
+        return NDJSONPartWriter(
+            open_part,
+            max_rows=self.config.max_file_rows,
+            max_bytes=self.config.max_file_bytes,
+        )
 
     @abstractmethod
     def num_records(self) -> int:
@@ -40,6 +86,10 @@ class RecordHandler(ABC):  # pylint: disable=too-few-public-methods
     def write_found_content(self) -> None:
         """Writes content to disk"""
 
+    @abstractmethod
+    def write_content(self, writer: NDJSONPartWriter) -> None:
+        """Writes content to `writer` (which may stream it elsewhere than disk)"""
+
     @abstractmethod
     def write_sync_data(self) -> None:
         """Records last synced content file"""
@@ -1,12 +1,17 @@
 """Upload handler responsible for local file updates and aws uploads"""
-import os
 import sys
+import time
+from pathlib import Path
 
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
 from s3transfer import S3UploadFailedError
 
 from src.logger import set_log
 from src.models.tables import SyncTable
-from src.post.aws import AWSClient
+from src.post.aws import AWSClient, staging_key
+from src.post.manifest import ManifestEntry
+from src.sync.ndjson_writer import NDJSONWriter
 from src.sync.record_handler import RecordHandler
 
 log = set_log(__name__)
@@ -27,35 +32,174 @@ class UploadHandler:  # pylint: disable=too-few-public-methods
         self.table = str(table)
 
     def _aws_login_and_upload(self) -> bool:
-        """Creates AWS client session and attempts to upload file"""
-        path, filename = (
-            self.record_handler.file_path,
-            self.record_handler.content_filename,
-        )
+        """
+        Creates AWS client session and attempts to upload the content files,
+        then records the uploaded files in the table's manifest.
+        Content split into several files is staged until all parts are uploaded,
+        so that it is only ever found in the table directory completely.
+        """
+        parts = self.record_handler.content_parts
+        staged = len(parts) > 1
+        if staged:
+            self.aws.delete_staged(self.table)
+        object_keys: list[str] = []
+        for part in parts:
+            assert part.path is not None, "content was not written to disk"
+            object_key = f"{self.table}/{part.path.name}"
+            upload_key = staging_key(object_key) if staged else object_key
+            try:
+                self._upload_with_retries(str(part.path), upload_key)
+            except S3UploadFailedError as err:
+                log.error(err)
+                self._roll_back(
+                    [staging_key(key) if staged else key for key in object_keys]
+                )
+                sys.exit(1)
+            object_keys.append(object_key)
+        if staged:
+            self._promote({staging_key(key): key for key in object_keys})
+        self._record_uploads(list(zip(object_keys, parts)))
+        return True
+
+    def _upload_with_retries(self, filename: str, object_key: str) -> None:
+        retries = self.record_handler.config.upload_retries
+        for attempt in range(retries + 1):
+            try:
+                self.aws.upload_file(filename=filename, object_key=object_key)
+                return
+            except S3UploadFailedError as err:
+                if attempt == retries:
+                    raise
+                delay = 2**attempt
+                log.warning(
+                    f"upload of {object_key} failed ({err}), retrying in {delay}s"
+                )
+                time.sleep(delay)
+
+    def _roll_back(self, object_keys: list[str]) -> None:
+        """
+        Deletes the uploaded parts of content which could not be uploaded completely
+        (as the bucket files determine the last sync block).
+        """
+        if object_keys:
+            log.warning(f"removing {len(object_keys)} uploaded parts: {object_keys}")
+            self.aws.delete_files(object_keys)
+
+    def _promote(self, moves: dict[str, str]) -> None:
+        """Moves the staged content parts into place (see `AWSClient.promote_staged`)"""
         try:
-            return self.aws.upload_file(
-                filename=os.path.join(path, filename),
-                object_key=f"{self.table}/{filename}",
-            )
-        except S3UploadFailedError as err:
+            self.aws.promote_staged(moves)
+        except ClientError as err:
             log.error(err)
+            self._roll_back(list(moves) + list(moves.values()))
             sys.exit(1)
 
+    def _record_uploads(self, uploads: list[tuple[str, NDJSONWriter]]) -> None:
+        """Records uploaded content files (object key and writer) in the table's manifest"""
+        block_range = self.record_handler.block_range
+        entries = [
+            ManifestEntry(
+                object_key=object_key,
+                block_to=block_range.block_to,
+                size=part.size,
+                block_from=block_range.block_from,
+                rows=part.record_count,
+                sha256=part.checksum,
+            )
+            for object_key, part in uploads
+        ]
+        try:
+            self.aws.record_uploads(self.table, entries)
+        except ClientError as err:
+            # The next sync catches the manifest up with the bucket (see last_sync_block).
+            log.error(
+                f"uploaded {[entry.object_key for entry in entries]} but failed to update "
+                f"manifest: {err}"
+            )
+            sys.exit(1)
+
+    def _stream_upload(self) -> None:
+        """
+        Streams the record handlers content straight into the AWS bucket
+        (optionally keeping a copy on the volume) and records it in the table's manifest.
+        Each content part is uploaded as soon as it is complete,
+        all of them are removed again if any part fails.
+        Parts of content which may be split are staged until all of them are uploaded.
+        """
+        record_handler, config = self.record_handler, self.record_handler.config
+        transfer_config = TransferConfig(
+            multipart_threshold=config.upload_part_size,
+            multipart_chunksize=config.upload_part_size,
+            max_concurrency=config.upload_concurrency,
+        )
+        staged = record_handler.split_content
+        if staged:
+            self.aws.delete_staged(self.table)
+        upload_keys: list[str] = []
+
+        def open_part(part: int) -> NDJSONWriter:
+            filename = record_handler.part_filename(part)
+            object_key = f"{self.table}/{filename}"
+            upload_keys.append(staging_key(object_key) if staged else object_key)
+            return NDJSONWriter(
+                Path(record_handler.file_path) / filename
+                if config.stream_uploads_backup
+                else None,
+                sink=self.aws.upload_stream(upload_keys[-1], transfer_config),
+                encoding=config.content_encoding,
+            )
+
+        writer = record_handler.content_writer(open_part)
+        try:
+            with writer:
+                record_handler.write_content(writer)
+        except BaseException as err:
+            self._roll_back(upload_keys[: len(writer.parts)])
+            if isinstance(err, (S3UploadFailedError, ClientError)):
+                log.error(err)
+                sys.exit(1)
+            raise
+
+        record_handler.name_content_files(writer.parts)
+        record_handler.content_parts = writer.parts
+        if not writer.parts:
+            return
+        object_keys = upload_keys
+        if staged:
+            object_keys = [
+                f"{self.table}/{filename}"
+                for filename in record_handler.final_filenames(len(writer.parts))
+            ]
+            self._promote(dict(zip(upload_keys, object_keys)))
+        self._record_uploads(list(zip(object_keys, writer.parts)))
+
     def write_and_upload_content(self, dry_run: bool) -> None:
         """
         - Writes record handlers content to persistent volume,
         - attempts to upload to AWS and
         - records last sync block on volume.
         When dryrun flag is enabled, does not upload to IPFS.
+        With streaming uploads enabled (and no dry run), content is written straight
+        to the bucket instead.
+        """
+        if self.record_handler.config.stream_uploads and not dry_run:
+            self._stream_upload()
+            self.upload_content(dry_run, uploaded=True)
+            return
+        self.record_handler.write_found_content()
+        self.upload_content(dry_run)
+
+    def upload_content(self, dry_run: bool, uploaded: bool = False) -> None:
+        """
+        Uploads the record handlers (already written) content to AWS
+        and records last sync block on volume.
+        `uploaded` indicates content which was already streamed to AWS.
         """
         record_handler = self.record_handler
-        num_records, block_range, name = (
-            record_handler.num_records(),
-            record_handler.block_range,
-            record_handler.name,
-        )
+        block_range, name = record_handler.block_range, record_handler.name
 
-        record_handler.write_found_content()
+        # Content may be produced lazily, so it is only counted once written.
+        num_records = record_handler.num_records()
         if num_records > 0:
             log.info(
                 f"attempting to post {num_records} new {name} records for block range {block_range}"
@@ -65,7 +209,8 @@ class UploadHandler:  # pylint: disable=too-few-public-methods
                     "DRY-RUN-ENABLED: New records written to volume, but not posted to AWS."
                 )
             else:
-                self._aws_login_and_upload()
+                if not uploaded:
+                    self._aws_login_and_upload()
                 log.info(
                     f"{name} sync for block range {block_range} complete: "
                     f"synced {num_records} records"
@@ -73,4 +218,8 @@ class UploadHandler:  # pylint: disable=too-few-public-methods
         else:
             log.info(f"No new {name} for block range {block_range}: no sync necessary")
 
+        if dry_run:
+            # The sync file may be the source of truth for the next run (see SyncStatePolicy).
+            log.info("DRY-RUN-ENABLED: last sync block not recorded.")
+            return
         record_handler.write_sync_data()
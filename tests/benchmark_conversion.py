@@ -0,0 +1,224 @@
+"""
+Script benchmarking the conversion of orderbook query results into Dune records.
+Compares the column-wise conversion with the former row-wise implementation
+(and checks that both produce identical records). The row-wise implementations
+also serve the unit tests as reference.
+
+Usage: python -m tests.benchmark_conversion --table batch_rewards --rows 100000
+"""
+import argparse
+import time
+from typing import Any, Callable
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from pandas import DataFrame
+
+from src.fetch.arrow_dtypes import to_arrow_dtypes
+from src.models.batch_rewards_schema import BatchRewards
+from src.models.order_rewards_schema import OrderRewards
+
+
+def order_rewards_row_wise(rewards_df: DataFrame) -> list[dict[str, Any]]:
+    """
+    Former (row by row) implementation of `OrderRewards.from_pdf_to_dune_records`,
+    unchanged. It predates Arrow backed dtypes and is only run on plain frames.
+    """
+    return [
+        {
+            "block_number": int(row["block_number"]),
+            "order_uid": row["order_uid"],
+            "tx_hash": row["tx_hash"],
+            "solver": row["solver"],
+            "data": {
+                "surplus_fee": str(row["surplus_fee"]),
+                "amount": float(row["amount"]),
+                "quote_solver": row["quote_solver"],
+                "protocol_fee": str(row["protocol_fee"]),
+                "protocol_fee_token": row["protocol_fee_token"],
+                "protocol_fee_native_price": float(row["protocol_fee_native_price"]),
+                "quote_sell_amount": str(row["quote_sell_amount"]),
+                "quote_buy_amount": str(row["quote_buy_amount"]),
+                "quote_gas_cost": float(row["quote_gas_cost"]),
+                "quote_sell_token_price": float(row["quote_sell_token_price"]),
+                "partner_fee": str(row["partner_fee"]),
+                "partner_fee_recipient": row["partner_fee_recipient"],
+                "protocol_fee_kind": row["protocol_fee_kind"],
+            },
+        }
+        for row in rewards_df.to_dict(orient="records")
+    ]
+
+
+def order_rewards_frame(num_rows: int, seed: int = 0) -> DataFrame:
+    """Synthetic order rewards query result (with the column types of the orderbook query)"""
+    rng = np.random.default_rng(seed)
+
+    def hex_strings(size: int, distinct: int) -> npt.NDArray[Any]:
+        values = np.array([f"0x{i:040x}" for i in range(distinct)], dtype=object)
+        return np.take(values, rng.integers(0, distinct, size))
+
+    def optional(values: npt.NDArray[Any]) -> npt.NDArray[Any]:
+        values = values.copy()
+        values[rng.random(len(values)) < 0.3] = None
+        return values
+
+    def wei(size: int) -> npt.NDArray[Any]:
+        return rng.integers(0, 10**18, size, dtype=np.int64)
+
+    return DataFrame(
+        {
+            "block_number": rng.integers(15_000_000, 20_000_000, num_rows),
+            "order_uid": hex_strings(num_rows, num_rows),
+            "solver": hex_strings(num_rows, 30),
+            "quote_solver": optional(hex_strings(num_rows, 30)),
+            "tx_hash": hex_strings(num_rows, num_rows),
+            "surplus_fee": wei(num_rows),
+            "amount": rng.random(num_rows) * 100,
+            "protocol_fee": wei(num_rows),
+            "protocol_fee_token": optional(hex_strings(num_rows, 500)),
+            "protocol_fee_native_price": rng.random(num_rows),
+            "quote_sell_amount": wei(num_rows),
+            "quote_buy_amount": wei(num_rows),
+            "quote_gas_cost": rng.random(num_rows) * 10**16,
+            "quote_sell_token_price": rng.random(num_rows) * 10**9,
+            "partner_fee": wei(num_rows),
+            "partner_fee_recipient": optional(hex_strings(num_rows, 10)),
+            "protocol_fee_kind": optional(
+                np.array(["surplus", "volume", "priceimprovement"], dtype=object)[
+                    rng.integers(0, 3, num_rows)
+                ]
+            ),
+        }
+    )
+
+
+def batch_rewards_row_wise(rewards_df: DataFrame) -> list[dict[str, Any]]:
+    """
+    Former (row by row) implementation of `BatchRewards.from_pdf_to_dune_records`,
+    unchanged. It predates Arrow backed dtypes and is only run on plain frames.
+    """
+    return [
+        {
+            "block_number": int(row["block_number"])
+            if not pd.isna(row["block_number"])
+            else None,
+            "tx_hash": row["tx_hash"],
+            "solver": row["solver"],
+            "block_deadline": int(row["block_deadline"]),
+            "data": {
+                # All the following values are in WEI.
+                "uncapped_payment_eth": int(row["uncapped_payment_eth"]),
+                "capped_payment": int(row["capped_payment"]),
+                "execution_cost": int(row["execution_cost"]),
+                "surplus": int(row["surplus"]),
+                "protocol_fee": int(row["protocol_fee"]),
+                "fee": int(row["network_fee"]),
+                "winning_score": int(row["winning_score"]),
+                "reference_score": int(row["reference_score"]),
+            },
+        }
+        for row in rewards_df.to_dict(orient="records")
+    ]
+
+
+def batch_rewards_frame(num_rows: int, seed: int = 0) -> DataFrame:
+    """
+    Synthetic batch rewards query result: text encoded wei amounts
+    (a few of which exceed int64) and nullable block numbers of unsettled auctions.
+    """
+    rng = np.random.default_rng(seed)
+    settled = rng.random(num_rows) < 0.8
+
+    def wei(size: int, huge: float = 0.0) -> list[str]:
+        values = rng.integers(-(10**18), 10**18, size).tolist()
+        return [
+            str(value * 10**40 if is_huge else value)
+            for value, is_huge in zip(values, rng.random(size) < huge)
+        ]
+
+    return DataFrame(
+        {
+            "block_number": pd.Series(
+                rng.integers(15_000_000, 20_000_000, num_rows), dtype="Int64"
+            ).where(settled, pd.NA),
+            "block_deadline": rng.integers(15_000_000, 20_000_000, num_rows),
+            "tx_hash": [
+                f"0x{i:064x}" if is_settled else None
+                for i, is_settled in enumerate(settled)
+            ],
+            "solver": np.take(
+                np.array([f"0x{i:040x}" for i in range(30)], dtype=object),
+                rng.integers(0, 30, num_rows),
+            ),
+            "uncapped_payment_eth": wei(num_rows),
+            "capped_payment": wei(num_rows),
+            "execution_cost": wei(num_rows),
+            "surplus": wei(num_rows),
+            "protocol_fee": wei(num_rows),
+            "network_fee": wei(num_rows),
+            "winning_score": wei(num_rows, huge=0.001),
+            "reference_score": wei(num_rows),
+        }
+    )
+
+
+BENCHMARKS: dict[
+    str,
+    tuple[
+        Callable[[int], DataFrame],
+        Callable[[DataFrame], list[dict[str, Any]]],
+        Callable[[DataFrame], list[dict[str, Any]]],
+    ],
+] = {
+    "order_rewards": (
+        order_rewards_frame,
+        order_rewards_row_wise,
+        OrderRewards.from_pdf_to_dune_records,
+    ),
+    "batch_rewards": (
+        batch_rewards_frame,
+        batch_rewards_row_wise,
+        BatchRewards.from_pdf_to_dune_records,
+    ),
+}
+
+
+def rows_per_second(
+    convert: Callable[[DataFrame], list[dict[str, Any]]],
+    frame: DataFrame,
+    repeat: int,
+) -> float:
+    """Best throughput of `repeat` conversions of `frame`"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        convert(frame)
+        best = min(best, time.perf_counter() - start)
+    return len(frame) / best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser("Script Arguments")
+    parser.add_argument("--table", choices=list(BENCHMARKS), default="order_rewards")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--arrow",
+        action="store_true",
+        help="Benchmark Arrow backed frames (ORDERBOOK_ARROW_DTYPES)",
+    )
+    args, _ = parser.parse_known_args()
+
+    make_frame, row_wise, column_wise = BENCHMARKS[args.table]
+    # The former implementation always converted plain frames.
+    baseline = make_frame(args.rows)
+    df = to_arrow_dtypes(baseline) if args.arrow else baseline
+    assert row_wise(baseline) == column_wise(df)
+
+    before = rows_per_second(row_wise, baseline, args.repeat)
+    after = rows_per_second(column_wise, df, args.repeat)
+    print(f"{args.table} ({args.rows} rows{', arrow' if args.arrow else ''}):")
+    print(f"  row-wise:    {before:12,.0f} rows/sec")
+    print(f"  column-wise: {after:12,.0f} rows/sec ({after / before:.1f}x)")
@@ -0,0 +1,65 @@
+import io
+from typing import Optional
+
+from botocore.exceptions import ClientError
+
+from src.post.aws import StreamingUpload
+
+
+class FakeBucket:
+    """
+    In memory stand-in for the S3 client calls used by AWSClient
+    (and for `AWSClient.upload_stream`, reading streams in parts as multipart uploads do)
+    """
+
+    def __init__(self, objects: Optional[dict[str, bytes]] = None, part_size: int = 7):
+        self.objects: dict[str, bytes] = {} if objects is None else objects
+        self.part_size = part_size
+        self.list_calls = 0
+        self.uploads = 0
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            error = {"Error": {"Code": "NoSuchKey", "Message": "Not Found"}}
+            raise ClientError(error, "GetObject")
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = Body
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+
+    def delete_objects(self, Bucket, Delete):
+        for obj in Delete["Objects"]:
+            self.objects.pop(obj["Key"], None)
+        return {}
+
+    def copy(self, CopySource, Bucket, Key, ExtraArgs=None):
+        self.objects[Key] = self.objects[CopySource["Key"]]
+
+    def get_paginator(self, _):
+        bucket = self
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix, StartAfter=""):
+                bucket.list_calls += 1
+                yield {
+                    "Contents": [
+                        {"Key": key, "Size": len(body)}
+                        for key, body in sorted(bucket.objects.items())
+                        if key.startswith(Prefix) and key > StartAfter
+                    ]
+                }
+
+        return Paginator()
+
+    def upload_stream(self, object_key, transfer_config=None):
+        def upload(stream):
+            self.uploads += 1
+            parts = []
+            while part := stream.read(self.part_size):
+                parts.append(part)
+            self.objects[object_key] = b"".join(parts)
+
+        return StreamingUpload(upload, buffer_chunks=2)
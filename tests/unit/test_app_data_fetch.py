@@ -0,0 +1,198 @@
+import asyncio
+import unittest
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.fetch.ipfs import Cid, LatencyStats, resolve_hedged
+from src.models.app_data_content import FoundContent, NotFoundContent
+
+
+class TestConcurrentFetch(IsolatedAsyncioTestCase):
+    async def test_bounded_concurrency(self):
+        rows = [
+            {"app_hash": f"0x{i:064x}", "first_seen_block": str(i), "attempts": "1"}
+            for i in range(20)
+        ]
+        running, peak = 0, 0
+
+        async def fetch_content(
+            cid, max_retries, previous_attempts, session, first_seen_block
+        ):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if first_seen_block % 2:
+                return FoundContent(cid.hex, first_seen_block, {"version": "1"})
+            return NotFoundContent(cid.hex, first_seen_block, previous_attempts + 3)
+
+        async def fetch_from_backend(app_hash, first_seen_block, attempts, session):
+            if first_seen_block == 0:
+                return FoundContent(app_hash, first_seen_block, {})
+            return NotFoundContent(app_hash, first_seen_block, attempts + 1)
+
+        stats = LatencyStats()
+        with patch.object(
+            Cid, "fetch_from_backend_async", fetch_from_backend
+        ), patch.object(Cid, "fetch_content", fetch_content):
+            found, not_found = await Cid.fetch_many(
+                rows, "token", concurrency=4, stats=stats
+            )
+
+        self.assertEqual(4, peak)
+        self.assertEqual(
+            [0] + list(range(1, 20, 2)), [f.first_seen_block for f in found]
+        )
+        self.assertEqual(list(range(2, 20, 2)), [n.first_seen_block for n in not_found])
+        self.assertEqual({4}, {n.attempts for n in not_found})
+        # Unresolved hashes are looked up in all sources, others stop at the first hit.
+        self.assertEqual(20, len(stats.samples["backend"]))
+        self.assertEqual(19, len(stats.samples["ipfs"]))
+        self.assertEqual(9, len(stats.samples["ipfs_old_schema"]))
+        self.assertEqual(9, sum(stats.histogram("ipfs_old_schema").values()))
+
+
+class TestBackendLookup(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        async def prod(request):
+            app_hash = request.match_info["app_hash"]
+            if app_hash in ("0x02", "0x04"):
+                await asyncio.sleep(1)
+            if app_hash in ("0x01", "0x04"):
+                return web.json_response({"fullAppData": '{"env": "prod"}'})
+            raise web.HTTPNotFound()
+
+        async def barn(request):
+            if request.match_info["app_hash"] == "0x02":
+                return web.json_response({"fullAppData": '{"env": "barn"}'})
+            raise web.HTTPNotFound()
+
+        app = web.Application()
+        app.router.add_get("/prod/{app_hash}", prod)
+        app.router.add_get("/barn/{app_hash}", barn)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        urls = (
+            str(self.server.make_url("/prod/")),
+            str(self.server.make_url("/barn/")),
+        )
+        self.urls = patch("src.fetch.ipfs.BACKEND_URLS", urls)
+        self.urls.start()
+
+    async def asyncTearDown(self) -> None:
+        self.urls.stop()
+        await self.server.close()
+
+    async def lookup(self, app_hash: str, timeout: float = 1.0):
+        async with Cid.backend_session(timeout) as session:
+            return await Cid.fetch_from_backend_async(app_hash, 10, 0, session)
+
+    async def test_first_hit_wins(self):
+        self.assertEqual(
+            FoundContent("0x01", 10, {"env": "prod"}), await self.lookup("0x01")
+        )
+        self.assertEqual(NotFoundContent("0x03", 10, 1), await self.lookup("0x03"))
+
+    async def test_slow_backend_not_awaited(self):
+        start = asyncio.get_running_loop().time()
+        self.assertEqual(
+            FoundContent("0x02", 10, {"env": "barn"}), await self.lookup("0x02")
+        )
+        self.assertLess(asyncio.get_running_loop().time() - start, 0.5)
+
+    async def test_losing_lookup_cancelled(self):
+        async with Cid.backend_session(1.0) as session:
+            await Cid.fetch_from_backend_async("0x02", 10, 0, session)
+            # The slow prod lookup has finished cancelling once the result is returned.
+            lookups = [
+                task
+                for task in asyncio.all_tasks()
+                if task.get_coro().__qualname__ == "Cid.fetch_from_backend_url"
+            ]
+            self.assertEqual([], lookups)
+
+    async def test_timeout(self):
+        # The slow backend times out, the other one misses.
+        self.assertEqual(
+            NotFoundContent("0x04", 10, 1), await self.lookup("0x04", timeout=0.1)
+        )
+
+
+class TestHedgedResolution(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.events = []
+        self.stats = LatencyStats()
+
+    def lookup(self, source: str, delay: float, found: bool):
+        async def run():
+            self.events.append(f"start {source}")
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self.events.append(f"cancel {source}")
+                raise
+            if found:
+                return FoundContent("0x01", 1, {"source": source})
+            return NotFoundContent("0x01", 1, len(source))
+
+        return source, run
+
+    async def test_in_turn(self):
+        result = await resolve_hedged(
+            [
+                self.lookup("backend", 0, False),
+                self.lookup("ipfs", 0, False),
+                self.lookup("old", 0, True),
+            ],
+            None,
+            self.stats,
+        )
+        self.assertEqual({"source": "old"}, result.content)
+        self.assertEqual(["start backend", "start ipfs", "start old"], self.events)
+        self.assertEqual({"old": 1}, self.stats.wins)
+
+    async def test_slow_source_hedged(self):
+        start = asyncio.get_running_loop().time()
+        result = await resolve_hedged(
+            [
+                self.lookup("backend", 1, True),
+                self.lookup("ipfs", 0.01, True),
+                self.lookup("old", 1, True),
+            ],
+            0.05,
+            self.stats,
+        )
+        self.assertEqual({"source": "ipfs"}, result.content)
+        self.assertLess(asyncio.get_running_loop().time() - start, 0.5)
+        self.assertEqual(["start backend", "start ipfs", "cancel backend"], self.events)
+        # Cancelled lookups are not counted in the latency stats.
+        self.assertEqual(["ipfs"], list(self.stats.samples))
+
+    async def test_priority_among_simultaneous_hits(self):
+        result = await resolve_hedged(
+            [
+                self.lookup("backend", 0.01, True),
+                self.lookup("ipfs", 0.01, False),
+                self.lookup("old", 0.01, True),
+            ],
+            0,
+            self.stats,
+        )
+        self.assertEqual({"source": "backend"}, result.content)
+
+    async def test_nothing_found(self):
+        result = await resolve_hedged(
+            [self.lookup("backend", 0.02, False), self.lookup("ipfs", 0, False)],
+            0,
+            self.stats,
+        )
+        # The result of the last source, even though it failed first
+        self.assertEqual(NotFoundContent("0x01", 1, 4), result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,214 @@
+import os
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+from src.models.tables import SyncTable
+from src.post.aws import (
+    ASSUMED_ROLES,
+    AWSClient,
+    BucketFileObject,
+    BucketStructure,
+    DeleteError,
+)
+
+
+def sts_response(expires_in: timedelta):
+    return {
+        "Credentials": {
+            "AccessKeyId": "key",
+            "SecretAccessKey": "secret",
+            "SessionToken": "token",
+            "Expiration": datetime.now(timezone.utc) + expires_in,
+        }
+    }
+
+
+NO_SUCH_KEY = ClientError(
+    {"Error": {"Code": "NoSuchKey", "Message": "Not Found"}}, "GetObject"
+)
+
+
+class TestAssumedRoleCache(unittest.TestCase):
+    def setUp(self) -> None:
+        ASSUMED_ROLES.clear()
+        self.addCleanup(ASSUMED_ROLES.clear)
+        patcher = patch("src.post.aws.boto3")
+        self.boto3 = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.sts = MagicMock()
+        self.boto3.client.return_value = self.sts
+        self.boto3.resource.side_effect = lambda *args, **kwargs: MagicMock()
+        env = patch.dict(os.environ)
+        env.start()
+        self.addCleanup(env.stop)
+        os.environ.pop("AWS_SECRET_ACCESS_KEY", None)
+
+    @staticmethod
+    def client(external_role: str = "external") -> AWSClient:
+        return AWSClient("internal", external_role, "id", "bucket")
+
+    def test_session_shared_until_expiry(self):
+        self.sts.assume_role.return_value = sts_response(timedelta(hours=1))
+        resource = self.client()._assume_role()
+        # Shared by all clients (and operations) with the same roles
+        self.assertIs(resource, self.client()._assume_role())
+        self.client().delete_file("order_rewards/cow_1.json")
+        self.assertEqual(1, self.sts.assume_role.call_count)
+        self.assertIsNot(resource, self.client("other")._assume_role())
+        self.assertEqual(2, self.sts.assume_role.call_count)
+
+    def test_session_refreshed_before_expiry(self):
+        self.sts.assume_role.return_value = sts_response(timedelta(minutes=4))
+        resource = self.client()._assume_role()
+
+        self.sts.assume_role.return_value = sts_response(timedelta(hours=1))
+        refreshed = self.client()._assume_role()
+        self.assertIsNot(resource, refreshed)
+        self.assertIs(refreshed, self.client()._assume_role())
+        self.assertEqual(2, self.sts.assume_role.call_count)
+
+    def test_internal_role_assumed_with_environment_credentials(self):
+        os.environ["AWS_SECRET_ACCESS_KEY"] = "secret"
+        self.sts.assume_role.return_value = sts_response(timedelta(hours=1))
+        self.client()._assume_role()
+        self.client()._assume_role()
+        self.assertEqual(2, self.sts.assume_role.call_count)
+
+
+class TestBatchedDeletes(unittest.TestCase):
+    def setUp(self) -> None:
+        self.aws = AWSClient("internal", "external", "id", "bucket")
+        self.s3_client = MagicMock()
+        self.s3_client.delete_objects.return_value = {}
+        self.s3_client.get_object.side_effect = NO_SUCH_KEY
+        self.aws._assume_role = MagicMock()
+        self.aws._get_s3_client = MagicMock(return_value=self.s3_client)
+        keys = [f"order_rewards/cow_{block}.json" for block in range(1, 2501)]
+        self.aws.existing_files = MagicMock(
+            return_value=BucketStructure.from_bucket_collection(
+                [SimpleNamespace(key=key) for key in keys]
+            )
+        )
+
+    def deleted_keys(self) -> list[list[str]]:
+        return [
+            [obj["Key"] for obj in call.kwargs["Delete"]["Objects"]]
+            for call in self.s3_client.delete_objects.call_args_list
+        ]
+
+    def test_delete_all_in_batches(self):
+        self.assertEqual([], self.aws.delete_all("order_rewards"))
+        batches = self.deleted_keys()
+        self.assertEqual([1000, 1000, 500], sorted(map(len, batches), reverse=True))
+        self.assertEqual(2500, len({key for batch in batches for key in batch}))
+
+    def test_delete_from(self):
+        self.aws.delete_from("order_rewards", 2401)
+        self.assertEqual(
+            [[f"order_rewards/cow_{block}.json" for block in range(2401, 2501)]],
+            self.deleted_keys(),
+        )
+
+    def test_per_key_errors(self):
+        def delete_objects(Bucket, Delete):
+            keys = [obj["Key"] for obj in Delete["Objects"]]
+            if "order_rewards/cow_1.json" in keys:
+                error = {"Error": {"Code": "SlowDown", "Message": "Reduce rate"}}
+                raise ClientError(error, "DeleteObjects")
+            return {
+                "Errors": [
+                    {"Key": keys[0], "Code": "AccessDenied", "Message": "Denied"}
+                ]
+            }
+
+        self.s3_client.delete_objects.side_effect = delete_objects
+        errors = self.aws.delete_all("order_rewards")
+        self.assertEqual(1002, len(errors))
+        self.assertIn(
+            DeleteError("order_rewards/cow_1.json", "SlowDown", "Reduce rate"), errors
+        )
+        self.assertIn(
+            DeleteError("order_rewards/cow_1001.json", "AccessDenied", "Denied"),
+            errors,
+        )
+
+    def test_dry_run(self):
+        with self.assertLogs("src.post.aws", level="INFO") as logs:
+            self.assertEqual([], self.aws.delete_from("order_rewards", 2500, True))
+        self.s3_client.delete_objects.assert_not_called()
+        self.assertIn(
+            "would delete order_rewards/cow_2500.json", "\n".join(logs.output)
+        )
+
+
+class TestPrefixListing(unittest.TestCase):
+    def setUp(self) -> None:
+        self.aws = AWSClient("internal", "external", "id", "bucket")
+        self.s3_client = MagicMock()
+        self.aws._assume_role = MagicMock()
+        self.aws._get_s3_client = MagicMock(return_value=self.s3_client)
+        self.s3_client.get_object.side_effect = NO_SUCH_KEY
+        self.paginator = self.s3_client.get_paginator.return_value
+
+    def test_last_sync_block(self):
+        self.paginator.paginate.return_value = [
+            {"Contents": [{"Key": "batch_rewards/cow_20.json"}]},
+            {
+                "Contents": [
+                    {"Key": "batch_rewards/cow_1000.json"},
+                    {"Key": "batch_rewards/readme.txt"},
+                ]
+            },
+            {"Contents": [{"Key": "batch_rewards/cow_999.json"}]},
+        ]
+
+        self.assertEqual(1000, self.aws.last_sync_block(SyncTable.BATCH_REWARDS))
+        self.s3_client.get_paginator.assert_called_once_with("list_objects_v2")
+        self.paginator.paginate.assert_called_once_with(
+            Bucket="bucket", Prefix="batch_rewards/"
+        )
+
+    def test_last_sync_block_without_files(self):
+        self.paginator.paginate.return_value = [{"KeyCount": 0}]
+        with self.assertRaises(FileNotFoundError):
+            self.aws.last_sync_block("batch_rewards")
+
+    def test_existing_files_of_table(self):
+        self.paginator.paginate.return_value = [
+            {"Contents": [{"Key": "order_rewards/cow_5.json"}]}
+        ]
+        structure = self.aws.existing_files(SyncTable.ORDER_REWARDS)
+        self.assertEqual(
+            [BucketFileObject("order_rewards", "cow_5.json", 5)],
+            structure.get(SyncTable.ORDER_REWARDS),
+        )
+
+    def test_part_files(self):
+        self.paginator.paginate.return_value = [
+            {
+                "Contents": [
+                    {"Key": "order_rewards/cow_7_1.json"},
+                    {"Key": "order_rewards/cow_7_0.json"},
+                    {"Key": "order_rewards/cow_5.json"},
+                ]
+            }
+        ]
+        self.assertEqual(
+            [
+                BucketFileObject("order_rewards", "cow_7_1.json", 7, 1),
+                BucketFileObject("order_rewards", "cow_7_0.json", 7, 0),
+                BucketFileObject("order_rewards", "cow_5.json", 5),
+            ],
+            self.aws.existing_files(SyncTable.ORDER_REWARDS).get(
+                SyncTable.ORDER_REWARDS
+            ),
+        )
+        self.assertEqual(7, self.aws.last_sync_block(SyncTable.ORDER_REWARDS))
+
+
+if __name__ == "__main__":
+    unittest.main()
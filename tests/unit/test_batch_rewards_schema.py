@@ -3,7 +3,12 @@ import unittest
 import pandas
 import pandas as pd
 
+from src.fetch.arrow_dtypes import to_arrow_dtypes
 from src.models.batch_rewards_schema import BatchRewards
+from tests.benchmark_conversion import (
+    batch_rewards_frame,
+    batch_rewards_row_wise,
+)
 
 ONE_ETH = 1000000000000000000
 
@@ -75,6 +80,46 @@ class TestModelBatchRewards(unittest.TestCase):
             BatchRewards.from_pdf_to_dune_records(sample_df),
         )
 
+    def test_batch_rewards_transformation_arrow(self):
+        # wei amounts are queried as text
+        sample_df = pd.DataFrame(
+            {
+                "block_number": pd.Series([123, pandas.NA], dtype="Int64"),
+                "block_deadline": [789, 1011],
+                "tx_hash": ["0x71", None],
+                "solver": ["0x51", "0x51"],
+                "execution_cost": [str(9999 * ONE_ETH), "1"],
+                "surplus": [str(2 * ONE_ETH), str(3 * ONE_ETH)],
+                "protocol_fee": ["2000000000000000", "0"],
+                "network_fee": [
+                    "1000000000000000",
+                    "115792089237316195423570985008687907853269984665640564039457584007913129639935",
+                ],
+                "uncapped_payment_eth": ["0", str(-10 * ONE_ETH)],
+                "capped_payment": ["-1000000000000000", "-1000000000000000"],
+                "winning_score": [str(123456 * ONE_ETH), str(6789 * ONE_ETH)],
+                "reference_score": [str(ONE_ETH), str(2 * ONE_ETH)],
+            }
+        )
+        self.assertEqual(
+            BatchRewards.from_pdf_to_dune_records(sample_df),
+            BatchRewards.from_pdf_to_dune_records(to_arrow_dtypes(sample_df)),
+        )
+
+    def test_batch_rewards_transformation_matches_row_wise(self):
+        # Includes unsettled auctions and wei amounts exceeding int64.
+        sample_df = batch_rewards_frame(5000)
+        self.assertEqual(
+            batch_rewards_row_wise(sample_df),
+            BatchRewards.from_pdf_to_dune_records(sample_df),
+        )
+        # All wei amounts fit into int64
+        sample_df["winning_score"] = sample_df["reference_score"]
+        self.assertEqual(
+            batch_rewards_row_wise(sample_df),
+            BatchRewards.from_pdf_to_dune_records(sample_df),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
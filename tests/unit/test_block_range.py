@@ -0,0 +1,22 @@
+import unittest
+
+from src.models.block_range import BlockRange
+
+
+class TestBlockRange(unittest.TestCase):
+    def test_split(self):
+        self.assertEqual(
+            [BlockRange(10, 14), BlockRange(14, 18), BlockRange(18, 20)],
+            BlockRange(10, 20).split(4),
+        )
+        self.assertEqual([BlockRange(10, 20)], BlockRange(10, 20).split(10))
+        self.assertEqual([BlockRange(10, 20)], BlockRange(10, 20).split(100))
+        self.assertEqual([], BlockRange(10, 10).split(5))
+
+    def test_split_invalid_window(self):
+        with self.assertRaises(AssertionError):
+            BlockRange(10, 20).split(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
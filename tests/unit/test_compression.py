@@ -0,0 +1,97 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from dune_client.file.interface import FileIO
+
+from src.post.aws import AWSClient, BucketFileObject
+from src.post.compression import ContentEncoding
+from src.scripts.download_file import download_file
+from src.sync.ndjson_writer import NDJSONPartWriter, NDJSONWriter
+
+RECORDS = [{"solver": "0x51", "kind": "surplus", "block_number": i} for i in range(50)]
+
+
+class TestContentEncoding(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name)
+        self.file_io = FileIO(self.path)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def write(self, encoding: ContentEncoding) -> NDJSONWriter:
+        name = f"cow_1.json{encoding.extension}"
+        with NDJSONWriter(self.path / name, batch_size=7, encoding=encoding) as writer:
+            writer.write(RECORDS)
+        return writer
+
+    def assert_round_trip(self, encoding: ContentEncoding) -> None:
+        writer = self.write(encoding)
+        self.file_io.write_ndjson(RECORDS, "expected.json")
+        expected = (self.path / "expected.json").read_bytes()
+
+        encoding.decompress_file(str(writer.path), str(self.path / "cow_1.json"))
+        self.assertEqual(expected, (self.path / "cow_1.json").read_bytes())
+        self.assertEqual(len(expected), writer.content_size)
+        self.assertEqual(os.path.getsize(writer.path), writer.size)
+        self.assertLess(writer.size, writer.content_size)
+
+    def test_gzip(self):
+        self.assert_round_trip(ContentEncoding.GZIP)
+        # Readable with standard tools
+        with gzip.open(self.path / "cow_1.json.gz") as file:
+            self.assertEqual(RECORDS, [json.loads(line) for line in file])
+
+    def test_zstd(self):
+        self.assert_round_trip(ContentEncoding.ZSTD)
+
+    def test_part_limits_apply_before_compression(self):
+        def open_part(part: int) -> NDJSONWriter:
+            return NDJSONWriter(
+                self.path / f"cow_1_{part}.json.gz", encoding=ContentEncoding.GZIP
+            )
+
+        with NDJSONPartWriter(open_part, max_bytes=1000) as writer:
+            writer.write(RECORDS)
+        self.assertGreater(len(writer.parts), 1)
+        for part in writer.parts:
+            self.assertLessEqual(part.content_size, 1000)
+
+    def test_compressed_names(self):
+        self.assertEqual(
+            BucketFileObject("order_rewards", "cow_7_1.json.gz", 7, 1),
+            BucketFileObject.from_key("order_rewards/cow_7_1.json.gz"),
+        )
+        self.assertEqual(9, BucketFileObject.block_from_name("cow_9.json.zst"))
+        self.assertIsNone(ContentEncoding.from_name("cow_9.json"))
+        self.assertEqual(
+            {"ACL": "bucket-owner-full-control", "ContentEncoding": "gzip"},
+            AWSClient._upload_args("order_rewards/cow_7.json.gz"),
+        )
+
+    def test_download_decompresses(self):
+        compressed = self.write(ContentEncoding.GZIP).path.read_bytes()
+        aws = MagicMock()
+        aws.download_file.side_effect = lambda filename, object_key: Path(
+            filename
+        ).write_bytes(compressed)
+
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as download_dir:
+            os.chdir(download_dir)
+            try:
+                name = download_file(aws, "order_rewards/cow_1.json.gz")
+                self.assertEqual(["cow_1.json"], os.listdir("."))
+                self.assertEqual(gzip.decompress(compressed), Path(name).read_bytes())
+            finally:
+                os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from src.fetch.content_cache import ContentCache
+from src.fetch.ipfs import Cid
+from src.models.app_data_content import FoundContent, NotFoundContent
+
+
+def content(i: int) -> FoundContent:
+    return FoundContent(f"0x{i:02x}", 100 + i, {"appCode": "x" * 10, "i": i})
+
+
+class TestContentCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "app_data" / "content_cache.sqlite"
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_persisted(self):
+        with ContentCache(self.path) as cache:
+            cache.put_many([content(1), content(2)])
+
+        with ContentCache(self.path) as cache:
+            self.assertEqual({"0x01": content(1)}, cache.get_many(["0x01", "0x03"]))
+            self.assertEqual((1, 1), (cache.stats.hits, cache.stats.misses))
+            self.assertEqual(0.5, cache.stats.hit_rate)
+
+    def test_least_recently_used_evicted(self):
+        entry_size = len('{"appCode": "xxxxxxxxxx", "i": 1}')
+        with ContentCache(self.path, max_bytes=3 * entry_size) as cache:
+            cache.put_many([content(1), content(2), content(3)])
+            cache.get_many(["0x01"])
+            cache.put_many([content(4)])
+
+            self.assertEqual(3, len(cache))
+            self.assertEqual(1, cache.stats.evictions)
+            self.assertEqual(
+                ["0x01", "0x03", "0x04"],
+                sorted(cache.get_many(["0x01", "0x02", "0x03", "0x04"])),
+            )
+
+
+class TestCachedFetch(IsolatedAsyncioTestCase):
+    async def test_cached_content_not_fetched(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ContentCache(Path(tmp_dir) / "content_cache.sqlite")
+            cache.put_many([content(1)])
+            rows = [
+                {"app_hash": f"0x{i:02x}", "first_seen_block": str(100 + i)}
+                for i in (1, 2, 3)
+            ]
+            resolved = []
+
+            async def resolve(cls, row, *args):
+                resolved.append(row["app_hash"])
+                i = int(row["app_hash"], 16)
+                if i == 2:
+                    return content(2)
+                return NotFoundContent(row["app_hash"], 100 + i, 1)
+
+            with patch.object(Cid, "_resolve", classmethod(resolve)):
+                found, not_found = await Cid.fetch_many(rows, "token", cache=cache)
+                self.assertEqual(["0x02", "0x03"], resolved)
+                self.assertEqual([content(1), content(2)], found)
+                self.assertEqual([NotFoundContent("0x03", 103, 1)], not_found)
+
+                # Resolved content is cached, hashes not found are looked up again.
+                resolved.clear()
+                await Cid.fetch_many(rows, "token", cache=cache)
+                self.assertEqual(["0x03"], resolved)
+
+                # Cache hits keep the block of the row, only the content is cached.
+                rows[0]["first_seen_block"] = "99"
+                found, _ = await Cid.fetch_many(rows[:1], "token", cache=cache)
+                self.assertEqual([FoundContent("0x01", 99, content(1).content)], found)
+            cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+import hashlib
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+from s3transfer import S3UploadFailedError
+
+from src.models.block_range import BlockRange
+from src.models.tables import SyncTable
+from src.post.aws import AWSClient
+from src.post.manifest import BucketManifest, ManifestEntry
+from src.sync.config import SyncConfig
+from src.sync.order_rewards import OrderbookDataHandler
+from src.sync.upload_handler import UploadHandler
+from tests.unit.fake_bucket import FakeBucket
+
+TABLE = SyncTable.BATCH_REWARDS
+
+
+class TestBucketManifest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.bucket = FakeBucket(
+            {
+                "batch_rewards/cow_20.json": b"{}\n{}\n",
+                "batch_rewards/cow_10.json": b"{}\n",
+                "order_rewards/cow_30.json": b"{}\n",
+            }
+        )
+        self.aws = AWSClient("internal", "external", "id", "bucket")
+        self.aws._assume_role = MagicMock()
+        self.aws._get_s3_client = MagicMock(return_value=self.bucket)
+
+    def test_rebuild_from_listing(self):
+        manifest = self.aws.rebuild_manifest(TABLE)
+        self.assertEqual(
+            [
+                ManifestEntry("batch_rewards/cow_10.json", 10, 3, None),
+                ManifestEntry("batch_rewards/cow_20.json", 20, 6, 10),
+            ],
+            manifest.files,
+        )
+        self.assertEqual(manifest, BucketManifest.from_json(manifest.to_json()))
+
+    def upload(self, config: SyncConfig, chunks) -> None:
+        handler = OrderbookDataHandler(
+            file_manager=MagicMock(),
+            block_range=BlockRange(20, 35),
+            sync_table=TABLE,
+            config=config,
+            data_chunks=chunks,
+        )
+        UploadHandler(self.aws, handler, table=TABLE).write_and_upload_content(False)
+
+    def test_upload_recorded_in_manifest(self):
+        self.aws.upload_file = lambda filename, object_key: self.bucket.put_object(
+            "bucket", object_key, Path(filename).read_bytes()
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.upload(SyncConfig(Path(tmp_dir)), [[{"a": 1}]])
+        checksum = hashlib.sha256(b'{"a": 1}\n').hexdigest()
+
+        # The missing manifest is built from the listing first.
+        manifest = self.aws.load_manifest(TABLE)
+        self.assertEqual(3, len(manifest.files))
+        self.assertEqual(
+            ManifestEntry("batch_rewards/cow_35.json", 35, 9, 20, 1, checksum),
+            manifest.files[-1],
+        )
+        self.assertTrue("_manifest/batch_rewards.json" in self.bucket.objects)
+
+        # Only the keys after the manifest's latest file are listed (none here).
+        self.bucket.list_calls = 0
+        self.assertEqual(35, self.aws.last_sync_block(TABLE))
+        self.assertEqual(1, self.bucket.list_calls)
+
+    @patch("src.sync.upload_handler.time.sleep")
+    def test_parts_uploaded_with_retries(self, _):
+        attempts: list[str] = []
+
+        def flaky_upload(filename, object_key):
+            attempts.append(object_key)
+            if attempts.count(object_key) == 1:
+                raise S3UploadFailedError("connection reset")
+            self.bucket.put_object("bucket", object_key, Path(filename).read_bytes())
+
+        self.aws.upload_file = flaky_upload
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config = SyncConfig(Path(tmp_dir), max_file_rows=2)
+            self.upload(config, [[{"a": 1}, {"a": 2}, {"a": 3}]])
+
+        manifest = self.aws.load_manifest(TABLE)
+        self.assertEqual(
+            [
+                ("batch_rewards/cow_35_0.json", 2),
+                ("batch_rewards/cow_35_1.json", 1),
+            ],
+            [(entry.object_key, entry.rows) for entry in manifest.files[-2:]],
+        )
+        self.assertEqual(4, len(attempts))
+        self.assertEqual(35, self.aws.last_sync_block(TABLE))
+
+    @patch("src.sync.upload_handler.time.sleep")
+    def test_failed_part_rolls_back_upload(self, _):
+        def upload(filename, object_key):
+            if object_key.endswith("_1.json"):
+                raise S3UploadFailedError("access denied")
+            self.bucket.put_object("bucket", object_key, Path(filename).read_bytes())
+
+        self.aws.upload_file = upload
+        before = dict(self.bucket.objects)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config = SyncConfig(Path(tmp_dir), max_file_rows=1, upload_retries=1)
+            with self.assertRaises(SystemExit):
+                self.upload(config, [[{"a": 1}, {"a": 2}]])
+
+        self.assertEqual(before, self.bucket.objects)
+        self.assertEqual(20, self.aws.last_sync_block(TABLE))
+
+    def test_unsplit_content_keeps_its_name(self):
+        self.aws.upload_file = lambda filename, object_key: self.bucket.put_object(
+            "bucket", object_key, Path(filename).read_bytes()
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.upload(SyncConfig(Path(tmp_dir), max_file_rows=2), [[{"a": 1}]])
+            self.assertEqual(
+                ["cow_35.json"], os.listdir(Path(tmp_dir) / "batch_rewards")
+            )
+        self.assertIn("batch_rewards/cow_35.json", self.bucket.objects)
+
+    def test_interrupted_split_upload_not_synced(self):
+        def upload(filename, object_key):
+            if object_key.endswith("_1.json"):
+                raise KeyboardInterrupt  # the process dies mid upload
+            self.bucket.put_object("bucket", object_key, Path(filename).read_bytes())
+
+        self.aws.upload_file = upload
+        before = dict(self.bucket.objects)
+        chunks = [[{"a": 1}, {"a": 2}]]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config = SyncConfig(Path(tmp_dir), max_file_rows=1)
+            with self.assertRaises(KeyboardInterrupt):
+                self.upload(config, chunks)
+            # Only the staged part is left behind, the table content is unchanged.
+            self.assertEqual(
+                ["_staging/batch_rewards/cow_35_0.json"],
+                [key for key in self.bucket.objects if key not in before],
+            )
+            self.assertEqual(20, self.aws.last_sync_block(TABLE))
+
+            self.aws.upload_file = lambda filename, object_key: self.bucket.put_object(
+                "bucket", object_key, Path(filename).read_bytes()
+            )
+            self.upload(config, chunks)
+        self.assertEqual(
+            [
+                "_manifest/batch_rewards.json",
+                "batch_rewards/cow_35_0.json",
+                "batch_rewards/cow_35_1.json",
+            ],
+            sorted(key for key in self.bucket.objects if key not in before),
+        )
+        self.assertEqual(35, self.aws.last_sync_block(TABLE))
+
+    def test_stale_manifest_caught_up(self):
+        self.aws.save_manifest(self.aws.rebuild_manifest(TABLE))
+        self.aws.upload_file = lambda filename, object_key: self.bucket.put_object(
+            "bucket", object_key, Path(filename).read_bytes()
+        )
+        self.aws.save_manifest = MagicMock(side_effect=ClientError({}, "PutObject"))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with self.assertRaises(SystemExit):
+                self.upload(SyncConfig(Path(tmp_dir)), [[{"a": 1}]])
+        self.assertEqual(20, self.aws.load_manifest(TABLE).last_block())
+
+        del self.aws.save_manifest
+        with self.assertLogs("src.post.aws", level="WARNING"):
+            self.assertEqual(35, self.aws.last_sync_block(TABLE))
+        self.assertEqual(
+            ManifestEntry("batch_rewards/cow_35.json", 35, 9, 20),
+            self.aws.load_manifest(TABLE).files[-1],
+        )
+
+    def test_delete_from_updates_manifest(self):
+        self.aws.save_manifest(self.aws.rebuild_manifest(TABLE))
+        self.assertEqual([], self.aws.delete_from(TABLE, 15))
+
+        self.assertEqual(
+            ["batch_rewards/cow_10.json"],
+            [entry.object_key for entry in self.aws.load_manifest(TABLE).files],
+        )
+        self.assertEqual(10, self.aws.last_sync_block(TABLE))
+
+        self.aws.delete_all(TABLE)
+        self.assertIsNone(self.aws.load_manifest(TABLE))
+        self.assertEqual(["order_rewards/cow_30.json"], list(self.bucket.objects))
+
+
+if __name__ == "__main__":
+    unittest.main()
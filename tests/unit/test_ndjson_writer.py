@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from dune_client.file.interface import FileIO
+
+from src.sync.ndjson_writer import NDJSONPartWriter, NDJSONWriter
+
+RECORDS = [
+    {
+        "block_number": i,
+        "solver": "0x51",
+        "data": {"fee": 2**80 + i, "amount": i / 3, "kind": None, "name": "café"},
+    }
+    for i in range(25)
+]
+
+
+class TestNDJSONWriter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name)
+        self.file_io = FileIO(self.path)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_same_content_as_file_io(self):
+        self.file_io.write_ndjson(RECORDS, "expected.json")
+        with NDJSONWriter(self.path / "cow_1.json", batch_size=10) as writer:
+            writer.write(RECORDS[:5])
+            writer.write(iter(RECORDS[5:]))
+
+        self.assertEqual(25, writer.record_count)
+        self.assertEqual(
+            (self.path / "expected.json").read_bytes(),
+            (self.path / "cow_1.json").read_bytes(),
+        )
+        self.assertEqual(RECORDS, self.file_io.load_ndjson("cow_1.json"))
+        self.assertEqual(["cow_1.json", "expected.json"], sorted(os.listdir(self.path)))
+
+    def test_failed_write_keeps_previous_content(self):
+        self.file_io.write_ndjson(RECORDS[:1], "cow_1.json")
+
+        def failing_records():
+            yield from RECORDS
+            raise RuntimeError("connection lost")
+
+        with self.assertRaises(RuntimeError):
+            with NDJSONWriter(self.path / "cow_1.json", batch_size=10) as writer:
+                writer.write(failing_records())
+
+        self.assertEqual(RECORDS[:1], self.file_io.load_ndjson("cow_1.json"))
+        self.assertEqual(["cow_1.json"], os.listdir(self.path))
+
+    def test_no_records_no_file(self):
+        with NDJSONWriter(self.path / "cow_1.json") as writer:
+            writer.write([])
+        self.assertEqual([], os.listdir(self.path))
+
+
+class TestNDJSONPartWriter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name)
+        self.file_io = FileIO(self.path)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def open_part(self, part: int) -> NDJSONWriter:
+        return NDJSONWriter(self.path / f"cow_20_{part}.json", batch_size=4)
+
+    def test_split_by_rows(self):
+        with NDJSONPartWriter(self.open_part, max_rows=10) as writer:
+            writer.write(RECORDS[:10])
+            writer.write(RECORDS[10:])
+
+        self.assertEqual([10, 10, 5], [part.record_count for part in writer.parts])
+        self.assertEqual(
+            RECORDS,
+            [
+                record
+                for part in range(3)
+                for record in self.file_io.load_ndjson(f"cow_20_{part}.json")
+            ],
+        )
+
+    def test_split_by_bytes(self):
+        max_bytes = 1000
+        with NDJSONPartWriter(self.open_part, max_bytes=max_bytes) as writer:
+            writer.write(RECORDS)
+
+        self.assertGreater(len(writer.parts), 1)
+        self.assertEqual(len(RECORDS), writer.record_count)
+        for part in writer.parts:
+            self.assertLessEqual(part.size, max_bytes)
+            self.assertEqual(part.size, os.path.getsize(part.path))
+
+    def test_failure_discards_all_parts(self):
+        def failing_records():
+            yield from RECORDS
+            raise RuntimeError("connection lost")
+
+        with self.assertRaises(RuntimeError):
+            with NDJSONPartWriter(self.open_part, max_rows=10) as writer:
+                writer.write(failing_records())
+        self.assertEqual([], os.listdir(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
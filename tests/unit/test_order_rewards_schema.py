@@ -1,8 +1,15 @@
+import math
 import unittest
+from decimal import Decimal
 
 import pandas as pd
 
+from src.fetch.arrow_dtypes import to_arrow_dtypes
 from src.models.order_rewards_schema import OrderRewards
+from tests.benchmark_conversion import (
+    order_rewards_frame,
+    order_rewards_row_wise,
+)
 
 
 class TestModelOrderRewards(unittest.TestCase):
@@ -102,6 +109,51 @@ class TestModelOrderRewards(unittest.TestCase):
             OrderRewards.from_pdf_to_dune_records(rewards_df),
         )
 
+    def test_order_rewards_transformation_arrow(self):
+        rewards_df = pd.DataFrame(
+            {
+                "block_number": [1, 2],
+                "order_uid": ["0x01", "0x02"],
+                "solver": ["0x51", "0x51"],
+                "tx_hash": ["0x71", "0x72"],
+                "quote_solver": ["0x21", None],
+                "surplus_fee": ["12345678910111213", "0"],
+                "amount": [40.70410, 39.00522],
+                "protocol_fee": ["1000000000000000", "0"],
+                "protocol_fee_token": ["0x91", None],
+                "protocol_fee_native_price": [1.0, 0.0],
+                "quote_sell_amount": ["10000000000000000", None],
+                "quote_buy_amount": ["1000", None],
+                "quote_gas_cost": [5000000000000000.15, None],
+                "quote_sell_token_price": [1.0, None],
+                "partner_fee": ["0", "23123123123123"],
+                "partner_fee_recipient": [None, "0x81"],
+                "protocol_fee_kind": [None, "volume"],
+            }
+        )
+        expected = OrderRewards.from_pdf_to_dune_records(rewards_df)
+        records = OrderRewards.from_pdf_to_dune_records(to_arrow_dtypes(rewards_df))
+
+        self.assertEqual(expected[0], records[0])
+        # Missing floats remain NaN, missing strings None.
+        self.assertTrue(math.isnan(records[1]["data"].pop("quote_gas_cost")))
+        self.assertTrue(math.isnan(expected[1]["data"].pop("quote_gas_cost")))
+        self.assertTrue(math.isnan(records[1]["data"].pop("quote_sell_token_price")))
+        self.assertTrue(math.isnan(expected[1]["data"].pop("quote_sell_token_price")))
+        self.assertEqual(expected[1], records[1])
+
+    def test_order_rewards_transformation_matches_row_wise(self):
+        rewards_df = order_rewards_frame(1000)
+        # numeric columns are returned as Decimal by the database driver
+        for column in ["surplus_fee", "protocol_fee", "partner_fee"]:
+            rewards_df[column] = rewards_df[column].map(Decimal)
+        rewards_df["amount"] = rewards_df["amount"].map(Decimal)
+
+        self.assertEqual(
+            order_rewards_row_wise(rewards_df),
+            OrderRewards.from_pdf_to_dune_records(rewards_df),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
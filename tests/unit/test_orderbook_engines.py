@@ -0,0 +1,50 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from src.fetch.orderbook import EngineConfig, EngineRegistry, OrderbookEnv
+
+DB_URLS = {
+    "BARN_DB_URL": "user:password@barn:5432/db",
+    "PROD_DB_URL": "user:password@prod:5432/db",
+}
+
+
+class TestEngineRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.registry = EngineRegistry(
+            EngineConfig(pool_size=2, pool_recycle=60, statement_timeout=1000)
+        )
+
+    def tearDown(self) -> None:
+        self.registry.dispose()
+
+    @patch.dict(os.environ, DB_URLS)
+    def test_engine_reused_per_env(self):
+        barn = self.registry.get(OrderbookEnv.BARN)
+        self.assertIs(barn, self.registry.get(OrderbookEnv.BARN))
+        self.assertIsNot(barn, self.registry.get(OrderbookEnv.PROD))
+        self.assertEqual("barn", barn.url.host)
+        self.assertEqual(2, barn.pool.size())
+
+    @patch.dict(os.environ, DB_URLS)
+    def test_configure_replaces_engines(self):
+        barn = self.registry.get(OrderbookEnv.BARN)
+        self.registry.configure(EngineConfig(pool_size=3))
+        new_barn = self.registry.get(OrderbookEnv.BARN)
+        self.assertIsNot(barn, new_barn)
+        self.assertEqual(3, new_barn.pool.size())
+
+    @patch.dict(
+        os.environ,
+        {"DB_POOL_SIZE": "7", "DB_POOL_PRE_PING": "false", "DB_STATEMENT_TIMEOUT": ""},
+    )
+    def test_config_from_environment(self):
+        config = EngineConfig.new_from_environment()
+        self.assertEqual(7, config.pool_size)
+        self.assertFalse(config.pool_pre_ping)
+        self.assertIsNone(config.statement_timeout)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,209 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.pool import StaticPool
+
+from src.fetch.orderbook import OrderbookEnv, OrderbookFetcher
+from src.models.block_range import BlockRange
+from src.orderbook_queries import ORDERBOOK_QUERIES, QueryTemplate
+
+
+class TestQueryBothDbs(unittest.TestCase):
+    def test_queries_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def read_query(query, env, data_types=None, on_connect=None, backend=None):
+            # Both queries have to be in flight at the same time to pass the barrier.
+            barrier.wait()
+            return pd.DataFrame({"env": [str(env)], "query": [query]})
+
+        with patch.object(OrderbookFetcher, "_read_query_for_env", wraps=read_query):
+            barn, prod = OrderbookFetcher._query_both_dbs("prod query", "barn query")
+
+        self.assertEqual(["BARN"], list(barn.env))
+        self.assertEqual(["barn query"], list(barn["query"]))
+        self.assertEqual(["PROD"], list(prod.env))
+        self.assertEqual(["prod query"], list(prod["query"]))
+
+    def test_failure_cancels_other_query(self):
+        cancelled = threading.Event()
+        prod_connection = MagicMock()
+        prod_connection.connection.dbapi_connection.cancel.side_effect = cancelled.set
+        prod_connected = threading.Event()
+
+        def read_query(query, env, data_types=None, on_connect=None, backend=None):
+            if env == OrderbookEnv.BARN:
+                prod_connected.wait(timeout=5)
+                raise RuntimeError("barn failed")
+            on_connect(prod_connection)
+            prod_connected.set()
+            # Simulates a long running query which only returns once cancelled.
+            if not cancelled.wait(timeout=5):
+                return pd.DataFrame()
+            raise RuntimeError("canceling statement due to user request")
+
+        with patch.object(OrderbookFetcher, "_read_query_for_env", wraps=read_query):
+            with self.assertRaisesRegex(RuntimeError, "barn failed"):
+                OrderbookFetcher._query_both_dbs("prod query", "barn query")
+
+        self.assertTrue(cancelled.is_set())
+
+
+class TestNewAppHashes(unittest.TestCase):
+    def test_preimages_fetched_in_batches(self):
+        batches = []
+
+        def query_both(query_prod, query_barn):
+            if "hashes" not in query_prod.compile().params:
+                keys = pd.DataFrame({"contract_app_data": ["0x01", "0x02", "0x03"]})
+                return keys, keys
+            hashes = query_prod.compile().params["hashes"]
+            batches.append(hashes)
+            found = pd.DataFrame(
+                {
+                    "contract_app_data": ["0x" + app_hash.hex() for app_hash in hashes],
+                    "encode": ["{}" for _ in hashes],
+                }
+            )
+            return found, found
+
+        with patch("src.fetch.orderbook.APP_HASHES_BATCH_SIZE", 2), patch.object(
+            OrderbookFetcher, "_query_both_dbs", side_effect=query_both
+        ):
+            new = OrderbookFetcher.get_new_app_hashes({"0x00"})
+
+        self.assertEqual([[b"\x01", b"\x02"], [b"\x03"]], batches)
+        self.assertEqual(["0x01", "0x02", "0x03"], list(new.contract_app_data))
+
+    def test_missing_app_hashes_first_seen_in_either_db(self):
+        barn = pd.DataFrame({"app_hash": ["0x01", "0x02"], "first_seen_block": [5, 7]})
+        prod = pd.DataFrame({"app_hash": ["0x01"], "first_seen_block": [3]})
+        with patch.object(
+            OrderbookFetcher, "_query_both_dbs", return_value=(barn, prod)
+        ):
+            missing = OrderbookFetcher.get_missing_app_hashes()
+
+        self.assertEqual(["0x01", "0x02"], list(missing.app_hash))
+        self.assertEqual([3, 7], list(missing.first_seen_block))
+
+
+class TestStreamRewards(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engines = {}
+        for env, solvers in (
+            (OrderbookEnv.PROD, ["0x51", "0x52", "0x53"]),
+            (OrderbookEnv.BARN, ["0x61"]),
+        ):
+            # One shared in-memory database, also for the streaming threads.
+            engine = create_engine(
+                "sqlite://",
+                connect_args={"check_same_thread": False},
+                poolclass=StaticPool,
+            )
+            pd.DataFrame(
+                {"block_number": range(len(solvers)), "solver": solvers}
+            ).to_sql("rewards", engine, index=False)
+            self.engines[env] = engine
+
+    def test_stream_yields_bounded_chunks_prod_first(self):
+        with patch.object(OrderbookFetcher, "_pg_engine", side_effect=self.engines.get):
+            chunks = list(
+                OrderbookFetcher._stream_rewards(
+                    text("SELECT * FROM rewards"),
+                    text("SELECT * FROM rewards"),
+                    chunk_size=2,
+                    data_types={"block_number": "int64"},
+                    block_range=BlockRange(0, 10),
+                )
+            )
+
+        self.assertEqual([2, 1, 1], [len(chunk) for chunk in chunks])
+        self.assertEqual(
+            ["0x51", "0x52", "0x53", "0x61"],
+            list(pd.concat(chunks).solver),
+        )
+
+    def test_queries_stream_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def stream_query(query, env, chunk_size, data_types=None):
+            # Both queries have to be in flight before the first chunk is consumed.
+            barrier.wait()
+            yield pd.DataFrame({"solver": [str(env)]})
+
+        with patch.object(
+            OrderbookFetcher, "_stream_query_for_env", side_effect=stream_query
+        ):
+            envs = [
+                env
+                for env, _ in OrderbookFetcher._stream_both_dbs(
+                    "prod query", "barn query", chunk_size=1
+                )
+            ]
+
+        self.assertEqual([OrderbookEnv.PROD, OrderbookEnv.BARN], envs)
+
+    def test_failure_raised_after_prod_results(self):
+        def stream_query(query, env, chunk_size, data_types=None):
+            if env == OrderbookEnv.BARN:
+                raise RuntimeError("barn failed")
+            yield pd.DataFrame({"solver": ["0x51"]})
+
+        envs = []
+        with patch.object(
+            OrderbookFetcher, "_stream_query_for_env", side_effect=stream_query
+        ):
+            with self.assertRaisesRegex(RuntimeError, "barn failed"):
+                for env, _ in OrderbookFetcher._stream_both_dbs("prod", "barn", 1):
+                    envs.append(env)
+
+        self.assertEqual([OrderbookEnv.PROD], envs)
+
+    def test_closing_stream_stops_queries(self):
+        def stream_query(query, env, chunk_size, data_types=None):
+            # Endless stream, only ends once the consumer stops.
+            while True:
+                yield pd.DataFrame({"solver": [str(env)]})
+
+        with patch.object(
+            OrderbookFetcher, "_stream_query_for_env", side_effect=stream_query
+        ):
+            chunks = OrderbookFetcher._stream_both_dbs("prod", "barn", 1)
+            self.assertEqual(OrderbookEnv.PROD, next(chunks)[0])
+            # Returns (joining the producers) although neither stream has ended.
+            chunks.close()
+
+
+class TestQueryRegistry(unittest.TestCase):
+    def test_identical_templates_shared(self):
+        self.assertIs(
+            ORDERBOOK_QUERIES["PROD_ORDER_REWARDS"],
+            ORDERBOOK_QUERIES["BARN_ORDER_REWARDS"],
+        )
+        self.assertIs(
+            ORDERBOOK_QUERIES["PROD_BATCH_REWARDS"],
+            ORDERBOOK_QUERIES["BARN_BATCH_REWARDS"],
+        )
+
+    def test_bind_parameters(self):
+        query = ORDERBOOK_QUERIES["PROD_ORDER_REWARDS"].bind(
+            start_block=10, end_block=20
+        )
+        compiled = query.compile(dialect=postgresql.dialect())
+        self.assertNotIn("{{", str(compiled))
+        self.assertIn("%(start_block)s", str(compiled))
+        self.assertEqual({"start_block": 10, "end_block": 20}, compiled.params)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            QueryTemplate.load("orderbook/prod_order_rewards.sql", ("start_block",))
+        with self.assertRaises(ValueError):
+            ORDERBOOK_QUERIES["PROD_ORDER_REWARDS"].bind(start_block=10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from collections import namedtuple
+from unittest.mock import MagicMock
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+from src.fetch.pg_copy import read_sql_copy
+
+Column = namedtuple("Column", ["name", "type_code"])
+
+CSV = (
+    "block_number,solver,surplus_fee,amount,protocol_fee_kind\n"
+    "1,0x51,12345678910111213141516,40.7041,volume\n"
+    "2,0x52,0,0.0,\\N\n"
+    '\\N,0x53,"",1e-05,\n'
+)
+
+
+class TestReadSqlCopy(unittest.TestCase):
+    def setUp(self) -> None:
+        cursor = MagicMock()
+        cursor.description = [
+            Column("block_number", 20),
+            Column("solver", 25),
+            Column("surplus_fee", 25),
+            Column("amount", 1700),
+            Column("protocol_fee_kind", 16385),
+        ]
+        cursor.copy_expert.side_effect = lambda sql, buffer: buffer.write(CSV.encode())
+        self.cursor = cursor
+        self.connection = MagicMock()
+        self.connection.dialect = create_engine("postgresql+psycopg2://").dialect
+        dbapi_connection = self.connection.connection.dbapi_connection
+        dbapi_connection.cursor.return_value.__enter__.return_value = cursor
+
+    def test_read_sql_copy(self):
+        frame = read_sql_copy(
+            text("SELECT * FROM rewards WHERE block_number > :start;").bindparams(
+                start=0
+            ),
+            self.connection,
+            {"block_number": "Int64"},
+        )
+
+        copy_sql = self.cursor.copy_expert.call_args.args[0]
+        self.assertEqual(
+            "COPY (SELECT * FROM rewards WHERE block_number > 0) "
+            "TO STDOUT WITH (FORMAT csv, HEADER true, NULL '\\N')",
+            copy_sql,
+        )
+        self.assertEqual([1, 2, pd.NA], frame.block_number.tolist())
+        self.assertEqual("Int64", frame.block_number.dtype)
+        # wei amounts stay text, NULL and empty strings are distinguished
+        self.assertEqual(
+            ["12345678910111213141516", "0", ""], frame.surplus_fee.tolist()
+        )
+        self.assertEqual([40.7041, 0.0, 1e-05], frame.amount.tolist())
+        self.assertEqual(["volume", None, ""], frame.protocol_fee_kind.tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
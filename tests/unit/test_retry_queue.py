@@ -0,0 +1,124 @@
+import tempfile
+import unittest
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from src.fetch.ipfs import Cid
+from src.fetch.retry_queue import RetryPolicy, RetryQueue
+from src.models.app_data_content import FoundContent, NotFoundContent
+
+POLICY = RetryPolicy(
+    base_delay=timedelta(seconds=60),
+    max_delay=timedelta(seconds=600),
+    horizon_blocks=1000,
+)
+HOUR = 3600.0
+
+
+def row(app_hash: str, first_seen_block: int) -> dict[str, str]:
+    return {"app_hash": app_hash, "first_seen_block": str(first_seen_block)}
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_delay(self):
+        self.assertEqual(
+            [0, 60, 120, 240, 480, 600, 600],
+            [POLICY.delay(attempts).total_seconds() for attempts in range(7)],
+        )
+        self.assertEqual(timedelta(days=1), RetryPolicy().delay(10**6))
+
+    def test_horizon(self):
+        self.assertFalse(POLICY.given_up(5000, 6000))
+        self.assertTrue(POLICY.given_up(4999, 6000))
+
+
+class TestRetryQueue(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "app_data" / "retries.sqlite"
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_backoff(self):
+        with RetryQueue(self.path, POLICY) as queue:
+            queue.record(
+                [],
+                [NotFoundContent("0x01", 5500, 1), NotFoundContent("0x02", 5500, 3)],
+                now=HOUR,
+            )
+            # A further round backs 0x02 off (regardless of the reported attempts).
+            queue.record([], [NotFoundContent("0x02", 5500, 3)], now=HOUR)
+
+        # Persisted between runs
+        with RetryQueue(self.path, POLICY) as queue:
+            self.assertEqual([], queue.due_now(6000, now=HOUR + 59))
+            self.assertEqual(
+                [NotFoundContent("0x01", 5500, 1)], queue.due_now(6000, now=HOUR + 60)
+            )
+            self.assertEqual(
+                [NotFoundContent("0x01", 5500, 1), NotFoundContent("0x02", 5500, 2)],
+                queue.due_now(6000, now=HOUR + 120),
+            )
+
+    def test_filter_due(self):
+        with RetryQueue(self.path, POLICY) as queue:
+            queue.record([], [NotFoundContent("0x01", 5500, 1)], now=HOUR)
+            rows = [row("0x01", 5500), row("0x02", 5900), row("0x03", 4000)]
+
+            # New hashes are due right away, hashes past the horizon never are.
+            self.assertEqual([row("0x02", 5900)], queue.filter_due(rows, 6000, HOUR))
+            # Due hashes carry their lookup rounds so far.
+            self.assertEqual(
+                [{**row("0x01", 5500), "attempts": "1"}, row("0x02", 5900)],
+                queue.filter_due(rows, 6000, HOUR + 60),
+            )
+
+    def test_found_leaves_queue(self):
+        with RetryQueue(self.path, POLICY) as queue:
+            queue.record([], [NotFoundContent("0x01", 4500, 1)], now=HOUR)
+            self.assertEqual(1, queue.given_up(6000))
+            queue.record([FoundContent("0x01", 4500, {})], [], now=HOUR)
+            self.assertEqual(0, len(queue))
+
+
+class TestRetriedFetch(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "retries.sqlite"
+        self.previous_attempts = []
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    async def lookup_round(self, queue: RetryQueue, now: float) -> None:
+        async def resolve(row, max_retries, sessions, stats, hedge_delay):
+            attempts = int(row.get("attempts", 0))
+            self.previous_attempts.append(attempts)
+            # As Cid.fetch_content: every round adds its `max_retries` requests.
+            return NotFoundContent(
+                row["app_hash"], int(row["first_seen_block"]), attempts + max_retries
+            )
+
+        rows = queue.filter_due([row("0x01", 5500)], 6000, now)
+        with patch.object(Cid, "_resolve", side_effect=resolve):
+            found, not_found = await Cid.fetch_many(rows, "token", max_retries=3)
+        queue.record(found, not_found, now)
+
+    async def test_backoff_grows_per_round(self):
+        now = HOUR
+        delays = []
+        with RetryQueue(self.path, POLICY) as queue:
+            for _ in range(3):
+                await self.lookup_round(queue, now)
+                next_due = queue.next_due("0x01")
+                delays.append(next_due - now)
+                now = next_due
+
+        self.assertEqual([0, 1, 2], self.previous_attempts)
+        self.assertEqual([60, 120, 240], delays)
+
+
+if __name__ == "__main__":
+    unittest.main()
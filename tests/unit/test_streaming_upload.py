@@ -0,0 +1,144 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+from src.models.block_range import BlockRange
+from src.models.tables import SyncTable
+from src.post.aws import StreamingUpload
+from src.sync.config import SyncConfig
+from src.sync.order_rewards import OrderbookDataHandler
+from src.sync.upload_handler import UploadHandler
+from tests.unit.fake_bucket import FakeBucket
+
+
+class TestStreamingUpload(unittest.TestCase):
+    def test_content_streamed(self):
+        bucket = FakeBucket()
+        upload = bucket.upload_stream("key")
+        for i in range(100):
+            upload.write(f"chunk {i}\n".encode())
+        upload.complete()
+        expected = "".join(f"chunk {i}\n" for i in range(100)).encode()
+        self.assertEqual({"key": expected}, bucket.objects)
+
+    def test_nothing_uploaded_without_content(self):
+        bucket = FakeBucket()
+        bucket.upload_stream("key").complete()
+        self.assertEqual(0, bucket.uploads)
+
+    def test_abort(self):
+        bucket = FakeBucket()
+        upload = bucket.upload_stream("key")
+        upload.write(b"partial content")
+        upload.abort(RuntimeError("query failed"))
+        self.assertEqual({}, bucket.objects)
+
+    def test_upload_failure_raised_to_writer(self):
+        def upload(stream):
+            stream.read(1)
+            raise ClientError({"Error": {"Code": "AccessDenied"}}, "UploadPart")
+
+        streaming_upload = StreamingUpload(upload, buffer_chunks=1)
+        with self.assertRaises(ClientError):
+            for _ in range(100):
+                streaming_upload.write(b"x" * 10)
+        streaming_upload.abort(RuntimeError("upload failed"))
+
+
+class TestStreamingUploadHandler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.volume_path = Path(self.tmp_dir.name)
+        self.bucket = FakeBucket()
+        self.aws = MagicMock()
+        self.aws.upload_stream = self.bucket.upload_stream
+        self.aws.promote_staged = self.promote_staged
+
+    def promote_staged(self, moves) -> None:
+        for staged_key, object_key in moves.items():
+            self.bucket.objects[object_key] = self.bucket.objects.pop(staged_key)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def sync(self, config: SyncConfig, chunks) -> None:
+        handler = OrderbookDataHandler(
+            file_manager=MagicMock(),
+            block_range=BlockRange(10, 20),
+            sync_table=SyncTable.ORDER_REWARDS,
+            config=config,
+            data_chunks=chunks,
+        )
+        UploadHandler(
+            self.aws, handler, table=SyncTable.ORDER_REWARDS
+        ).write_and_upload_content(dry_run=False)
+
+    def test_streamed_with_backup(self):
+        config = SyncConfig(self.volume_path, stream_uploads=True)
+        self.sync(config, [[{"a": 1}, {"a": 2}], [{"a": 3}]])
+
+        content = b'{"a": 1}\n{"a": 2}\n{"a": 3}\n'
+        self.assertEqual({"order_rewards/cow_20.json": content}, self.bucket.objects)
+        self.assertEqual(
+            content, (self.volume_path / "order_rewards" / "cow_20.json").read_bytes()
+        )
+        self.aws.upload_file.assert_not_called()
+        entry = self.aws.record_uploads.call_args.args[1][0]
+        self.assertEqual(
+            (10, 20, 3, len(content)),
+            (entry.block_from, entry.block_to, entry.rows, entry.size),
+        )
+
+    def test_streamed_without_backup(self):
+        config = SyncConfig(
+            self.volume_path, stream_uploads=True, stream_uploads_backup=False
+        )
+        self.sync(config, [[{"a": 1}]])
+
+        self.assertEqual(["order_rewards/cow_20.json"], list(self.bucket.objects))
+        self.assertEqual([], list(self.volume_path.rglob("*.json")))
+
+    def test_split_content_staged(self):
+        config = SyncConfig(self.volume_path, stream_uploads=True, max_file_rows=2)
+        self.sync(config, [[{"a": 1}, {"a": 2}], [{"a": 3}]])
+
+        self.assertEqual(
+            {
+                "order_rewards/cow_20_0.json": b'{"a": 1}\n{"a": 2}\n',
+                "order_rewards/cow_20_1.json": b'{"a": 3}\n',
+            },
+            self.bucket.objects,
+        )
+        self.aws.delete_staged.assert_called_once_with("order_rewards")
+        self.assertEqual(
+            ["order_rewards/cow_20_0.json", "order_rewards/cow_20_1.json"],
+            [entry.object_key for entry in self.aws.record_uploads.call_args.args[1]],
+        )
+
+    def test_single_part_keeps_content_name(self):
+        config = SyncConfig(self.volume_path, stream_uploads=True, max_file_rows=2)
+        self.sync(config, [[{"a": 1}]])
+
+        self.assertEqual(["order_rewards/cow_20.json"], list(self.bucket.objects))
+        self.assertEqual(
+            ["cow_20.json"], os.listdir(self.volume_path / "order_rewards")
+        )
+
+    def test_failed_content_not_uploaded(self):
+        def chunks():
+            yield [{"a": 1}]
+            raise RuntimeError("query failed")
+
+        config = SyncConfig(self.volume_path, stream_uploads=True)
+        with self.assertRaises(RuntimeError):
+            self.sync(config, chunks())
+        self.assertEqual({}, self.bucket.objects)
+        self.aws.record_uploads.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
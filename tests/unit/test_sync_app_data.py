@@ -0,0 +1,256 @@
+import os
+import tempfile
+import unittest
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from src.fetch.ipfs import Cid
+from src.fetch.retry_queue import RetryPolicy
+from src.models.app_data_content import FoundContent, NotFoundContent
+from src.sync.app_data import PublishedHashes, resolve_app_data, sync_app_data
+from src.sync.config import AppDataFetchConfig, AppDataSyncConfig
+
+
+class TestIncrementalAppDataSync(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.config = AppDataSyncConfig(
+            table="app_data_test",
+            incremental=True,
+            volume_path=Path(self.tmp_dir.name),
+        )
+        self.published = PublishedHashes(
+            Path(self.tmp_dir.name) / "app_data" / self.config.hashes_file
+        )
+        self.dune = MagicMock()
+        self.orderbook = MagicMock()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    async def test_first_run_uploads_full_table(self):
+        self.orderbook.get_app_hashes.return_value = pd.DataFrame(
+            {"contract_app_data": ["0x01", "0x02"], "encode": ["{}", "{}"]}
+        )
+        await sync_app_data(self.orderbook, self.dune, self.config, dry_run=False)
+
+        self.dune.upload_csv.assert_not_called()
+        self.dune.create_table.assert_called_once()
+        self.dune.insert_table.assert_called_once()
+        self.assertEqual({"0x01", "0x02"}, self.published.load())
+
+    async def test_full_and_incremental_runs_target_same_table(self):
+        self.orderbook.get_app_hashes.return_value = pd.DataFrame(
+            {"contract_app_data": ["0x01"], "encode": ["{}"]}
+        )
+        self.orderbook.get_new_app_hashes.return_value = pd.DataFrame(
+            {"contract_app_data": ["0x02"], "encode": ["{}"]}
+        )
+        await sync_app_data(self.orderbook, self.dune, self.config, dry_run=False)
+        await sync_app_data(self.orderbook, self.dune, self.config, dry_run=False)
+
+        created = self.dune.create_table.call_args.kwargs
+        targets = {
+            (call.kwargs["namespace"], call.kwargs["table_name"])
+            for call in self.dune.insert_table.call_args_list
+        }
+        self.assertEqual(2, self.dune.insert_table.call_count)
+        self.assertEqual({(created["namespace"], created["table_name"])}, targets)
+        self.assertEqual(
+            ["contract_app_data", "encode"],
+            [column["name"] for column in created["schema"]],
+        )
+
+    async def test_appends_only_new_hashes(self):
+        self.published.add(["0x01", "0x02"])
+        self.orderbook.get_new_app_hashes.return_value = pd.DataFrame(
+            {"contract_app_data": ["0x03"], "encode": ['{"appCode": "CoW"}']}
+        )
+        await sync_app_data(self.orderbook, self.dune, self.config, dry_run=False)
+
+        self.orderbook.get_new_app_hashes.assert_called_once_with({"0x01", "0x02"})
+        self.dune.upload_csv.assert_not_called()
+        kwargs = self.dune.insert_table.call_args.kwargs
+        self.assertEqual("cowprotocol", kwargs["namespace"])
+        self.assertEqual(
+            b'contract_app_data,encode\n0x03,"{""appCode"": ""CoW""}"\n',
+            kwargs["data"].read(),
+        )
+        self.assertEqual({"0x01", "0x02", "0x03"}, self.published.load())
+
+    async def test_nothing_new(self):
+        self.published.add(["0x01"])
+        self.orderbook.get_new_app_hashes.return_value = pd.DataFrame()
+        await sync_app_data(self.orderbook, self.dune, self.config, dry_run=False)
+
+        self.dune.insert_table.assert_not_called()
+        self.assertEqual({"0x01"}, self.published.load())
+
+    async def test_dry_run_records_nothing(self):
+        self.published.add(["0x01"])
+        self.orderbook.get_new_app_hashes.return_value = pd.DataFrame(
+            {"contract_app_data": ["0x03"], "encode": ["{}"]}
+        )
+        await sync_app_data(self.orderbook, self.dune, self.config, dry_run=True)
+
+        self.dune.insert_table.assert_not_called()
+        self.assertEqual({"0x01"}, self.published.load())
+
+
+class TestResolveAppData(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.config = AppDataFetchConfig(Path(self.tmp_dir.name), "token")
+        self.rows = [
+            {"app_hash": "0x01", "first_seen_block": "10"},
+            {"app_hash": "0x02", "first_seen_block": "20"},
+        ]
+        self.lookups = []
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    async def resolve(self):
+        async def lookup(row, max_retries, sessions, stats, hedge_delay):
+            self.lookups.append(row["app_hash"])
+            block = int(row["first_seen_block"])
+            if row["app_hash"] == "0x01":
+                return FoundContent("0x01", block, {"appCode": "CoW"})
+            return NotFoundContent(row["app_hash"], block, 1)
+
+        with patch.object(Cid, "_resolve", side_effect=lookup):
+            return await resolve_app_data(self.rows, 100, self.config)
+
+    async def test_content_cached_and_retries_scheduled_on_volume(self):
+        found, not_found = await self.resolve()
+        self.assertEqual(["0x01"], [content.app_hash for content in found])
+        self.assertEqual(["0x02"], [content.app_hash for content in not_found])
+
+        found, not_found = await self.resolve()
+        self.assertEqual([FoundContent("0x01", 10, {"appCode": "CoW"})], found)
+        self.assertEqual([], not_found)
+        # Cached content is not looked up again, the missing hash is not yet due.
+        self.assertEqual(["0x01", "0x02"], self.lookups)
+        directory = Path(self.tmp_dir.name) / "app_data"
+        self.assertTrue((directory / self.config.cache_file).exists())
+        self.assertTrue((directory / self.config.retry_file).exists())
+
+
+class TestMissingAppDataSync(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        volume_path = Path(self.tmp_dir.name)
+        self.config = AppDataSyncConfig(
+            table="app_data_test",
+            incremental=True,
+            volume_path=volume_path,
+            fetch=AppDataFetchConfig(volume_path, "token"),
+        )
+        self.published = PublishedHashes(
+            volume_path / "app_data" / self.config.hashes_file
+        )
+        self.dune = MagicMock()
+        self.orderbook = MagicMock()
+        self.orderbook.get_latest_block.return_value = 100
+        self.orderbook.get_missing_app_hashes.return_value = pd.DataFrame(
+            {
+                "app_hash": ["0x01", "0x02", "0x03"],
+                "first_seen_block": [10, 20, 30],
+            }
+        )
+        self.lookups = []
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    async def sync(self):
+        async def lookup(row, max_retries, sessions, stats, hedge_delay):
+            self.lookups.append(row["app_hash"])
+            block = int(row["first_seen_block"])
+            if row["app_hash"] == "0x02":
+                return FoundContent("0x02", block, {"appCode": "CoW"})
+            return NotFoundContent(row["app_hash"], block, 1)
+
+        with patch.object(Cid, "_resolve", side_effect=lookup):
+            await sync_app_data(self.orderbook, self.dune, self.config, dry_run=False)
+
+    async def test_missing_app_data_resolved_and_published(self):
+        self.published.add(["0x01"])
+        self.orderbook.get_new_app_hashes.return_value = pd.DataFrame()
+        await self.sync()
+
+        self.assertEqual(["0x02", "0x03"], self.lookups)
+        self.assertEqual(
+            b'contract_app_data,encode\n0x02,"{""appCode"": ""CoW""}"\n',
+            self.dune.insert_table.call_args.kwargs["data"].read(),
+        )
+        self.assertEqual({"0x01", "0x02"}, self.published.load())
+
+        # Published content is not resolved again, 0x03 is not due again yet.
+        self.dune.insert_table.reset_mock()
+        await self.sync()
+        self.assertEqual(["0x02", "0x03"], self.lookups)
+        self.dune.insert_table.assert_not_called()
+
+    async def test_missing_app_data_retried_once_due(self):
+        self.published.add(["0x01", "0x02"])
+        self.orderbook.get_new_app_hashes.return_value = pd.DataFrame()
+        self.config.fetch.retry_policy = RetryPolicy(base_delay=timedelta(0))
+        await self.sync()
+        await self.sync()
+        self.assertEqual(["0x03", "0x03"], self.lookups)
+
+        # Past the retry horizon, app data is no longer looked up.
+        self.orderbook.get_latest_block.return_value = 30 + 30 * 7200 + 1
+        await self.sync()
+        self.assertEqual(["0x03", "0x03"], self.lookups)
+
+    async def test_disabled_without_fetch_config(self):
+        self.config.fetch = None
+        self.published.add(["0x01"])
+        self.orderbook.get_new_app_hashes.return_value = pd.DataFrame()
+        await self.sync()
+
+        self.orderbook.get_missing_app_hashes.assert_not_called()
+        self.dune.insert_table.assert_not_called()
+
+
+class TestAppDataConfig(unittest.TestCase):
+    @patch.dict(
+        os.environ,
+        {"APP_DATA_TARGET_TABLE": "app_data", "APP_DATA_INCREMENTAL": "true"},
+    )
+    def test_incremental_sync_config_requires_volume_path(self):
+        os.environ.pop("VOLUME_PATH", None)
+        with self.assertRaisesRegex(AssertionError, "VOLUME_PATH"):
+            AppDataSyncConfig.new_from_environment()
+
+    @patch.dict(
+        os.environ,
+        {
+            "APP_DATA_TARGET_TABLE": "app_data",
+            "APP_DATA_RESOLVE_MISSING": "true",
+            "VOLUME_PATH": "volume",
+            "IPFS_ACCESS_KEY": "token",
+            "APP_DATA_CACHE_MAX_MB": "16",
+            "APP_DATA_RETRY_BASE_MINUTES": "1",
+            "APP_DATA_RETRY_MAX_HOURS": "",
+            "APP_DATA_RETRY_HORIZON_DAYS": "2",
+        },
+    )
+    def test_config_from_environment(self):
+        config = AppDataSyncConfig.new_from_environment().fetch
+        self.assertEqual(Path("volume"), config.volume_path)
+        self.assertEqual("token", config.access_token)
+        self.assertEqual(16 << 20, config.cache_max_bytes)
+        self.assertEqual(
+            RetryPolicy(timedelta(minutes=1), timedelta(days=1), 2 * 7200),
+            config.retry_policy,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from dune_client.file.interface import FileIO
+
+from src.models.tables import SyncTable
+from src.scripts.delete_from import delete_from
+from src.sync.common import last_sync_block
+from src.sync.config import SyncConfig, SyncStatePolicy
+
+TABLE = SyncTable.ORDER_REWARDS
+
+
+class TestLastSyncBlock(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.volume_path = Path(self.tmp_dir.name)
+        self.aws = MagicMock()
+        self.aws.last_sync_block.return_value = 200
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def config(self, policy: SyncStatePolicy, verify: bool = False) -> SyncConfig:
+        return SyncConfig(
+            self.volume_path, sync_state_policy=policy, verify_sync_state=verify
+        )
+
+    def record_local(self, block: int) -> None:
+        config = SyncConfig(self.volume_path)
+        FileIO(self.volume_path / str(TABLE)).write_csv(
+            [{config.sync_column: str(block)}], config.sync_file
+        )
+
+    def test_remote_policy(self):
+        self.record_local(100)
+        config = self.config(SyncStatePolicy.REMOTE)
+        with self.assertLogs("src.sync.common", level="WARNING"):
+            self.assertEqual(200, last_sync_block(self.aws, TABLE, 1, config))
+        self.aws.last_sync_block.side_effect = FileNotFoundError
+        self.assertEqual(1, last_sync_block(self.aws, TABLE, 1, config))
+
+    def test_local_policy_skips_bucket(self):
+        self.record_local(100)
+        config = self.config(SyncStatePolicy.LOCAL)
+        self.assertEqual(100, last_sync_block(self.aws, TABLE, 1, config))
+        self.aws.last_sync_block.assert_not_called()
+
+    def test_local_policy_without_sync_file(self):
+        config = self.config(SyncStatePolicy.LOCAL)
+        self.assertEqual(200, last_sync_block(self.aws, TABLE, 1, config))
+        self.aws.last_sync_block.side_effect = FileNotFoundError
+        self.assertEqual(1, last_sync_block(self.aws, TABLE, 1, config))
+
+    def test_local_policy_corrupt_sync_file(self):
+        path = self.volume_path / str(TABLE)
+        path.mkdir()
+        (path / "sync_block.csv").write_text("last_synced_block\n")
+        config = self.config(SyncStatePolicy.LOCAL)
+        self.assertEqual(200, last_sync_block(self.aws, TABLE, 1, config))
+
+    def test_local_policy_verified(self):
+        self.record_local(100)
+        config = self.config(SyncStatePolicy.LOCAL, verify=True)
+        with self.assertLogs("src.sync.common", level="WARNING") as logs:
+            self.assertEqual(100, last_sync_block(self.aws, TABLE, 1, config))
+        self.assertIn("disagree, using local sync state", logs.output[0])
+        self.aws.last_sync_block.assert_called_once_with(TABLE)
+
+    def test_delete_from_rewinds_local_policy(self):
+        self.record_local(200)
+        config = self.config(SyncStatePolicy.LOCAL)
+        self.aws.delete_from.return_value = []
+        # dry runs and deletions past the local block keep the sync file
+        self.assertTrue(delete_from(TABLE, self.aws, config, 150, dry_run=True))
+        self.assertTrue(delete_from(TABLE, self.aws, config, 201))
+        self.assertEqual(200, last_sync_block(self.aws, TABLE, 1, config))
+
+        self.assertTrue(delete_from(TABLE, self.aws, config, 150))
+        self.aws.delete_from.assert_called_with(TABLE, 150, dry_run=False)
+        self.aws.last_sync_block.return_value = 120
+        self.assertEqual(120, last_sync_block(self.aws, TABLE, 1, config))
+
+    def test_delete_from_failure_keeps_local_block(self):
+        self.record_local(200)
+        config = self.config(SyncStatePolicy.LOCAL)
+        self.aws.delete_from.return_value = [{"Key": "cow_150.json"}]
+        self.assertFalse(delete_from(TABLE, self.aws, config, 150))
+        self.assertEqual(200, last_sync_block(self.aws, TABLE, 1, config))
+
+
+if __name__ == "__main__":
+    unittest.main()
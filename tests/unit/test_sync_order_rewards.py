@@ -0,0 +1,85 @@
+import random
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from dune_client.file.interface import FileIO
+
+from src.models.block_range import BlockRange
+from src.models.tables import SyncTable
+from src.sync.config import SyncConfig
+from src.sync.order_rewards import sync_orderbook_data
+
+
+def fetch_records(block_range: BlockRange):
+    # Random delays, so that windows complete out of order.
+    time.sleep(random.uniform(0, 0.05))
+    return [[{"block_number": block_range.block_to}]]
+
+
+class TestBackfill(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.volume_path = Path(self.tmp_dir.name)
+        self.table = SyncTable.ORDER_REWARDS
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_windows_uploaded_in_order(self):
+        aws = MagicMock()
+        config = SyncConfig(self.volume_path, backfill_window=10, backfill_workers=3)
+        sync_orderbook_data(
+            aws,
+            BlockRange(100, 155),
+            config,
+            dry_run=False,
+            sync_table=self.table,
+            fetch_records=fetch_records,
+        )
+
+        self.assertEqual(
+            [
+                f"order_rewards/cow_{block}.json"
+                for block in (110, 120, 130, 140, 150, 155)
+            ],
+            [call.kwargs["object_key"] for call in aws.upload_file.call_args_list],
+        )
+        file_io = FileIO(self.volume_path / str(self.table))
+        self.assertEqual([{"block_number": 130}], file_io.load_ndjson("cow_130.json"))
+        self.assertEqual(
+            [{"last_synced_block": "155"}], file_io.load_csv(config.sync_file)
+        )
+
+    def test_failed_window_stops_sync_block(self):
+        def failing_fetch(block_range: BlockRange):
+            if block_range.block_from == 120:
+                raise RuntimeError("query timed out")
+            return fetch_records(block_range)
+
+        aws = MagicMock()
+        config = SyncConfig(self.volume_path, backfill_window=10, backfill_workers=2)
+        with self.assertRaises(RuntimeError):
+            sync_orderbook_data(
+                aws,
+                BlockRange(100, 150),
+                config,
+                dry_run=False,
+                sync_table=self.table,
+                fetch_records=failing_fetch,
+            )
+
+        self.assertEqual(
+            ["order_rewards/cow_110.json", "order_rewards/cow_120.json"],
+            [call.kwargs["object_key"] for call in aws.upload_file.call_args_list],
+        )
+        file_io = FileIO(self.volume_path / str(self.table))
+        self.assertEqual(
+            [{"last_synced_block": "120"}], file_io.load_csv(config.sync_file)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from src.sync.config import PriceFeedSyncConfig
+from src.sync.price_feed import PriceFeedState, sync_price_feed
+
+
+def prices(*rows):
+    return pd.DataFrame(
+        {
+            "token_address": [row[0] for row in rows],
+            "time": pd.to_datetime([row[1] for row in rows], utc=True),
+            "price": [1.0 for _ in rows],
+            "decimals": [18 for _ in rows],
+            "source": ["coingecko" for _ in rows],
+        }
+    )
+
+
+class TestIncrementalPriceFeedSync(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.config = PriceFeedSyncConfig(
+            table="price_feed_test",
+            incremental=True,
+            volume_path=Path(self.tmp_dir.name),
+            rescan_window=timedelta(minutes=10),
+        )
+        self.state_path = Path(self.tmp_dir.name) / "price_feed" / "sync_state.json"
+        self.dune = MagicMock()
+        self.orderbook = MagicMock()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def target_table(self, latest, recent):
+        self.dune.run_sql.return_value.get_rows.side_effect = [
+            [{"latest": latest}],
+            [
+                {"token_address": token, "time": time, "source": "coingecko"}
+                for token, time in recent
+            ],
+        ]
+
+    async def test_reconciles_with_target_table(self):
+        self.target_table(
+            "2024-01-01 12:00:00.000 UTC",
+            [("0x01", "2024-01-01 11:55:00.000 UTC")],
+        )
+        self.orderbook.get_price_feed.return_value = prices(
+            ("0x01", "2024-01-01 11:55"), ("0x01", "2024-01-01 12:05")
+        )
+        await sync_price_feed(self.orderbook, self.dune, self.config, dry_run=False)
+
+        self.dune.upload_csv.assert_not_called()
+        self.dune.create_table.assert_not_called()
+        # The record within the rescan window is already in the target table.
+        inserted = pd.read_csv(self.dune.insert_table.call_args.kwargs["data"])
+        self.assertEqual(["2024-01-01 12:05:00+00:00"], list(inserted.time))
+        # The watermark is read from the table inserted into
+        table = self.dune.insert_table.call_args.kwargs
+        self.assertIn(
+            f"FROM dune.{table['namespace']}.{table['table_name']}",
+            self.dune.run_sql.call_args.kwargs["query_sql"],
+        )
+        since = self.orderbook.get_price_feed.call_args.kwargs["since"]
+        self.assertEqual(datetime(2024, 1, 1, 11, 50, tzinfo=timezone.utc), since)
+        self.assertEqual(
+            datetime(2024, 1, 1, 12, 5, tzinfo=timezone.utc),
+            PriceFeedState.load(self.state_path).watermark,
+        )
+
+    async def test_full_upload_without_watermark(self):
+        self.dune.run_sql.side_effect = RuntimeError("requires plus subscription")
+        self.orderbook.get_price_feed.return_value = prices(
+            ("0x01", "2024-01-01 12:00"), ("0x02", "2024-01-01 12:05")
+        )
+        await sync_price_feed(self.orderbook, self.dune, self.config, dry_run=False)
+
+        self.dune.upload_csv.assert_not_called()
+        self.dune.create_table.assert_called_once()
+        self.dune.insert_table.assert_called_once()
+        self.assertEqual(
+            (
+                self.dune.create_table.call_args.kwargs["table_name"],
+                self.dune.create_table.call_args.kwargs["namespace"],
+            ),
+            (
+                self.dune.insert_table.call_args.kwargs["table_name"],
+                self.dune.insert_table.call_args.kwargs["namespace"],
+            ),
+        )
+        self.assertEqual(
+            datetime(2024, 1, 1, 12, 5, tzinfo=timezone.utc),
+            PriceFeedState.load(self.state_path).watermark,
+        )
+
+    async def test_rescan_skips_synced_records(self):
+        self.orderbook.get_price_feed.return_value = prices(
+            ("0x01", "2024-01-01 12:00"), ("0x02", "2024-01-01 12:05")
+        )
+        await sync_price_feed(self.orderbook, self.dune, self.config, dry_run=False)
+
+        # The rescan returns both known records, a late arrival and a new record.
+        self.orderbook.get_price_feed.return_value = prices(
+            ("0x01", "2024-01-01 12:00"),
+            ("0x02", "2024-01-01 12:05"),
+            ("0x03", "2024-01-01 12:01"),
+            ("0x01", "2024-01-01 12:10"),
+        )
+        await sync_price_feed(self.orderbook, self.dune, self.config, dry_run=False)
+
+        inserted = pd.read_csv(self.dune.insert_table.call_args.kwargs["data"])
+        self.assertEqual(["0x03", "0x01"], list(inserted.token_address))
+        state = PriceFeedState.load(self.state_path)
+        self.assertEqual(
+            datetime(2024, 1, 1, 12, 10, tzinfo=timezone.utc), state.watermark
+        )
+        # 12:00 is at the edge of the rescan window
+        self.assertEqual(4, len(state.recent_keys))
+
+    async def test_late_record_at_watermark_without_rescan_window(self):
+        self.config.rescan_window = timedelta(0)
+        self.orderbook.get_price_feed.return_value = prices(
+            ("0x01", "2024-01-01 12:00"), ("0x02", "2024-01-01 12:05")
+        )
+        await sync_price_feed(self.orderbook, self.dune, self.config, dry_run=False)
+
+        # A record sharing the watermark's timestamp arrives late.
+        self.orderbook.get_price_feed.return_value = prices(
+            ("0x02", "2024-01-01 12:05"), ("0x03", "2024-01-01 12:05")
+        )
+        await sync_price_feed(self.orderbook, self.dune, self.config, dry_run=False)
+
+        since = self.orderbook.get_price_feed.call_args.kwargs["since"]
+        self.assertEqual(datetime(2024, 1, 1, 12, 5, tzinfo=timezone.utc), since)
+        inserted = pd.read_csv(self.dune.insert_table.call_args.kwargs["data"])
+        self.assertEqual(["0x03"], list(inserted.token_address))
+
+
+class TestPriceFeedSyncConfig(unittest.TestCase):
+    @patch.dict(
+        os.environ,
+        {
+            "PRICE_FEED_TARGET_TABLE": "price_feed",
+            "PRICE_FEED_INCREMENTAL": "yes",
+            "PRICE_FEED_RESCAN_MINUTES": "15",
+            "VOLUME_PATH": "volume",
+        },
+    )
+    def test_config_from_environment(self):
+        config = PriceFeedSyncConfig.new_from_environment()
+        self.assertEqual("price_feed", config.table)
+        self.assertTrue(config.incremental)
+        self.assertEqual(Path("volume"), config.volume_path)
+        self.assertEqual(timedelta(minutes=15), config.rescan_window)
+
+    @patch.dict(
+        os.environ,
+        {"PRICE_FEED_TARGET_TABLE": "price_feed", "PRICE_FEED_INCREMENTAL": "true"},
+    )
+    def test_incremental_config_requires_volume_path(self):
+        os.environ.pop("VOLUME_PATH", None)
+        with self.assertRaisesRegex(AssertionError, "VOLUME_PATH"):
+            PriceFeedSyncConfig.new_from_environment()
+
+
+if __name__ == "__main__":
+    unittest.main()